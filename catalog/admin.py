@@ -1,4 +1,10 @@
+import tempfile
+import zipfile
 from django.contrib import admin
+from django.http import FileResponse
+from .exports import MEASURE_LAYOUTS, write_export
+from .renditions import queue_counters, retry_jobs
+from .search import search_filter
 from .models import (
     Group,
     Advantage,
@@ -12,11 +18,27 @@ from .models import (
     MeasureImage,
     ContactPerson,
     Reference,
+    RenditionJob,
     Dzes, Pph
 )
 
 
-class BaseAdmin(admin.ModelAdmin):
+class NormalizedSearchMixin:
+    """
+    Searches the model's normalized search_text column instead of search_fields.
+
+    Accent- and case-insensitive ("strecha" finds "Střecha") and served by the
+    trigram index on PostgreSQL.
+    """
+
+    def get_search_results(self, request, queryset, search_term):
+        condition = search_filter(search_term)
+        if condition is None:
+            return queryset, False
+        return queryset.filter(condition), False
+
+
+class BaseAdmin(NormalizedSearchMixin, admin.ModelAdmin):
     """
     A base admin class that includes common functionality.
     """
@@ -236,7 +258,7 @@ class ContactPersonAdmin(admin.ModelAdmin):
     ordering = ("last_name", "first_name")
 
 @admin.register(Measure)
-class MeasureAdmin(admin.ModelAdmin):
+class MeasureAdmin(NormalizedSearchMixin, admin.ModelAdmin):
     """
     Admin configuration for the Measure model.
     """
@@ -423,9 +445,26 @@ class MeasureAdmin(admin.ModelAdmin):
     # Default ordering of records in the admin
     ordering = ("measure_name_cs", "code")
 
+    actions = ("export_selected",)
+
+    @admin.action(description="Export selected measures (import layouts, XLSX)")
+    def export_selected(self, request, queryset):
+        """
+        Download a ZIP archive with one workbook per measure import layout.
+        """
+        measures = list(queryset.values_list("pk", flat=True))
+        # Spooled to disk once it grows, so large selections do not stay in memory
+        archive = tempfile.SpooledTemporaryFile(max_size=10 * 1024 * 1024)
+        with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as bundle:
+            for layout_name in MEASURE_LAYOUTS:
+                with bundle.open(f"{layout_name}.xlsx", "w") as target:
+                    write_export(layout_name, "xlsx", target, measures=measures)
+        archive.seek(0)
+        return FileResponse(archive, as_attachment=True, filename="measures_export.zip")
+
 
 @admin.register(Example)
-class ExampleAdmin(admin.ModelAdmin):
+class ExampleAdmin(NormalizedSearchMixin, admin.ModelAdmin):
     """Admin configuration for the Example model."""
 
     # Fields displayed in the list view
@@ -553,7 +592,7 @@ class ReferenceAdmin(admin.ModelAdmin):
 
 
 @admin.register(Dzes)
-class DzesAdmin(admin.ModelAdmin):
+class DzesAdmin(NormalizedSearchMixin, admin.ModelAdmin):
     # Define the columns to display on the model's list page in the admin interface
     list_display = ('code', 'name_cs', 'name_en', 'url_cs', 'url_en')
 
@@ -567,7 +606,7 @@ class DzesAdmin(admin.ModelAdmin):
     fields = ('code', 'name_cs', 'name_en', 'url_cs', 'url_en')
 
 @admin.register(Pph)
-class PptAdmin(admin.ModelAdmin):
+class PptAdmin(NormalizedSearchMixin, admin.ModelAdmin):
     # Define the columns to display on the model's list page in the admin interface
     list_display = ('code', 'name_cs', 'name_en', 'url_cs', 'url_en')
 
@@ -580,3 +619,50 @@ class PptAdmin(admin.ModelAdmin):
     # Define the fields visible and editable in the form when creating or editing a record
     fields = ('code', 'name_cs', 'name_en', 'url_cs', 'url_en')
 
+
+@admin.register(RenditionJob)
+class RenditionJobAdmin(admin.ModelAdmin):
+    """
+    Admin configuration for the RenditionJob queue.
+    """
+
+    # Admin list view configuration
+    list_display = (
+        "id",
+        "source",
+        "object_id",
+        "status",
+        "attempts",
+        "max_attempts",
+        "available_at",
+        "finished_at",
+    )
+    list_filter = ("status", "source")
+    search_fields = ("=object_id", "last_error")
+    ordering = ("-id",)
+    readonly_fields = (
+        "source",
+        "object_id",
+        "status",
+        "attempts",
+        "last_error",
+        "available_at",
+        "created_at",
+        "started_at",
+        "finished_at",
+    )
+    fields = readonly_fields + ("max_attempts",)
+    actions = ("retry",)
+
+    # Queue progress counters shown above the job list
+    def changelist_view(self, request, extra_context=None):
+        extra_context = {**(extra_context or {}), "queue_counters": queue_counters()}
+        return super().changelist_view(request, extra_context=extra_context)
+
+    @admin.action(description="Retry selected jobs")
+    def retry(self, request, queryset):
+        retried = retry_jobs(queryset)
+        self.message_user(request, f"{retried} jobs queued again.")
+
+    def has_add_permission(self, request):
+        return False
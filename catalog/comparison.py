@@ -0,0 +1,82 @@
+"""
+Side-by-side comparison of measures built from their stored documents.
+
+The comparison is a matrix: one row per compared property, one cell per
+measure. Every cell is a list of labels, so templates render all rows the same
+way, and rows whose cells differ are flagged for highlighting.
+"""
+from django.utils.translation import gettext_lazy as _
+
+# Number of measures that can be compared at once
+MIN_COMPARED = 2
+MAX_COMPARED = 5
+
+
+def _label(item):
+    return [item["label"]] if item else []
+
+
+def _labels(items):
+    return [item["label"] for item in items]
+
+
+def _range(document, currency):
+    price = document["price"]
+    bounds = [price[f"{currency}_min"], price[f"{currency}_max"]]
+    bounds = list(dict.fromkeys(bound for bound in bounds if bound is not None))
+    return ["–".join(str(bound) for bound in bounds)] if bounds else []
+
+
+# (key, label, document -> list of labels)
+COMPARISON_ROWS = (
+    ("group", _("Group"), lambda document: [document["group"]["name"]]),
+    ("code", _("Code"), lambda document: [document["code"]]),
+    ("price_czk", _("Price (CZK)"), lambda document: _range(document, "czk")),
+    ("price_eu", _("Price (Euro)"), lambda document: _range(document, "eu")),
+    ("unit", _("Unit"), lambda document: _label(document["price"]["unit"])),
+    ("env", _("Environment"), lambda document: _label(document["env"])),
+    (
+        "env_secondary",
+        _("Environment (secondary)"),
+        lambda document: _labels(document["env_secondary"]),
+    ),
+    ("potential", _("Potential"), lambda document: _label(document["potential"])),
+    ("size", _("Size"), lambda document: _label(document["size"])),
+    (
+        "difficulty_of_implementation",
+        _("Difficulty of implementation"),
+        lambda document: _label(document["difficulty_of_implementation"]),
+    ),
+    ("quantification", _("Quantification"), lambda document: _label(document["quantification"])),
+    ("time_horizon", _("Time horizon"), lambda document: _label(document["time_horizon"])),
+    ("impact_details", _("Impact details"), lambda document: _label(document["impact_details"])),
+    (
+        "other_impacts_details",
+        _("Other impacts"),
+        lambda document: _labels(document["other_impacts_details"]),
+    ),
+    ("sdg", _("SDG"), lambda document: _labels(document["sdg"])),
+    ("advantages", _("Advantages"), lambda document: list(document["advantages"])),
+    ("disadvantages", _("Disadvantages"), lambda document: list(document["disadvantages"])),
+    ("conflict", _("Conflicts"), lambda document: _labels(document["conflict"])),
+    ("dzes", _("DZES"), lambda document: [item["code"] for item in document["dzes"]]),
+    ("pph", _("PPH"), lambda document: [item["code"] for item in document["pph"]]),
+)
+
+
+def comparison_matrix(documents):
+    """
+    Return the comparison rows of ``documents`` (in the order given).
+    """
+    rows = []
+    for key, label, cell in COMPARISON_ROWS:
+        cells = [cell(document) for document in documents]
+        rows.append(
+            {
+                "key": key,
+                "label": str(label),
+                "cells": cells,
+                "differs": any(sorted(other) != sorted(cells[0]) for other in cells[1:]),
+            }
+        )
+    return rows
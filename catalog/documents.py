@@ -0,0 +1,436 @@
+"""
+Precomputed per-language Measure documents.
+
+Rendering a measure needs about twenty relations. The helpers below resolve them
+once, store the result in MeasureDocument and let readers fetch a single row.
+"""
+import json
+from functools import reduce
+from operator import or_
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from django.utils.translation import get_language, override
+
+from .models import (
+    Advantage,
+    ContactPerson,
+    Disadvantage,
+    Dzes,
+    Group,
+    ImpactCategory,
+    ImpactDetail,
+    Measure,
+    MeasureDocument,
+    Option,
+    OptionName,
+    Pph,
+    Reference,
+)
+from .translations import translation_text, uses_translation_table, with_translations
+
+# Related lookups preloaded for every document build
+MEASURE_SELECT_RELATED = (
+    "group",
+    "env__option_name",
+    "potential__option_name",
+    "size__option_name",
+    "difficulty_of_implementation__option_name",
+    "quantification__option_name",
+    "time_horizon__option_name",
+    "impact_details__impact_category",
+    "unit__option_name",
+    "contact_persons",
+)
+MEASURE_PREFETCH_RELATED = (
+    "advantages",
+    "disadvantages",
+    "env_secondary__option_name",
+    "interconnection__group",
+    "conflict__option_name",
+    "other_impacts_details__impact_category",
+    "sdg__option_name",
+    "references",
+    "dzes",
+    "pph",
+    "gallery",
+    "example_set",
+)
+
+# Measure lookups pointing at each vocabulary model, used to find stale documents
+DEPENDENT_LOOKUPS = {
+    Group: ("group",),
+    Advantage: ("advantages",),
+    Disadvantage: ("disadvantages",),
+    Option: (
+        "env",
+        "env_secondary",
+        "potential",
+        "size",
+        "difficulty_of_implementation",
+        "quantification",
+        "time_horizon",
+        "conflict",
+        "sdg",
+        "unit",
+    ),
+    OptionName: (
+        "env__option_name",
+        "env_secondary__option_name",
+        "potential__option_name",
+        "size__option_name",
+        "difficulty_of_implementation__option_name",
+        "quantification__option_name",
+        "time_horizon__option_name",
+        "conflict__option_name",
+        "sdg__option_name",
+        "unit__option_name",
+    ),
+    ImpactCategory: (
+        "impact_details__impact_category",
+        "other_impacts_details__impact_category",
+    ),
+    ImpactDetail: ("impact_details", "other_impacts_details"),
+    Reference: ("references",),
+    ContactPerson: ("contact_persons",),
+    Dzes: ("dzes",),
+    Pph: ("pph",),
+}
+
+
+def document_languages():
+    return [code for code, _name in settings.LANGUAGES]
+
+
+def measure_document_queryset():
+    return Measure.objects.select_related(*MEASURE_SELECT_RELATED).prefetch_related(
+        *MEASURE_PREFETCH_RELATED
+    )
+
+
+def localized(obj, field, language):
+    # Returns the "<field>_<language>" attribute, falling back to English
+    value = getattr(obj, f"{field}_{language}", None)
+    if value is None:
+        value = getattr(obj, f"{field}_en", None)
+    return value
+
+
+def measure_text(measure, field, language):
+    # Translatable Measure field in either storage mode (see catalog.translations)
+    if hasattr(measure, "translation_rows"):
+        return translation_text(measure, field, language)
+    return localized(measure, field, language)
+
+
+def _rendition_url(spec_file):
+    # URL of the rendition's name only; generation is left to the rendition queue
+    try:
+        return spec_file.storage.url(spec_file.name)
+    except (OSError, ValueError):
+        return None
+
+
+def _title_image(measure):
+    if not measure.title_image:
+        return None
+    return {
+        "url": _rendition_url(measure.processed_title_image),
+        "width": measure.title_image_width,
+        "height": measure.title_image_height,
+        "placeholder": measure.title_image_placeholder,
+    }
+
+
+def _option(option):
+    if option is None:
+        return None
+    return {"id": option.pk, "label": str(option), "category": str(option.option_name)}
+
+
+def _impact_detail(detail):
+    if detail is None:
+        return None
+    return {
+        "id": detail.pk,
+        "label": str(detail),
+        "category": str(detail.impact_category),
+    }
+
+
+def _code(item, language):
+    return {
+        "id": item.pk,
+        "code": item.code,
+        "name": localized(item, "name", language),
+        "url": localized(item, "url", language),
+    }
+
+
+def build_measure_document(measure, language):
+    """
+    Return the JSON-serializable document of ``measure`` in ``language``.
+
+    The measure should come from ``measure_document_queryset()`` so that no
+    relation is loaded lazily.
+    """
+    with override(language):
+        contact = measure.contact_persons
+        return {
+            "id": measure.pk,
+            "language": language,
+            "code": measure.code,
+            "name": measure_text(measure, "measure_name", language),
+            "abstract": measure_text(measure, "abstract", language),
+            "description": measure_text(measure, "description", language),
+            "group": {"id": measure.group_id, "name": str(measure.group)},
+            "advantages": [str(item) for item in measure.advantages.all()],
+            "disadvantages": [str(item) for item in measure.disadvantages.all()],
+            "env": _option(measure.env),
+            "env_secondary": [_option(item) for item in measure.env_secondary.all()],
+            "env_desc": measure.env_desc,
+            "potential": _option(measure.potential),
+            "size": _option(measure.size),
+            "difficulty_of_implementation": _option(
+                measure.difficulty_of_implementation
+            ),
+            "conditions_for_implementation": measure_text(
+                measure, "conditions_for_implementation", language
+            ),
+            "quantification": _option(measure.quantification),
+            "time_horizon": _option(measure.time_horizon),
+            "interconnection": [
+                {"id": item.pk, "name": str(item)}
+                for item in measure.interconnection.all()
+            ],
+            "conflict": [_option(item) for item in measure.conflict.all()],
+            "other_conflict": measure.other_conflict,
+            "impact_details": _impact_detail(measure.impact_details),
+            "other_impacts_details": [
+                _impact_detail(item) for item in measure.other_impacts_details.all()
+            ],
+            "impact_desc": measure_text(measure, "impact_desc", language),
+            "sdg": [_option(item) for item in measure.sdg.all()],
+            "price": {
+                "czk_min": measure.price_czk_min,
+                "czk_max": measure.price_czk_max,
+                "eu_min": measure.price_eu_min,
+                "eu_max": measure.price_eu_max,
+                "unit": _option(measure.unit),
+            },
+            "comment": measure_text(measure, "comment", language),
+            "history": measure_text(measure, "history", language),
+            "invasion": measure.invasion,
+            "references": [
+                {"id": item.pk, "reference": item.reference, "url": item.url}
+                for item in measure.references.all()
+            ],
+            "contact_person": None
+            if contact is None
+            else {
+                "id": contact.pk,
+                "first_name": contact.first_name,
+                "last_name": contact.last_name,
+                "expertise": contact.expertise,
+                "email": contact.email,
+                "phone": contact.phone,
+            },
+            "dzes": [_code(item, language) for item in measure.dzes.all()],
+            "pph": [_code(item, language) for item in measure.pph.all()],
+            "title_image": _title_image(measure),
+            "gallery": [
+                {
+                    "id": image.pk,
+                    "url": _rendition_url(image.processed_image),
+                    "width": image.width,
+                    "height": image.height,
+                    "placeholder": image.placeholder,
+                    "caption": localized(image, "caption", language),
+                    "author": image.author,
+                    "license": image.license,
+                    "license_url": image.license_url,
+                }
+                for image in measure.gallery.all()
+            ],
+            "examples": [
+                {
+                    "id": example.pk,
+                    "name": example.example_name,
+                    "description": localized(example, "description", language),
+                    "web": example.web,
+                    "location": example.location,
+                    "location_label": str(example.get_location_display()),
+                }
+                for example in measure.example_set.all()
+            ],
+        }
+
+
+# Columns needed to render measure cards in the catalog lists
+MEASURE_CARD_FIELDS = (
+    "pk",
+    "measure_name_cs",
+    "measure_name_en",
+    "title_image",
+    "title_image_width",
+    "title_image_height",
+    "title_image_placeholder",
+)
+
+
+def build_measure_card(measure, language):
+    """
+    Return the small dictionary shown for ``measure`` in the catalog lists.
+
+    The measure only needs the MEASURE_CARD_FIELDS columns loaded.
+    """
+    return {
+        "id": measure.pk,
+        "name": measure_text(measure, "measure_name", language),
+        "title_image": _title_image(measure),
+    }
+
+
+def rebuild_measure_documents(measure_ids=None, chunk_size=200):
+    """
+    Rebuild documents of the given measures (all measures when ``measure_ids`` is None).
+
+    Returns the number of documents written.
+    """
+    return sum(1 for _document in _rebuilt_documents(measure_ids, chunk_size))
+
+
+def _rebuilt_documents(measure_ids=None, chunk_size=200):
+    # Rebuilds like rebuild_measure_documents, yielding the documents once stored
+    languages = document_languages()
+    queryset = measure_document_queryset().order_by("pk")
+    if measure_ids is not None:
+        queryset = queryset.filter(pk__in=list(measure_ids))
+    if uses_translation_table():
+        queryset = with_translations(queryset, languages)
+
+    batch = []
+    for measure in queryset.iterator(chunk_size=chunk_size):
+        for language in languages:
+            batch.append(
+                MeasureDocument(
+                    measure=measure,
+                    language=language,
+                    document=build_measure_document(measure, language),
+                )
+            )
+        if len(batch) >= chunk_size:
+            _store_documents(batch)
+            yield from batch
+            batch = []
+    if batch:
+        _store_documents(batch)
+        yield from batch
+
+
+def _store_documents(documents):
+    MeasureDocument.objects.bulk_create(
+        documents,
+        update_conflicts=True,
+        unique_fields=["measure", "language"],
+        update_fields=["document", "updated_at"],
+    )
+
+
+def dependent_measure_ids(instance):
+    """
+    Return ids of measures whose documents embed data of the vocabulary ``instance``.
+    """
+    return measure_ids_depending_on(type(instance), [instance.pk])
+
+
+def measure_ids_depending_on(model, pks):
+    """
+    Return ids of measures whose documents embed any of the ``model`` rows ``pks``.
+
+    Covers measures themselves, vocabulary models and rows pointing at a measure
+    (gallery images, examples).
+    """
+    pks = list(pks)
+    if model is Measure:
+        return pks
+    lookups = DEPENDENT_LOOKUPS.get(model)
+    if lookups:
+        condition = reduce(or_, (Q(**{f"{lookup}__in": pks}) for lookup in lookups))
+        return list(
+            Measure.objects.filter(condition).values_list("pk", flat=True).distinct()
+        )
+    if any(field.name == "measure" for field in model._meta.get_fields()):
+        return list(
+            model.objects.filter(pk__in=pks).values_list("measure_id", flat=True).distinct()
+        )
+    return []
+
+
+def _document_language(language):
+    language = language or get_language()
+    return language if language in document_languages() else "en"
+
+
+def _stored_document(measure_id, language):
+    return MeasureDocument.objects.filter(
+        measure_id=measure_id, language=language
+    ).values_list("document", flat=True)
+
+
+def _build_documents(measure_ids, language):
+    """
+    Rebuild the documents of ``measure_ids``; returns {measure id: document} in ``language``.
+
+    The built documents are returned rather than read back, as inside a request
+    reading from a replica the read could miss the rows just written to the primary.
+    """
+    return {
+        # Serialized and parsed like the stored JSON, so both render the same
+        document.measure_id: json.loads(json.dumps(document.document, cls=DjangoJSONEncoder))
+        for document in _rebuilt_documents(measure_ids)
+        if document.language == language
+    }
+
+
+def get_measure_document(measure_id, language=None):
+    """
+    Return the stored document of a measure, building it on a cache miss.
+
+    Returns None when the measure does not exist.
+    """
+    language = _document_language(language)
+    document = _stored_document(measure_id, language).first()
+    if document is None:
+        document = _build_documents([measure_id], language).get(measure_id)
+    return document
+
+
+def get_measure_documents(measure_ids, language=None):
+    """
+    Return {measure id: document} of several measures with one query.
+
+    Missing documents are built first, like in get_measure_document;
+    measures that do not exist are left out.
+    """
+    language = _document_language(language)
+    stored = MeasureDocument.objects.filter(measure_id__in=measure_ids, language=language)
+    documents = dict(stored.values_list("measure_id", "document"))
+    missing = [pk for pk in measure_ids if pk not in documents]
+    if missing:
+        documents.update(_build_documents(missing, language))
+    return documents
+
+
+async def aget_measure_document(measure_id, language=None):
+    """
+    Async variant of get_measure_document.
+    """
+    language = _document_language(language)
+    document = await _stored_document(measure_id, language).afirst()
+    if document is None:
+        documents = await sync_to_async(_build_documents)([measure_id], language)
+        document = documents.get(measure_id)
+    return document
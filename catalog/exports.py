@@ -0,0 +1,402 @@
+"""
+Streaming export of the catalog in the column layouts read by the import commands.
+
+Every layout yields plain row tuples from a chunked queryset iterator, so the
+writers below run in constant memory regardless of the catalog size.
+"""
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Prefetch
+
+from .documents import localized, measure_text
+from .models import (
+    Advantage,
+    Disadvantage,
+    Example,
+    Group,
+    ImpactCategory,
+    ImpactDetail,
+    Measure,
+    Option,
+    OptionName,
+)
+from .translations import uses_translation_table, with_translations
+
+EXPORT_FORMATS = ("xlsx", "csv", "jsonl")
+
+# Many-to-many columns of the `m4` layout, in the order the importer expects
+M2M_COLUMNS = (
+    "advantages",
+    "disadvantages",
+    "env_secondary",
+    "interconnection",
+    "conflict",
+    "other_impacts_details",
+    "sdg",
+)
+
+# Foreign key columns of the `me3` layout
+FK_COLUMNS = (
+    "env",
+    "potential",
+    "size",
+    "difficulty_of_implementation",
+    "quantification",
+    "time_horizon",
+    "impact_details",
+    "unit",
+)
+
+
+class ExportLayout:
+    """
+    Column layout of one import command together with the rows feeding it.
+    """
+
+    def __init__(self, name, columns, queryset, row, measure_lookup=None):
+        self.name = name
+        self.columns = columns
+        self._queryset = queryset
+        self._row = row
+        # Lookup restricting the layout to a set of measures, None if not applicable
+        self.measure_lookup = measure_lookup
+
+    def queryset(self, measures=None):
+        queryset = self._queryset()
+        if measures is not None and self.measure_lookup:
+            queryset = queryset.filter(**{f"{self.measure_lookup}__in": measures})
+        return queryset
+
+    def rows(self, measures=None, chunk_size=2000):
+        for obj in self.queryset(measures).iterator(chunk_size=chunk_size):
+            yield self._row(obj)
+
+
+def _id_list(manager):
+    # Comma-separated IDs as parsed by the `m4` importer
+    return ",".join(str(item.pk) for item in manager.all()) or None
+
+
+def _m2m_queryset():
+    return Measure.objects.order_by("pk").prefetch_related(
+        *(
+            Prefetch(name, queryset=Measure._meta.get_field(name).related_model.objects.only("pk"))
+            for name in M2M_COLUMNS
+        )
+    )
+
+
+LAYOUTS = {
+    layout.name: layout
+    for layout in (
+        ExportLayout(
+            "import_groups",
+            ("id", "cs", "en"),
+            lambda: Group.objects.order_by("pk"),
+            lambda obj: (obj.pk, obj.group_name_cs, obj.group_name_en),
+        ),
+        ExportLayout(
+            "import_advantages",
+            ("id", "description", "translate"),
+            lambda: Advantage.objects.order_by("pk"),
+            lambda obj: (obj.pk, obj.advantage_description_cs, obj.advantage_description_en),
+        ),
+        ExportLayout(
+            "import_disadvantages",
+            ("id", "description", "translate"),
+            lambda: Disadvantage.objects.order_by("pk"),
+            lambda obj: (
+                obj.pk,
+                obj.disadvantage_description_cs,
+                obj.disadvantage_description_en,
+            ),
+        ),
+        ExportLayout(
+            "import_impact",
+            ("tag_id", "tag_name", "tag_trans"),
+            lambda: ImpactCategory.objects.order_by("pk"),
+            lambda obj: (obj.pk, obj.impact_category_name_cs, obj.impact_category_name_en),
+        ),
+        ExportLayout(
+            "import_details",
+            ("id", "tag_id", "tag_trans", "tag_detail", "detail_trans"),
+            lambda: ImpactDetail.objects.select_related("impact_category").order_by("pk"),
+            lambda obj: (
+                obj.pk,
+                obj.impact_category_id,
+                obj.impact_category.impact_category_name_en,
+                obj.impact_detail_cs,
+                obj.impact_detail_en,
+            ),
+        ),
+        ExportLayout(
+            "load_option_names",
+            ("id", "choice_name", "choice_name_trans"),
+            lambda: OptionName.objects.order_by("pk"),
+            lambda obj: (obj.pk, obj.option_name_cs, obj.option_name_en),
+        ),
+        ExportLayout(
+            "load_options",
+            (
+                "id",
+                "choice_name_id",
+                "choice",
+                "choice_trans",
+                "order",
+                "description",
+                "description_trans",
+            ),
+            lambda: Option.objects.order_by("pk"),
+            lambda obj: (
+                obj.pk,
+                obj.option_name_id,
+                obj.option_cs,
+                obj.option_en,
+                obj.order,
+                obj.description_cs,
+                obj.description_en,
+            ),
+        ),
+        ExportLayout(
+            "me1",
+            (
+                "id",
+                "group_id",
+                "measure_name_cs",
+                "measure_name_en",
+                "code",
+                "description_cs",
+                "description_en",
+                "price_czk",
+                "price_eu",
+            ),
+            lambda: Measure.objects.order_by("pk"),
+            lambda obj: (
+                obj.pk,
+                obj.group_id,
+                obj.measure_name_cs,
+                obj.measure_name_en,
+                obj.code,
+                obj.description_cs,
+                obj.description_en,
+                obj.price_czk_min,
+                obj.price_eu_min,
+            ),
+            measure_lookup="pk",
+        ),
+        ExportLayout(
+            "me2",
+            (
+                "id",
+                "conditions_for_implementation_cs",
+                "conditions_for_implementation_en",
+                "abstract_cs",
+                "abstract_en",
+            ),
+            lambda: Measure.objects.order_by("pk"),
+            lambda obj: (
+                obj.pk,
+                obj.conditions_for_implementation_cs,
+                obj.conditions_for_implementation_en,
+                obj.abstract_cs,
+                obj.abstract_en,
+            ),
+            measure_lookup="pk",
+        ),
+        ExportLayout(
+            "me3",
+            ("id", *FK_COLUMNS),
+            lambda: Measure.objects.order_by("pk"),
+            lambda obj: (obj.pk, *(getattr(obj, f"{name}_id") for name in FK_COLUMNS)),
+            measure_lookup="pk",
+        ),
+        ExportLayout(
+            "m4",
+            ("id", *M2M_COLUMNS),
+            _m2m_queryset,
+            lambda obj: (obj.pk, *(_id_list(getattr(obj, name)) for name in M2M_COLUMNS)),
+            measure_lookup="pk",
+        ),
+        ExportLayout(
+            "load_examples",
+            ("id", "measure", "example_name", "description", "trans", "web", "location"),
+            lambda: Example.objects.order_by("pk"),
+            lambda obj: (
+                obj.pk,
+                obj.measure_id,
+                obj.example_name,
+                obj.description_cs,
+                obj.description_en,
+                obj.web,
+                obj.location,
+            ),
+            measure_lookup="measure",
+        ),
+    )
+}
+
+# All measure columns in one sheet, as read by import_measures
+LAYOUTS["import_measures"] = ExportLayout(
+    "import_measures",
+    tuple(
+        column
+        for name in ("me1", "me2", "me3", "m4")
+        for column in LAYOUTS[name].columns
+        if name == "me1" or column != "id"
+    ),
+    _m2m_queryset,
+    lambda obj: (
+        *LAYOUTS["me1"]._row(obj),
+        *(value for name in ("me2", "me3", "m4") for value in LAYOUTS[name]._row(obj)[1:]),
+    ),
+    measure_lookup="pk",
+)
+
+# Layouts describing measures, exported by the admin action
+MEASURE_LAYOUTS = tuple(name for name, layout in LAYOUTS.items() if layout.measure_lookup)
+
+
+# Columns of the public, localized measure export
+LOCALIZED_MEASURE_COLUMNS = (
+    "id",
+    "code",
+    "name",
+    "group",
+    "abstract",
+    "env",
+    "potential",
+    "size",
+    "difficulty_of_implementation",
+    "quantification",
+    "time_horizon",
+    "impact_details",
+    "sdg",
+    "price_czk_min",
+    "price_czk_max",
+    "price_eu_min",
+    "price_eu_max",
+    "unit",
+)
+
+
+def localized_measure_queryset():
+    return (
+        Measure.objects.select_related(
+            "group",
+            "env",
+            "potential",
+            "size",
+            "difficulty_of_implementation",
+            "quantification",
+            "time_horizon",
+            "impact_details",
+            "unit",
+        )
+        .prefetch_related("sdg")
+        .order_by("pk")
+    )
+
+
+def _option_label(option, language):
+    return None if option is None else localized(option, "option", language)
+
+
+def iter_localized_measure_rows(queryset, language, chunk_size=500, storage=None):
+    """
+    Yield LOCALIZED_MEASURE_COLUMNS rows with labels in ``language``.
+
+    Labels are read from the language columns directly rather than through the
+    active translation, which may not survive until a streamed response is consumed.
+    In the "table" translation storage only the translation rows of
+    ``language`` are loaded for the measures' own texts.
+    """
+    if uses_translation_table(storage):
+        queryset = with_translations(queryset, [language])
+    for measure in queryset.iterator(chunk_size=chunk_size):
+        yield (
+            measure.pk,
+            measure.code,
+            measure_text(measure, "measure_name", language),
+            localized(measure.group, "group_name", language),
+            measure_text(measure, "abstract", language),
+            _option_label(measure.env, language),
+            _option_label(measure.potential, language),
+            _option_label(measure.size, language),
+            _option_label(measure.difficulty_of_implementation, language),
+            _option_label(measure.quantification, language),
+            _option_label(measure.time_horizon, language),
+            None
+            if measure.impact_details is None
+            else localized(measure.impact_details, "impact_detail", language),
+            "; ".join(_option_label(goal, language) for goal in measure.sdg.all()),
+            measure.price_czk_min,
+            measure.price_czk_max,
+            measure.price_eu_min,
+            measure.price_eu_max,
+            _option_label(measure.unit, language),
+        )
+
+
+class _Echo:
+    # Pseudo-buffer returning what csv.writer writes instead of storing it
+    def write(self, value):
+        return value
+
+
+def iter_csv(columns, rows):
+    """
+    Yield CSV lines (header first) for ``rows``.
+    """
+    writer = csv.writer(_Echo())
+    yield writer.writerow(columns)
+    for row in rows:
+        yield writer.writerow(["" if value is None else value for value in row])
+
+
+def iter_jsonl(columns, rows):
+    """
+    Yield one JSON object per line for ``rows``.
+    """
+    for row in rows:
+        yield json.dumps(dict(zip(columns, row)), ensure_ascii=False, cls=DjangoJSONEncoder) + "\n"
+
+
+def write_xlsx(columns, rows, target):
+    """
+    Write ``rows`` into a workbook saved to ``target`` (path or binary file object).
+
+    openpyxl's write-only mode flushes rows to a temporary file as they come,
+    so memory use does not grow with the number of rows.
+    """
+    import openpyxl
+
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(list(columns))
+    for row in rows:
+        sheet.append(list(row))
+    workbook.save(target)
+
+
+def write_export(layout_name, export_format, target, measures=None, chunk_size=2000):
+    """
+    Export a layout to ``target`` in ``export_format`` and return the layout.
+
+    ``target`` is a path or a binary file object; text formats are UTF-8 encoded.
+    """
+    layout = LAYOUTS[layout_name]
+    rows = layout.rows(measures, chunk_size=chunk_size)
+    if export_format == "xlsx":
+        write_xlsx(layout.columns, rows, target)
+        return layout
+
+    lines = iter_csv(layout.columns, rows) if export_format == "csv" else iter_jsonl(layout.columns, rows)
+    if isinstance(target, (str, bytes)) or hasattr(target, "__fspath__"):
+        with open(target, "w", encoding="utf-8", newline="") as stream:
+            stream.writelines(lines)
+    else:
+        for line in lines:
+            target.write(line.encode("utf-8"))
+    return layout
@@ -0,0 +1,73 @@
+"""
+Facet filters applied to Measure querysets from request parameters.
+"""
+from .prices import price_filter
+from .search import search_filter
+
+# Query parameter -> Measure lookup; every facet accepts repeated IDs (OR-ed)
+MEASURE_FACETS = {
+    "group": "group",
+    "advantages": "advantages",
+    "disadvantages": "disadvantages",
+    "env": "env",
+    "env_secondary": "env_secondary",
+    "potential": "potential",
+    "size": "size",
+    "difficulty_of_implementation": "difficulty_of_implementation",
+    "quantification": "quantification",
+    "time_horizon": "time_horizon",
+    "conflict": "conflict",
+    "impact_details": "impact_details",
+    "other_impacts_details": "other_impacts_details",
+    "sdg": "sdg",
+    "unit": "unit",
+    "dzes": "dzes",
+    "pph": "pph",
+}
+
+# Facets spanning many-to-many relations, which may duplicate rows
+MULTI_VALUED_FACETS = {
+    "advantages",
+    "disadvantages",
+    "env_secondary",
+    "conflict",
+    "other_impacts_details",
+    "sdg",
+    "dzes",
+    "pph",
+}
+
+
+def facet_values(params):
+    """
+    Return {facet: [ids]} for the facets present in ``params`` (a QueryDict).
+
+    Non-numeric values are ignored.
+    """
+    selected = {}
+    for facet in MEASURE_FACETS:
+        ids = [int(value) for value in params.getlist(facet) if value.strip().isdigit()]
+        if ids:
+            selected[facet] = ids
+    return selected
+
+
+def filter_measures(queryset, params):
+    """
+    Narrow ``queryset`` down to the measures matching every facet, the
+    search query and the price range in ``params``.
+    """
+    selected = facet_values(params)
+    for facet, ids in selected.items():
+        queryset = queryset.filter(**{f"{MEASURE_FACETS[facet]}__in": ids})
+    # Free-text search ("q") over the normalized names, code and descriptions
+    condition = search_filter(params.get("q", ""))
+    if condition is not None:
+        queryset = queryset.filter(condition)
+    # Price range ("price_min", "price_max", optional "currency")
+    condition = price_filter(params)
+    if condition is not None:
+        queryset = queryset.filter(condition)
+    if MULTI_VALUED_FACETS.intersection(selected):
+        queryset = queryset.distinct()
+    return queryset
@@ -0,0 +1,114 @@
+"""
+Normalization of uploaded original images.
+
+Uploads are rotated according to their EXIF orientation, stripped of metadata,
+downscaled to CATALOG_IMAGE_MAX_DIMENSION and re-encoded. They are stored under
+the SHA-256 of the uploaded bytes, so the same photo uploaded for several
+measures is kept (and rendered) only once.
+"""
+import base64
+import hashlib
+import io
+import posixpath
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+
+# Extensions a normalized original may be stored with
+NORMALIZED_EXTENSIONS = ("jpg", "png")
+
+
+def content_hash(file):
+    digest = hashlib.sha256()
+    file.seek(0)
+    for chunk in iter(lambda: file.read(1024 * 1024), b""):
+        digest.update(chunk)
+    file.seek(0)
+    return digest.hexdigest()
+
+
+def normalize_image(file):
+    """
+    Return (bytes, extension) of the normalized version of the image in ``file``.
+    """
+    from PIL import Image, ImageOps
+
+    max_dimension = settings.CATALOG_IMAGE_MAX_DIMENSION
+    file.seek(0)
+    with Image.open(file) as original:
+        # Decoding at a reduced scale is much cheaper for large JPEGs
+        original.draft("RGB", (max_dimension, max_dimension))
+        image = ImageOps.exif_transpose(original)
+        image.thumbnail((max_dimension, max_dimension), Image.Resampling.LANCZOS)
+
+        output = io.BytesIO()
+        has_alpha = image.mode in ("RGBA", "LA") or (
+            image.mode == "P" and "transparency" in image.info
+        )
+        encoded = image if has_alpha else image.convert("RGB")
+        options = {}
+        # The profile describes the source mode's channels, e.g. CMYK ones, so it
+        # is only kept when the pixels are stored in that mode
+        if original.info.get("icc_profile") and encoded.mode == image.mode:
+            options["icc_profile"] = original.info["icc_profile"]
+        if has_alpha:
+            encoded.save(output, "PNG", optimize=True, **options)
+            extension = "png"
+        else:
+            encoded.save(
+                output,
+                "JPEG",
+                quality=settings.CATALOG_IMAGE_QUALITY,
+                optimize=True,
+                progressive=True,
+                **options,
+            )
+            extension = "jpg"
+    return output.getvalue(), extension
+
+
+def normalize_upload(field_file):
+    """
+    Replace a freshly uploaded ``field_file`` by its normalized, content-addressed copy.
+
+    Does nothing for files already stored. Must run before the model is saved.
+    """
+    if not field_file or field_file._committed:
+        return
+    upload = field_file.file
+    digest = content_hash(upload)
+    directory = posixpath.join(settings.CATALOG_IMAGE_DIR, digest[:2])
+    storage = field_file.storage
+
+    for extension in NORMALIZED_EXTENSIONS:
+        name = posixpath.join(directory, f"{digest}.{extension}")
+        if storage.exists(name):
+            break
+    else:
+        data, extension = normalize_image(upload)
+        name = storage.save(
+            posixpath.join(directory, f"{digest}.{extension}"), ContentFile(data)
+        )
+
+    field_file.name = name
+    field_file._committed = True
+
+
+def rendition_metadata(file):
+    """
+    Return (width, height, placeholder data URI) of the image in ``file``.
+
+    The placeholder is a tiny, heavily compressed JPEG shown blurred while the
+    real image loads.
+    """
+    from PIL import Image
+
+    file.seek(0)
+    with Image.open(file) as image:
+        width, height = image.size
+        preview = image.convert("RGB")
+        preview.thumbnail((settings.CATALOG_PLACEHOLDER_SIZE,) * 2)
+        output = io.BytesIO()
+        preview.save(output, "JPEG", quality=40)
+    encoded = base64.b64encode(output.getvalue()).decode("ascii")
+    return width, height, f"data:image/jpeg;base64,{encoded}"
@@ -0,0 +1,819 @@
+"""
+Shared machinery of the catalog import commands.
+
+An import command declares how the sheet columns map onto model fields. The
+files given on the command line (paths or globs) are read and validated by a
+process pool; the main process is the only writer and stores each file in its
+own transaction with bulk queries. At most ``--max-pending`` files are parsed
+ahead of the writer, which bounds the memory held by fast readers.
+
+Rows are checked column-wise before anything is written: foreign keys, unique
+values, Czech/English pairs and length limits. ``--validate`` stops there and
+prints a JSON report of the problems.
+"""
+import glob
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, models, transaction
+from django.utils import timezone
+
+from .documents import measure_ids_depending_on
+from .models import Advantage, Disadvantage, Group, Measure, Option, OptionName
+from .prices import NORMALIZED_PRICE_FIELDS, normalize_prices
+from .search import SEARCH_TEXT_FIELDS, SUGGESTION_MODELS, search_text, suggestion_index
+from .signals import schedule_document_rebuild
+
+# Field types whose cells are parsed as integers (auto fields included)
+INTEGER_FIELD_TYPES = (models.IntegerField, models.ForeignKey)
+
+# Spreadsheet row number of the first data row (row 1 holds the header)
+FIRST_ROW = 2
+
+# Field pairs the models' clean() requires to differ when both are filled in
+DISTINCT_TRANSLATIONS = {
+    Group: [("group_name_cs", "group_name_en")],
+    Advantage: [("advantage_description_cs", "advantage_description_en")],
+    Disadvantage: [("disadvantage_description_cs", "disadvantage_description_en")],
+    OptionName: [("option_name_cs", "option_name_en")],
+    Option: [("option_cs", "option_en"), ("description_cs", "description_en")],
+    Measure: [("description_cs", "description_en")],
+}
+
+# Parse result keys included in the JSON report
+REPORT_KEYS = ("path", "rows", "valid_rows", "error", "issues")
+
+
+def expand_paths(patterns):
+    """
+    Return the files matching ``patterns`` (plain paths or globs), without duplicates.
+    """
+    paths = []
+    for pattern in patterns:
+        if glob.has_magic(pattern):
+            matches = sorted(glob.glob(pattern))
+            if not matches:
+                raise CommandError(f"No files match '{pattern}'.")
+            paths.extend(matches)
+        elif not os.path.exists(pattern):
+            raise CommandError(f"The file '{pattern}' does not exist.")
+        else:
+            paths.append(pattern)
+    return list(dict.fromkeys(paths))
+
+
+def init_worker():
+    # Child processes started with "spawn" (macOS, Windows) need their own setup
+    import django
+    from django.apps import apps
+
+    if not apps.ready:
+        django.setup()
+
+
+def read_sheet(path, spec):
+    """
+    Read ``path`` into a DataFrame of model fields, or raise ValueError.
+
+    ``path`` may also be a tuple of files; with ``join_sheets`` all their
+    sheets are outer-joined on the primary key column into one table.
+    """
+    import pandas as pd
+
+    paths = (path,) if isinstance(path, str) else path
+    frames = []
+    for name in paths:
+        try:
+            data = pd.read_excel(name, dtype=object, sheet_name=None if spec["join_sheets"] else 0)
+        except Exception as e:
+            raise ValueError(f"Could not read file {name}: {e}")
+        frames.extend(data.values() if spec["join_sheets"] else [data])
+
+    data = frames[0]
+    pk_column = spec["pk_column"]
+    for other in frames[1:]:
+        if pk_column not in data.columns or pk_column not in other.columns:
+            raise ValueError(f"Every sheet needs the '{pk_column}' column to be joined")
+        repeated = (set(data.columns) & set(other.columns)) - {pk_column}
+        if repeated:
+            raise ValueError(f"Columns appear in several sheets: {', '.join(sorted(repeated))}")
+        data = data.merge(other, on=pk_column, how="outer")
+
+    columns = spec["columns"]
+    if spec["positional"]:
+        # Sheets without a usable header are read by column order
+        data = data.iloc[:, : len(columns)]
+        data.columns = list(columns)[: data.shape[1]]
+    missing = [column for column in columns if column not in data.columns]
+    if spec["partial"]:
+        # Only the primary key is mandatory, absent columns are left as stored
+        missing = [column for column in missing if column == pk_column]
+    if missing:
+        raise ValueError(f"Missing required columns: {', '.join(missing)}")
+    present = [column for column in columns if column in data.columns]
+    return data[present].rename(columns=columns).reset_index(drop=True)
+
+
+def parse_file(path, spec):
+    """
+    Parse and validate one sheet; runs inside the worker processes.
+
+    Every check runs on whole columns. Returns a dict with the valid
+    ``records`` (field -> value, plus "_row"), the many-to-many ``relations``
+    of the valid rows, the ``issues`` of rejected rows (row, field, check and
+    message), or a file-level ``error``.
+    """
+    import pandas as pd
+
+    started = time.perf_counter()
+    result = {
+        "path": path if isinstance(path, str) else " + ".join(path),
+        "records": [],
+        "issues": [],
+        "rows": 0,
+        "valid_rows": 0,
+        "error": None,
+    }
+    try:
+        frame = read_sheet(path, spec)
+    except ValueError as e:
+        result["error"] = str(e)
+        result["seconds"] = time.perf_counter() - started
+        return result
+
+    issues = result["issues"]
+
+    def flag(mask, field, check, describe):
+        mask = mask.fillna(False).astype(bool)
+        for index in frame.index[mask]:
+            issues.append(
+                {"row": int(index) + FIRST_ROW, "field": field, "check": check, "message": describe(index)}
+            )
+        return mask
+
+    rejected = pd.Series(False, index=frame.index)
+    for field in frame.columns:
+        column = frame[field]
+        if field in spec["integer_fields"]:
+            numbers = pd.to_numeric(column, errors="coerce")
+            invalid = flag(
+                column.notna() & (numbers.isna() | (numbers % 1 != 0)),
+                field,
+                "type",
+                lambda index: f"{field}: '{column[index]}' is not a whole number",
+            )
+            rejected |= invalid
+            frame[field] = numbers.where(~invalid).round().astype("Int64")
+        else:
+            frame[field] = column.map(lambda value: value.strip() if isinstance(value, str) else value)
+            # Cells holding only whitespace count as blank
+            frame[field] = frame[field].replace("", None)
+
+    for field, default in spec["defaults"].items():
+        if field in frame:
+            frame[field] = frame[field].fillna(default)
+
+    def blank(field):
+        # Columns absent from a partial sheet count as blank
+        return frame[field].isna() if field in frame else pd.Series(True, index=frame.index)
+
+    for field in spec["required"]:
+        rejected |= flag(
+            blank(field) & ~rejected, field, "required", lambda index: f"missing value in {field}"
+        )
+
+    checks = spec["checks"]
+    pk_name = spec["pk"]
+    if spec["create"] and checks["existing_ids"] is not None:
+        # Blank cells keep stored values, so only new rows need every value
+        new = ~frame[pk_name].isin(checks["existing_ids"])
+        for field in spec["required_new"]:
+            rejected |= flag(
+                new & blank(field) & ~rejected,
+                field,
+                "required",
+                lambda index: f"missing value in {field} for a new {spec['model']}",
+            )
+
+    for field, ids in checks["foreign_keys"].items():
+        if field not in frame:
+            continue
+        column = frame[field]
+        rejected |= flag(
+            column.notna() & ~column.isin(ids),
+            field,
+            "foreign_key",
+            lambda index: f"{field} {column[index]} does not exist",
+        )
+
+    # Comma-separated ids of many-to-many relations, one (row, id) entry per id
+    relations = {}
+    for field, ids in checks["relations"].items():
+        if field not in frame:
+            continue
+        cells = frame[field].dropna().astype("string")
+        items = cells.str.split(",").explode().str.strip()
+        items = items[items.notna() & (items != "")]
+        numbers = pd.to_numeric(items, errors="coerce")
+        malformed = numbers.isna() | (numbers % 1 != 0)
+        rejected |= flag(
+            pd.Series(frame.index.isin(items.index[malformed]), index=frame.index),
+            field,
+            "type",
+            lambda index: f"{field}: '{cells[index]}' is not a list of whole numbers",
+        )
+        numbers = numbers[~malformed].astype("int64")
+        unknown = numbers[~numbers.isin(ids)]
+        rejected |= flag(
+            pd.Series(frame.index.isin(unknown.index), index=frame.index),
+            field,
+            "foreign_key",
+            lambda index: f"{field} {', '.join(map(str, unknown[unknown.index == index]))} do not exist",
+        )
+        relations[field] = (cells.index, numbers)
+
+    if not spec["create"]:
+        rejected |= flag(
+            frame[pk_name].notna() & ~frame[pk_name].isin(checks["existing_ids"]),
+            pk_name,
+            "missing",
+            lambda index: f"{spec['model']} {frame[pk_name][index]} does not exist",
+        )
+
+    for field, max_length in checks["max_length"].items():
+        if field not in frame:
+            continue
+        lengths = frame[field].astype("string").str.len()
+        rejected |= flag(
+            lengths > max_length,
+            field,
+            "max_length",
+            lambda index: f"{field} has {lengths[index]} characters, at most {max_length} are allowed",
+        )
+
+    for first, second in checks["distinct"]:
+        if first not in frame or second not in frame:
+            continue
+        same = (
+            frame[first].notna()
+            & frame[second].notna()
+            & (frame[first].astype("string") == frame[second].astype("string"))
+        )
+        rejected |= flag(same, first, "translation", lambda index: f"{first} and {second} must be different")
+
+    rejected |= flag(
+        frame[pk_name].notna() & frame[pk_name].duplicated(keep=False),
+        pk_name,
+        "unique",
+        lambda index: f"{pk_name} {frame[pk_name][index]} appears more than once in the file",
+    )
+    for constraint in checks["unique"]:
+        if set(constraint["fields"]) <= set(frame.columns):
+            rejected |= check_unique(frame, spec, constraint, flag)
+
+    issues.sort(key=lambda issue: issue["row"])
+    # Blank cells leave a relation unchanged, filled ones replace it
+    result["relations"] = {}
+    for field, (filled, numbers) in relations.items():
+        linked = numbers[~rejected[numbers.index].to_numpy()]
+        result["relations"][field] = {
+            "replaced": frame[pk_name][filled[~rejected[filled].to_numpy()]].tolist(),
+            "sources": frame[pk_name][linked.index].tolist(),
+            "targets": linked.tolist(),
+        }
+
+    valid = frame[~rejected].drop(columns=list(relations)).astype(object)
+    valid = valid.where(valid.notna(), None)
+    valid["_row"] = valid.index + FIRST_ROW
+    result["records"] = valid.to_dict("records")
+    result["rows"] = len(frame)
+    result["valid_rows"] = len(valid)
+    result["seconds"] = time.perf_counter() - started
+    return result
+
+
+def key_frame(data, fields, integer_fields):
+    # Common dtypes, so sheet cells and database values compare equal
+    return data.astype(
+        {field: "Int64" if field in integer_fields else "string" for field in fields}
+    )
+
+
+def check_unique(frame, spec, constraint, flag):
+    """
+    Flag rows repeating a unique value within the file or taking one stored
+    for another row; returns the mask of flagged rows.
+    """
+    import pandas as pd
+
+    fields = constraint["fields"]
+    pk_name = spec["pk"]
+    label = ", ".join(fields)
+    # NULLs never collide in the database
+    keys = key_frame(frame[fields], fields, spec["integer_fields"]).dropna()
+
+    flagged = flag(
+        keys.duplicated(keep=False).reindex(frame.index, fill_value=False),
+        label,
+        "unique",
+        lambda index: f"{label} repeats within the file",
+    )
+    if not constraint["existing"]:
+        return flagged
+
+    existing = pd.DataFrame(constraint["existing"], columns=[*fields, "_owner"])
+    existing = key_frame(existing, fields, spec["integer_fields"]).dropna(subset=fields)
+    owners = (
+        keys.reset_index()
+        .merge(existing, on=fields, how="left")
+        .set_index("index")["_owner"]
+        .reindex(frame.index)
+    )
+    taken = owners.notna() & (owners != frame[pk_name]).fillna(True) & ~flagged
+    return flagged | flag(
+        taken,
+        label,
+        "unique",
+        lambda index: f"{label} already belongs to {spec['model']} {owners[index]}",
+    )
+
+
+class ImportCommand(BaseCommand):
+    """
+    Base class of the catalog import commands.
+
+    Subclasses set ``model`` and ``columns`` (sheet column -> model field
+    attname, the primary key included) and may override ``write_batch``.
+    """
+
+    model = None
+    columns = {}
+    # Columns are matched by their order instead of the header names
+    positional = False
+    # Fields that must have a value, rows without one are skipped (non-nullable
+    # fields are always required unless blank cells keep the stored value)
+    required = ()
+    # Values used for blank cells
+    defaults = {}
+    # Create rows for unknown ids; otherwise such rows are skipped
+    create = True
+    # Blank cells clear the stored value; if False the stored value is kept
+    overwrite_blank = True
+    # Columns may be left out of the sheet (their fields are not written)
+    partial = False
+    # Every sheet of a file, or with --join of all the files, is joined on the
+    # primary key column into one table
+    join_sheets = False
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "paths", nargs="+", help="Excel files or glob patterns (e.g. 'examples/*.xlsx')"
+        )
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=min(4, os.cpu_count() or 1),
+            help="Number of processes parsing the files (0 parses in this process)",
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=500, help="Number of rows written per query"
+        )
+        parser.add_argument(
+            "--max-pending",
+            type=int,
+            default=0,
+            help="Maximum number of files parsed ahead of the writer (default: twice the processes)",
+        )
+        parser.add_argument(
+            "--validate",
+            "--dry-run",
+            action="store_true",
+            dest="validate",
+            help="Only check the files and report the problems, nothing is written",
+        )
+        parser.add_argument(
+            "--report",
+            help="Write a JSON report of the checked files to this path ('-' for the "
+            "standard output, the default with --validate)",
+        )
+        if self.join_sheets:
+            parser.add_argument(
+                "--join",
+                action="store_true",
+                help="Join the sheets of all the files on the id column into one import",
+            )
+
+    def spec(self):
+        fields = [self.model._meta.get_field(field) for field in self.columns.values()]
+        integer_fields = [
+            field.attname for field in fields if isinstance(field, INTEGER_FIELD_TYPES)
+        ]
+        pk_name = self.model._meta.pk.attname
+        required = [pk_name, *self.required]
+        # Blank cells would be written as NULL into these columns
+        not_null = [
+            field.attname
+            for field in fields
+            if not field.null
+            and not field.has_default()
+            and not field.many_to_many
+            and field.attname not in self.defaults
+        ]
+        if self.overwrite_blank:
+            required += not_null
+        return {
+            "model": self.model.__name__,
+            "pk": pk_name,
+            "pk_column": next(column for column, field in self.columns.items() if field == pk_name),
+            "columns": dict(self.columns),
+            "positional": self.positional,
+            "partial": self.partial,
+            "join_sheets": self.join_sheets,
+            "create": self.create,
+            "required": list(dict.fromkeys(required)),
+            "required_new": [] if self.overwrite_blank else not_null,
+            "defaults": dict(self.defaults),
+            "integer_fields": integer_fields,
+            "checks": self.checks,
+        }
+
+    def handle(self, *args, **kwargs):
+        paths = expand_paths(kwargs["paths"])
+        if kwargs.get("join"):
+            paths = [tuple(paths)]
+        self.verbosity = kwargs["verbosity"]
+        self.batch_size = kwargs["batch_size"]
+        validate = kwargs["validate"]
+        report_path = kwargs["report"] or ("-" if validate else None)
+        # A JSON report on the standard output moves the messages to stderr
+        self.log = self.stderr if report_path == "-" else self.stdout
+        self.live = self.log.isatty()
+        self.prepare()
+        totals = {"rows": 0, "created": 0, "updated": 0, "unchanged": 0, "skipped": 0}
+        failed = []
+        files = []
+        parse_seconds = write_seconds = 0.0
+        self.started = time.perf_counter()
+        max_pending = kwargs["max_pending"] or 2 * max(kwargs["processes"], 1)
+
+        for result in self.parsed_files(paths, kwargs["processes"], max_pending):
+            parse_seconds += result["seconds"]
+            files.append({key: result[key] for key in REPORT_KEYS})
+            if result["error"]:
+                failed.append(result["path"])
+                self.report(self.style.ERROR(f"{result['path']}: {result['error']}"))
+                continue
+            if validate:
+                self.report_issues(result)
+                continue
+
+            write_started = time.perf_counter()
+            try:
+                counts = self.write_file(result, totals)
+            except Exception as e:
+                failed.append(result["path"])
+                self.report(
+                    self.style.ERROR(f"{result['path']}: rolled back, {type(e).__name__}: {e}")
+                )
+                continue
+            finally:
+                write_seconds += time.perf_counter() - write_started
+
+            for key in totals:
+                totals[key] += counts[key]
+            self.report(
+                f"{result['path']}: {counts['rows']} rows, {counts['created']} created, "
+                f"{counts['updated']} updated, {counts['unchanged']} unchanged, "
+                f"{counts['skipped']} skipped"
+            )
+
+        elapsed = time.perf_counter() - self.started
+        issues = sum(len(file["issues"]) for file in files)
+        if report_path:
+            self.write_report(report_path, files, validate, elapsed)
+
+        if validate:
+            summary = (
+                f"{len(files)} files ({len(failed)} unreadable), "
+                f"{sum(file['rows'] for file in files)} rows, "
+                f"{sum(file['valid_rows'] for file in files)} valid, {issues} issues "
+                f"in {elapsed:.1f} s."
+            )
+            if issues or failed:
+                raise CommandError(f"Validation failed: {summary}")
+            self.log.write(self.style.SUCCESS(f"Validation passed: {summary}"))
+            return
+
+        self.log.write(
+            self.style.SUCCESS(
+                f"Import completed: {len(paths) - len(failed)}/{len(paths)} files, "
+                f"{totals['rows']} rows, {totals['created']} created, "
+                f"{totals['updated']} updated, {totals['unchanged']} unchanged, "
+                f"{totals['skipped']} skipped "
+                f"in {elapsed:.1f} s (parsing {parse_seconds:.1f} s, writing {write_seconds:.1f} s)."
+            )
+        )
+        if failed:
+            raise CommandError(f"{len(failed)} files were not imported: {', '.join(failed)}")
+
+    def parsed_files(self, paths, processes, max_pending):
+        """
+        Yield the parse results of ``paths`` as they become available.
+        """
+        spec = self.spec()
+        if processes <= 0:
+            for path in paths:
+                yield parse_file(path, spec)
+            return
+
+        # Forked workers must not share this process's open connections
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=processes, initializer=init_worker) as executor:
+            queue = list(paths)
+            pending = set()
+            while queue or pending:
+                # Back-pressure: new files are submitted only as the writer catches up
+                while queue and len(pending) < max_pending:
+                    pending.add(executor.submit(parse_file, queue.pop(0), spec))
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+
+    def prepare(self):
+        """
+        Load the data the sheets are validated against, once per run.
+
+        Only reads the database, so validation runs never change it.
+        """
+        meta = self.model._meta
+        fields = [meta.get_field(field) for field in self.columns.values()]
+        attnames = {field.name: field.attname for field in fields}
+        loaded = {}
+
+        def primary_keys(model):
+            # Several relations often share a target table
+            if model not in loaded:
+                loaded[model] = list(model.objects.order_by().values_list("pk", flat=True))
+            return loaded[model]
+
+        self.checks = {
+            # Primary keys of the targets of the imported foreign keys
+            "foreign_keys": {
+                field.attname: primary_keys(field.related_model) for field in fields if field.many_to_one
+            },
+            # Target primary keys of the imported many-to-many relations
+            "relations": {
+                field.name: primary_keys(field.related_model) for field in fields if field.many_to_many
+            },
+            # Needed to tell updates from new rows
+            "existing_ids": (
+                primary_keys(self.model) if not (self.create and self.overwrite_blank) else None
+            ),
+            "max_length": {
+                field.attname: field.max_length
+                for field in fields
+                if field.max_length and not field.is_relation
+            },
+            "distinct": [
+                pair
+                for pair in DISTINCT_TRANSLATIONS.get(self.model, ())
+                if set(pair) <= set(attnames.values())
+            ],
+            "unique": [],
+        }
+
+        # Unique fields and constraints whose fields are all imported
+        unique_sets = [[field.name] for field in fields if field.unique and not field.primary_key]
+        unique_sets += [
+            list(constraint.fields)
+            for constraint in meta.constraints
+            if isinstance(constraint, models.UniqueConstraint)
+            and constraint.fields
+            and constraint.condition is None
+        ]
+        for names in unique_sets:
+            if not set(names) <= set(attnames):
+                continue
+            columns = [attnames[name] for name in names]
+            self.checks["unique"].append(
+                {
+                    "fields": columns,
+                    "existing": list(self.model.objects.values_list(*columns, "pk")),
+                }
+            )
+
+    def write_file(self, result, totals):
+        """
+        Write the records of one parsed file in a single transaction.
+        """
+        counts = {"rows": result["rows"], "created": 0, "updated": 0, "unchanged": 0, "skipped": 0}
+        for row, messages in self.rejected_rows(result).items():
+            self.skip(result["path"], row, "; ".join(messages), counts)
+
+        records = result["records"]
+        with transaction.atomic():
+            written, changed = set(), []
+            for start in range(0, len(records), self.batch_size):
+                batch = records[start : start + self.batch_size]
+                batch_written, batch_changed = self.write_batch(result["path"], batch, counts)
+                written.update(batch_written)
+                changed.extend(batch_changed)
+                self.show_progress(totals["rows"] + start + len(batch))
+            # Relations are replaced for unchanged rows as well
+            for field, relation in result["relations"].items():
+                changed.extend(self.write_relation(field, relation, written))
+            schedule_document_rebuild(measure_ids_depending_on(self.model, changed))
+            if self.model in SUGGESTION_MODELS and (counts["created"] or counts["updated"]):
+                # Bulk writes bypass the signals invalidating the suggestions
+                transaction.on_commit(suggestion_index.invalidate)
+        return counts
+
+    def write_batch(self, path, records, counts):
+        """
+        Create or update the rows of ``records``; returns the primary keys of
+        all the rows written and of the created or changed ones.
+
+        Updates are a single bulk_update limited to the rows and columns whose
+        values differ from the stored ones.
+        """
+        if not records:
+            return [], []
+        pk_name = self.model._meta.pk.attname
+        # Columns absent from a partial sheet are not in the records
+        fields = [field for field in records[0] if field not in (pk_name, "_row")]
+        existing = self.model.objects.in_bulk([record[pk_name] for record in records])
+        to_create, to_update, unchanged = [], [], []
+        changed_fields = set()
+
+        for record in records:
+            row = record.pop("_row")
+            instance = existing.get(record[pk_name])
+            if instance is None:
+                if not self.create:
+                    self.skip(path, row, f"{self.model.__name__} {record[pk_name]} does not exist", counts)
+                    continue
+                if not self.overwrite_blank:
+                    # Blank cells of new rows fall back to the model defaults
+                    record = {field: value for field, value in record.items() if value is not None}
+                instance = self.model(**record)
+                to_create.append(instance)
+                continue
+
+            changed = [
+                field
+                for field in fields
+                if (record[field] is not None or self.overwrite_blank)
+                and getattr(instance, field) != record[field]
+            ]
+            for field in changed:
+                setattr(instance, field, record[field])
+            if changed:
+                to_update.append(instance)
+                changed_fields.update(changed)
+            else:
+                unchanged.append(instance)
+
+        if self.model in SEARCH_TEXT_FIELDS:
+            # Bulk queries bypass the pre_save signal maintaining the column
+            for instance in to_create + to_update:
+                instance.search_text = search_text(instance)
+            if to_update:
+                changed_fields.add("search_text")
+                fields = [*fields, "search_text"]
+        if self.model is Measure:
+            # ... and the one keeping the normalized EUR prices
+            for instance in to_create:
+                normalize_prices(instance)
+            repriced = [normalize_prices(instance) for instance in to_update]
+            if any(repriced):
+                changed_fields.update(NORMALIZED_PRICE_FIELDS)
+                fields = [*fields, *NORMALIZED_PRICE_FIELDS]
+
+        # bulk_update does not maintain auto_now fields either
+        touched = [
+            field.attname
+            for field in self.model._meta.concrete_fields
+            if getattr(field, "auto_now", False)
+        ]
+        if to_update and touched:
+            now = timezone.now()
+            for instance in to_update:
+                for field in touched:
+                    setattr(instance, field, now)
+            changed_fields.update(touched)
+            fields = [*fields, *touched]
+
+        self.model.objects.bulk_create(to_create, batch_size=self.batch_size)
+        if to_update:
+            self.model.objects.bulk_update(
+                to_update, [field for field in fields if field in changed_fields], batch_size=self.batch_size
+            )
+        counts["created"] += len(to_create)
+        counts["updated"] += len(to_update)
+        counts["unchanged"] += len(unchanged)
+        changed = [instance.pk for instance in to_create + to_update]
+        return changed + [instance.pk for instance in unchanged], changed
+
+    def write_relation(self, field_name, relation, written):
+        """
+        Replace the links of the written rows listed in ``relation`` through
+        bulk queries on the through table; returns the primary keys whose
+        links changed.
+        """
+        field = self.model._meta.get_field(field_name)
+        through = field.remote_field.through
+        source = f"{field.m2m_field_name()}_id"
+        target = f"{field.m2m_reverse_field_name()}_id"
+        symmetrical = field.remote_field.symmetrical and field.related_model is self.model
+
+        replaced = [pk for pk in dict.fromkeys(relation["replaced"]) if pk in written]
+        wanted = {
+            (pk, target_id)
+            for pk, target_id in zip(relation["sources"], relation["targets"])
+            if pk in written
+        }
+        if symmetrical:
+            # Links between rows are stored in both directions; a link listed on
+            # either side is kept
+            wanted |= {(target_id, pk) for pk, target_id in wanted}
+
+        stored = {}
+        for start in range(0, len(replaced), self.batch_size):
+            chunk = replaced[start : start + self.batch_size]
+            condition = models.Q(**{f"{source}__in": chunk})
+            if symmetrical:
+                condition |= models.Q(**{f"{target}__in": chunk})
+            for pk, source_id, target_id in through.objects.filter(condition).values_list(
+                "pk", source, target
+            ):
+                stored[source_id, target_id] = pk
+
+        removed = [pk for link, pk in stored.items() if link not in wanted]
+        added = [link for link in wanted if link not in stored]
+        for start in range(0, len(removed), self.batch_size):
+            through.objects.filter(pk__in=removed[start : start + self.batch_size]).delete()
+        through.objects.bulk_create(
+            [through(**{source: source_id, target: target_id}) for source_id, target_id in added],
+            batch_size=self.batch_size,
+        )
+
+        changed = {source_id for source_id, _target_id in added}
+        changed |= {link[0] for link, pk in stored.items() if link not in wanted}
+        if symmetrical:
+            changed |= {target_id for _source_id, target_id in added}
+        return changed
+
+    def rejected_rows(self, result):
+        rows = {}
+        for issue in result["issues"]:
+            rows.setdefault(issue["row"], []).append(issue["message"])
+        return rows
+
+    def report_issues(self, result):
+        rows = self.rejected_rows(result)
+        if self.verbosity >= 1:
+            for row, messages in rows.items():
+                self.report(self.style.WARNING(f"{result['path']}, row {row}: {'; '.join(messages)}"))
+        self.report(
+            f"{result['path']}: {result['rows']} rows, {result['valid_rows']} valid, "
+            f"{len(rows)} rejected"
+        )
+
+    def write_report(self, path, files, validate, seconds):
+        report = {
+            "command": self.__module__.rsplit(".", 1)[-1],
+            "validate": validate,
+            "files": files,
+            "summary": {
+                "files": len(files),
+                "failed": sum(1 for file in files if file["error"]),
+                "rows": sum(file["rows"] for file in files),
+                "valid_rows": sum(file["valid_rows"] for file in files),
+                "issues": sum(len(file["issues"]) for file in files),
+                "seconds": round(seconds, 3),
+            },
+        }
+        content = json.dumps(report, ensure_ascii=False, indent=2, default=str)
+        if path == "-":
+            self.stdout.write(content)
+        else:
+            with open(path, "w", encoding="utf-8") as output:
+                output.write(content + "\n")
+
+    def skip(self, path, row, message, counts):
+        counts["skipped"] += 1
+        if self.verbosity >= 1:
+            self.report(self.style.WARNING(f"{path}, row {row}: skipped, {message}"))
+
+    def report(self, message):
+        # Replaces the live progress line on terminals
+        self.log.write(f"\r\033[K{message}" if self.live else message)
+
+    def show_progress(self, rows):
+        if not self.live:
+            return
+        rate = rows / max(time.perf_counter() - self.started, 1e-9)
+        self.log.write(f"\r\033[K{rows} rows written, {rate:.0f} rows/s", ending="")
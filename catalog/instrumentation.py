@@ -0,0 +1,44 @@
+"""
+Runtime metrics of the catalog's infrastructure.
+"""
+from django.db import connections
+
+
+def database_pool_stats():
+    """
+    Return connection pool metrics for every configured database alias.
+
+    Aliases without a psycopg pool only report their CONN_MAX_AGE setting.
+    """
+    stats = {}
+    for alias in connections:
+        connection = connections[alias]
+        pool = getattr(connection, "pool", None)
+        if pool is None:
+            stats[alias] = {
+                "pooled": False,
+                "conn_max_age": connection.settings_dict.get("CONN_MAX_AGE", 0),
+            }
+            continue
+        raw = pool.get_stats()
+        size = raw.get("pool_size", 0)
+        idle = raw.get("pool_available", 0)
+        served = raw.get("requests_num", 0)
+        stats[alias] = {
+            "pooled": True,
+            "min_size": raw.get("pool_min"),
+            "max_size": raw.get("pool_max"),
+            "size": size,
+            "in_use": size - idle,
+            "idle": idle,
+            "waiting": raw.get("requests_waiting", 0),
+            "requests": served,
+            "requests_queued": raw.get("requests_queued", 0),
+            "wait_ms_total": raw.get("requests_wait_ms", 0),
+            "wait_ms_avg": raw.get("requests_wait_ms", 0) / served if served else 0.0,
+            "timeouts": raw.get("requests_errors", 0),
+            "connections_opened": raw.get("connections_num", 0),
+            "connect_ms_total": raw.get("connections_ms", 0),
+            "connections_lost": raw.get("connections_lost", 0),
+        }
+    return stats
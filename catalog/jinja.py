@@ -0,0 +1,15 @@
+"""
+Jinja2 environment of the public catalog templates (see CATALOG_JINJA2).
+"""
+from django.urls import reverse
+from jinja2 import Environment
+
+
+def url(name, *args, **kwargs):
+    return reverse(name, args=args, kwargs=kwargs)
+
+
+def environment(**options):
+    env = Environment(**options)
+    env.globals["url"] = url
+    return env
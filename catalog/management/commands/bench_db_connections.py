@@ -0,0 +1,46 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connections
+from catalog.instrumentation import database_pool_stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure the per-request cost of acquiring a database connection with the "
+        "current CONN_MAX_AGE / pool settings"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--requests", type=int, default=200, help="Number of simulated requests"
+        )
+        parser.add_argument(
+            "--database", default="default", help="Database alias to benchmark"
+        )
+
+    def handle(self, *args, **kwargs):
+        alias = kwargs["database"]
+        count = kwargs["requests"]
+        if count < 1:
+            raise CommandError("--requests must be at least 1.")
+        connection = connections[alias]
+
+        timings = []
+        for _ in range(count):
+            started = time.perf_counter()
+            # One query per simulated request, then the request_finished cleanup
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            close_old_connections()
+            timings.append((time.perf_counter() - started) * 1000)
+
+        timings.sort()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{count} requests on '{alias}': "
+                f"avg {sum(timings) / count:.2f} ms, "
+                f"p50 {timings[count // 2]:.2f} ms, "
+                f"p95 {timings[int(count * 0.95) - 1]:.2f} ms"
+            )
+        )
+        self.stdout.write(f"Pool stats: {database_pool_stats().get(alias)}")
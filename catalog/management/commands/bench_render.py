@@ -0,0 +1,56 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.template import engines
+from django.test.utils import CaptureQueriesContext
+from catalog.models import Group, Measure
+from catalog.views import group_detail_context, home_context, measure_detail_context
+
+TEMPLATE_ENGINES = ("django", "jinja2")
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure context building and template rendering of the public catalog "
+        "pages with the Django and Jinja2 engines"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--renders", type=int, default=200, help="Number of renders per page and engine"
+        )
+
+    def handle(self, *args, **kwargs):
+        group = Group.objects.order_by("pk").first()
+        measure = Measure.objects.order_by("pk").first()
+        if group is None or measure is None:
+            raise CommandError("The catalog needs at least one group and one measure.")
+
+        pages = (
+            ("home.html", home_context),
+            ("group_detail.html", lambda: group_detail_context(group.pk)),
+            ("measure_detail.html", lambda: measure_detail_context(measure.pk)),
+        )
+        count = kwargs["renders"]
+        for template_name, build_context in pages:
+            started = time.perf_counter()
+            with CaptureQueriesContext(connection) as queries:
+                context = build_context()
+            self.stdout.write(
+                f"{template_name}: context {(time.perf_counter() - started) * 1000:.2f} ms, "
+                f"{len(queries)} queries"
+            )
+
+            for alias in TEMPLATE_ENGINES:
+                template = engines[alias].get_template(template_name)
+                with CaptureQueriesContext(connection) as queries:
+                    started = time.perf_counter()
+                    for _ in range(count):
+                        template.render(context)
+                    elapsed = time.perf_counter() - started
+                self.stdout.write(
+                    f"  {alias}: {elapsed / count * 1000:.3f} ms per render, "
+                    f"{len(queries)} queries while rendering"
+                )
+
+        self.stdout.write(self.style.SUCCESS("Benchmark finished."))
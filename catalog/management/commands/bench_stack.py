@@ -0,0 +1,95 @@
+import json
+import os
+import subprocess
+import sys
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+from django.utils import translation
+
+# Runs in a fresh interpreter per settings module: cold start, then warm requests
+PROBE = """
+import json, resource, sys, time
+started = time.perf_counter()
+import django
+django.setup()
+from django.conf import settings
+from django.core.wsgi import get_wsgi_application
+from django.test import Client
+get_wsgi_application()
+ready = time.perf_counter()
+host = settings.ALLOWED_HOSTS[0].lstrip(".") if settings.ALLOWED_HOSTS else "localhost"
+client = Client(HTTP_HOST="localhost" if host == "*" else host)
+paths, count = json.loads(sys.argv[1]), int(sys.argv[2])
+first = time.perf_counter()
+for path in paths:
+    client.get(path)
+warm = time.perf_counter()
+for _ in range(count):
+    for path in paths:
+        response = client.get(path)
+        assert response.status_code == 200, (path, response.status_code)
+done = time.perf_counter()
+print(json.dumps({
+    "startup_ms": (ready - started) * 1000,
+    "first_request_ms": (warm - first) * 1000 / len(paths),
+    "request_ms": (done - warm) * 1000 / (count * len(paths)),
+    "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+}))
+"""
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare worker cold start and per-request overhead of the full and the "
+        "public-only deployment profiles"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--settings-module",
+            action="append",
+            dest="settings_modules",
+            help="Settings module to measure (repeatable; defaults to the full and public profiles)",
+        )
+        parser.add_argument(
+            "--path",
+            action="append",
+            dest="paths",
+            help="URL path requested in every round (repeatable; defaults to the home page)",
+        )
+        parser.add_argument(
+            "--requests", type=int, default=200, help="Number of warm request rounds"
+        )
+
+    def handle(self, *args, **kwargs):
+        modules = kwargs["settings_modules"] or [
+            "katalogdivlnad.settings",
+            "katalogdivlnad.settings_public",
+        ]
+        paths = kwargs["paths"]
+        if not paths:
+            # The unprefixed "/" only redirects to a language prefix
+            with translation.override(settings.LANGUAGE_CODE):
+                paths = [reverse("home")]
+        for module in modules:
+            env = {**os.environ, "DJANGO_SETTINGS_MODULE": module}
+            started = time.perf_counter()
+            result = subprocess.run(
+                [sys.executable, "-c", PROBE, json.dumps(paths), str(kwargs["requests"])],
+                cwd=settings.BASE_DIR,
+                env=env,
+                capture_output=True,
+                text=True,
+            )
+            wall = (time.perf_counter() - started) * 1000
+            if result.returncode:
+                raise CommandError(f"{module} failed:\n{result.stderr}")
+            stats = json.loads(result.stdout.strip().splitlines()[-1])
+            self.stdout.write(
+                f"{module}: process {wall:.0f} ms, django.setup + WSGI app "
+                f"{stats['startup_ms']:.0f} ms, first request {stats['first_request_ms']:.1f} ms, "
+                f"warm request {stats['request_ms']:.2f} ms, max RSS {stats['max_rss_kb'] / 1024:.1f} MiB"
+            )
+        self.stdout.write(self.style.SUCCESS("Benchmark finished."))
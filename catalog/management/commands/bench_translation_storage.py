@@ -0,0 +1,83 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from catalog.exports import iter_localized_measure_rows, localized_measure_queryset
+from catalog.models import Measure, MeasureTranslation
+from catalog.translations import (
+    MEASURE_TRANSLATED_FIELDS,
+    TRANSLATION_STORAGE_MODES,
+    translated_columns,
+    translation_languages,
+)
+
+
+def _size(values):
+    # UTF-8 bytes of the texts in ``values``
+    return sum(len(value.encode()) for value in values if value)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the width of the translatable Measure texts and the time of "
+        "per-language reads between the translation storage modes"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--runs", type=int, default=20, help="Number of runs per read, mode and language"
+        )
+
+    def text_rows(self, storage, language):
+        # Translatable texts of every measure as loaded to render one language
+        if storage == "table":
+            return MeasureTranslation.objects.filter(
+                language__in=translation_languages([language])
+            ).values_list(*MEASURE_TRANSLATED_FIELDS)
+        return Measure.objects.values_list(*translated_columns())
+
+    def handle(self, *args, **kwargs):
+        measures = Measure.objects.count()
+        if not measures:
+            raise CommandError("The catalog needs at least one measure.")
+        if MeasureTranslation.objects.count() < measures:
+            self.stdout.write(
+                self.style.NOTICE(
+                    "Some measures have no translation rows, run rebuild_measure_documents first."
+                )
+            )
+
+        languages = [code for code, _name in settings.LANGUAGES]
+        runs = kwargs["runs"]
+        reads = (
+            ("texts", lambda storage, language: list(self.text_rows(storage, language))),
+            (
+                "export",
+                lambda storage, language: list(
+                    iter_localized_measure_rows(
+                        localized_measure_queryset(), language, storage=storage
+                    )
+                ),
+            ),
+        )
+
+        self.stdout.write(f"{measures} measures, {runs} runs per read")
+        for storage in TRANSLATION_STORAGE_MODES:
+            self.stdout.write(self.style.NOTICE(f"Storage: {storage}"))
+            for language in languages:
+                rows = list(self.text_rows(storage, language))
+                width = sum(_size(row) for row in rows) / measures
+                self.stdout.write(f"  {language}: {width:.0f} bytes of texts loaded per measure")
+                for name, read in reads:
+                    with CaptureQueriesContext(connection) as queries:
+                        started = time.perf_counter()
+                        for _ in range(runs):
+                            read(storage, language)
+                        elapsed = time.perf_counter() - started
+                    self.stdout.write(
+                        f"    {name}: {elapsed / runs * 1000:.2f} ms per run, "
+                        f"{len(queries) // runs} queries"
+                    )
+
+        self.stdout.write(self.style.SUCCESS("Benchmark finished."))
@@ -0,0 +1,45 @@
+import os
+from django.core.management.base import BaseCommand, CommandError
+from catalog.exports import EXPORT_FORMATS, LAYOUTS, write_export
+
+
+class Command(BaseCommand):
+    help = "Export the catalog in the column layouts expected by the import commands"
+
+    def add_arguments(self, parser):
+        # Directory receiving one file per exported layout
+        parser.add_argument("output_dir", type=str, help="Directory to write the files to")
+        parser.add_argument(
+            "--layout",
+            action="append",
+            choices=sorted(LAYOUTS),
+            help="Layout (import command name) to export, may be repeated; defaults to all",
+        )
+        parser.add_argument(
+            "--format",
+            choices=EXPORT_FORMATS,
+            default="xlsx",
+            help="Output file format",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=2000,
+            help="Number of rows fetched from the database per batch",
+        )
+
+    def handle(self, *args, **kwargs):
+        output_dir = kwargs["output_dir"]
+        export_format = kwargs["format"]
+
+        try:
+            os.makedirs(output_dir, exist_ok=True)
+        except OSError as e:
+            raise CommandError(f"Could not create output directory: {e}")
+
+        for layout_name in kwargs["layout"] or LAYOUTS:
+            path = os.path.join(output_dir, f"{layout_name}.{export_format}")
+            write_export(layout_name, export_format, path, chunk_size=kwargs["chunk_size"])
+            self.stdout.write(self.style.SUCCESS(f"Exported {layout_name} to {path}"))
+
+        self.stdout.write(self.style.SUCCESS("Export completed!"))
@@ -0,0 +1,38 @@
+import time
+
+from django.core.management.base import BaseCommand
+from catalog.similarity import compute_similar_measures
+
+
+class Command(BaseCommand):
+    help = "Compute the most similar measures of every measure and store them"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--top", type=int, default=5, help="Number of similar measures stored per measure"
+        )
+        parser.add_argument(
+            "--min-score",
+            type=float,
+            default=0.05,
+            help="Lowest cosine similarity (0-1) of a stored similar measure",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=500,
+            help="Number of measures compared with all the others at once",
+        )
+
+    def handle(self, *args, **kwargs):
+        self.stdout.write(self.style.NOTICE("Computing similar measures..."))
+        started = time.perf_counter()
+        stored = compute_similar_measures(
+            top=kwargs["top"], min_score=kwargs["min_score"], chunk_size=kwargs["chunk_size"]
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Computation completed: {stored} similar measures stored "
+                f"in {time.perf_counter() - started:.1f} s."
+            )
+        )
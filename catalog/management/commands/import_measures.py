@@ -0,0 +1,18 @@
+from catalog.importing import ImportCommand
+from catalog.models import Measure
+
+from . import m4, me1, me2, me3
+
+
+class Command(ImportCommand):
+    help = (
+        "Import measures from one wide sheet, or several sheets joined on the id column, "
+        "with the columns of me1, me2, me3 and m4"
+    )
+
+    model = Measure
+    columns = {**me1.Command.columns, **me2.Command.columns, **me3.Command.columns, **m4.Command.columns}
+    # Any subset of the columns may be given; blank cells keep the stored values
+    partial = True
+    join_sheets = True
+    overwrite_blank = False
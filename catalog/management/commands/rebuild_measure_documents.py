@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+from catalog.documents import rebuild_measure_documents
+from catalog.translations import store_measure_translations
+
+
+class Command(BaseCommand):
+    help = "Rebuild the precomputed per-language Measure documents"
+
+    def add_arguments(self, parser):
+        # Optional list of Measure IDs, all measures are rebuilt when omitted
+        parser.add_argument(
+            "ids", nargs="*", type=int, help="IDs of the measures to rebuild"
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=200,
+            help="Number of measures loaded and written per batch",
+        )
+
+    def handle(self, *args, **kwargs):
+        ids = kwargs["ids"] or None
+        # Documents are built from the translation rows in the "table" storage mode
+        self.stdout.write(self.style.NOTICE("Rebuilding measure translations..."))
+        translated = store_measure_translations(ids)
+        self.stdout.write(f"{translated} translation rows written.")
+        self.stdout.write(self.style.NOTICE("Rebuilding measure documents..."))
+        written = rebuild_measure_documents(ids, chunk_size=kwargs["chunk_size"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuild completed: {written} documents written.")
+        )
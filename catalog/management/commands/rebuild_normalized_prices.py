@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from catalog.prices import rebuild_normalized_prices
+
+
+class Command(BaseCommand):
+    help = "Recompute the normalized EUR price ranges of all measures (e.g. after a rate change)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Number of rows loaded and written per batch",
+        )
+
+    def handle(self, *args, **kwargs):
+        written = rebuild_normalized_prices(chunk_size=kwargs["chunk_size"])
+        self.stdout.write(self.style.SUCCESS(f"Rebuild completed: {written} measures updated."))
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from catalog.search import SEARCH_TEXT_FIELDS, rebuild_search_text
+
+
+class Command(BaseCommand):
+    help = "Recompute the normalized search_text columns of the catalog models"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Number of rows loaded and written per batch",
+        )
+
+    def handle(self, *args, **kwargs):
+        total = 0
+        for model in SEARCH_TEXT_FIELDS:
+            written = rebuild_search_text(model, chunk_size=kwargs["chunk_size"])
+            total += written
+            if kwargs["verbosity"] >= 2:
+                self.stdout.write(f"{model.__name__}: {written} rows updated")
+        self.stdout.write(self.style.SUCCESS(f"Rebuild completed: {total} rows updated."))
@@ -0,0 +1,115 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from django.core.management.base import BaseCommand
+from django.db import connections
+from catalog.renditions import (
+    claim_jobs,
+    complete_job,
+    queue_counters,
+    render_job,
+    requeue_stale_jobs,
+    warm_rendition_manifest,
+)
+
+
+def _init_worker():
+    # Child processes started with "spawn" (macOS, Windows) need their own setup
+    import django
+    from django.apps import apps
+
+    if not apps.ready:
+        django.setup()
+
+
+class Command(BaseCommand):
+    help = "Generate queued image renditions with a pool of worker processes"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Number of worker processes (0 renders in this process)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=20,
+            help="Number of jobs claimed from the queue at once",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=5.0,
+            help="Seconds to wait when the queue is empty",
+        )
+        parser.add_argument(
+            "--stale-after",
+            type=int,
+            default=900,
+            help="Requeue jobs running for longer than this many seconds",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once the queue is drained instead of polling for new jobs",
+        )
+        parser.add_argument(
+            "--warm-manifest",
+            action="store_true",
+            help="Record renditions already in the storage in the manifest before starting",
+        )
+
+    def handle(self, *args, **kwargs):
+        if kwargs["warm_manifest"]:
+            recorded = warm_rendition_manifest()
+            self.stdout.write(f"Recorded {recorded} existing renditions in the manifest.")
+
+        processes = kwargs["processes"]
+        executor = (
+            ProcessPoolExecutor(max_workers=processes, initializer=_init_worker)
+            if processes > 0
+            else None
+        )
+        done = failed = 0
+        started = time.perf_counter()
+        try:
+            while True:
+                requeue_stale_jobs(kwargs["stale_after"])
+                job_ids = claim_jobs(kwargs["batch_size"])
+                if not job_ids:
+                    if kwargs["once"]:
+                        break
+                    time.sleep(kwargs["poll_interval"])
+                    continue
+
+                if executor is None:
+                    results = map(render_job, job_ids)
+                else:
+                    # Forked workers must not share this process's open connections
+                    connections.close_all()
+                    results = executor.map(render_job, job_ids)
+
+                for job_id, error in results:
+                    job = complete_job(job_id, error)
+                    if error is None:
+                        done += 1
+                    else:
+                        failed += 1
+                        self.stderr.write(
+                            self.style.ERROR(
+                                f"Job {job_id} failed (attempt {job.attempts}, {job.status})"
+                            )
+                        )
+
+                elapsed = time.perf_counter() - started
+                self.stdout.write(
+                    f"Rendered {done} jobs, {failed} failures, "
+                    f"{done / elapsed:.1f} jobs/s, queue: {queue_counters()}"
+                )
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        self.stdout.write(self.style.SUCCESS(f"Worker finished: {done} done, {failed} failed."))
@@ -0,0 +1,118 @@
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from django.conf import settings
+from django.core.management import get_commands
+from django.core.management.base import BaseCommand, CommandError
+
+# Loads one entry point in a fresh interpreter started with -X importtime
+PROBE = """
+import json, resource, sys, time
+started = time.perf_counter()
+import django
+django.setup()
+kind, target = sys.argv[1], sys.argv[2]
+if kind == "wsgi":
+    from django.core.wsgi import get_wsgi_application
+    from django.urls import get_resolver
+    get_wsgi_application()
+    get_resolver().url_patterns
+elif kind == "asgi":
+    from django.core.asgi import get_asgi_application
+    from django.urls import get_resolver
+    get_asgi_application()
+    get_resolver().url_patterns
+else:
+    from django.core.management import get_commands, load_command_class
+    load_command_class(get_commands()[target], target)
+print(json.dumps({
+    "startup_ms": (time.perf_counter() - started) * 1000,
+    "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+}))
+"""
+
+# Entry point name -> (probe kind, settings module or command name)
+ENTRY_POINTS = {
+    "wsgi": ("wsgi", "katalogdivlnad.settings"),
+    "asgi": ("asgi", "katalogdivlnad.settings"),
+    "public": ("wsgi", "katalogdivlnad.settings_public"),
+}
+
+
+def parse_importtime(output):
+    """
+    Return {top-level package: self time in microseconds} from ``-X importtime`` output.
+    """
+    packages = defaultdict(int)
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _cumulative, name = line[len("import time:"):].split("|", 2)
+        packages[name.strip().split(".")[0]] += int(self_us)
+    return packages
+
+
+class Command(BaseCommand):
+    help = (
+        "Report import time, startup time and memory of the WSGI/ASGI apps and "
+        "the management commands, each loaded in a fresh interpreter"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "entry_points",
+            nargs="*",
+            help=(
+                "Entry points to profile: wsgi, asgi, public or command:<name> "
+                "(defaults to the apps and every catalog command)"
+            ),
+        )
+        parser.add_argument(
+            "--top", type=int, default=8, help="Number of slowest packages listed per entry point"
+        )
+
+    def handle(self, *args, **kwargs):
+        entry_points = kwargs["entry_points"] or [
+            *ENTRY_POINTS,
+            *(
+                f"command:{name}"
+                for name, app in sorted(get_commands().items())
+                if app == "catalog"
+            ),
+        ]
+        for entry_point in entry_points:
+            if entry_point in ENTRY_POINTS:
+                kind, target = ENTRY_POINTS[entry_point]
+                settings_module = target
+            elif entry_point.startswith("command:"):
+                kind, target = "command", entry_point.split(":", 1)[1]
+                settings_module = os.environ["DJANGO_SETTINGS_MODULE"]
+                if target not in get_commands():
+                    raise CommandError(f"Unknown command: {target}")
+            else:
+                raise CommandError(f"Unknown entry point: {entry_point}")
+
+            result = subprocess.run(
+                [sys.executable, "-X", "importtime", "-c", PROBE, kind, target],
+                cwd=settings.BASE_DIR,
+                env={**os.environ, "DJANGO_SETTINGS_MODULE": settings_module},
+                capture_output=True,
+                text=True,
+            )
+            if result.returncode:
+                raise CommandError(f"{entry_point} failed:\n{result.stderr[-2000:]}")
+            stats = json.loads(result.stdout.strip().splitlines()[-1])
+            packages = parse_importtime(result.stderr)
+
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{entry_point}: {stats['startup_ms']:.0f} ms, "
+                    f"imports {sum(packages.values()) / 1000:.0f} ms, "
+                    f"max RSS {stats['max_rss_kb'] / 1024:.1f} MiB"
+                )
+            )
+            slowest = sorted(packages.items(), key=lambda item: item[1], reverse=True)
+            for package, self_us in slowest[: kwargs["top"]]:
+                self.stdout.write(f"  {package:<24} {self_us / 1000:8.1f} ms")
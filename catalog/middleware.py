@@ -0,0 +1,74 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from .routers import recorded_writes, replica_databases, replica_reads
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Serves anonymous read requests from the read replicas.
+
+    After a write request that wrote to the database the client is pinned to
+    the primary for REPLICA_STICKY_SECONDS through a cookie, so it reads its
+    own writes even if the replicas lag behind.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with replica_reads(self.reads_from_replicas(request)), recorded_writes() as written:
+            response = self.get_response(request)
+        return self.process_response(request, response, written)
+
+    async def __acall__(self, request):
+        with replica_reads(self.reads_from_replicas(request)), recorded_writes() as written:
+            response = await self.get_response(request)
+        return self.process_response(request, response, written)
+
+    def reads_from_replicas(self, request):
+        if not replica_databases() or request.method not in SAFE_METHODS:
+            return False
+        if settings.REPLICA_STICKY_COOKIE in request.COOKIES:
+            return False
+        return not request.path.startswith(tuple(settings.REPLICA_PRIMARY_PATHS))
+
+    def process_response(self, request, response, written):
+        if request.method not in SAFE_METHODS:
+            # set_language and forms failing validation do not write
+            if written:
+                response.set_cookie(
+                    settings.REPLICA_STICKY_COOKIE,
+                    "1",
+                    max_age=settings.REPLICA_STICKY_SECONDS,
+                    httponly=True,
+                    samesite="Lax",
+                )
+        elif (
+            response.streaming
+            and not response.is_async
+            and self.reads_from_replicas(request)
+        ):
+            # Streamed rows are fetched after the view returned
+            response.streaming_content = _stream_from_replicas(response.streaming_content)
+        return response
+
+
+def _stream_from_replicas(content):
+    iterator = iter(content)
+    while True:
+        with replica_reads():
+            try:
+                chunk = next(iterator)
+            except StopIteration:
+                return
+        yield chunk
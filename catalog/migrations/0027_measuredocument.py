@@ -0,0 +1,30 @@
+# Generated by Django 5.2.3 on 2026-10-19 15:16
+
+import django.core.serializers.json
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0026_measure_invasion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MeasureDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('language', models.CharField(max_length=7, verbose_name='Language')),
+                ('document', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder, verbose_name='Document')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated at')),
+                ('measure', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='documents', to='catalog.measure', verbose_name='Measure')),
+            ],
+            options={
+                'verbose_name': 'Measure document',
+                'verbose_name_plural': 'Measure documents',
+                'constraints': [models.UniqueConstraint(fields=('measure', 'language'), name='unique_measure_document_language')],
+            },
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.3 on 2026-10-19 15:21
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0027_measuredocument'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RenditionJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(max_length=100, verbose_name='Source')),
+                ('object_id', models.PositiveBigIntegerField(verbose_name='Object ID')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('done', 'Done'), ('dead', 'Failed permanently')], default='pending', max_length=10, verbose_name='Status')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Attempts')),
+                ('max_attempts', models.PositiveSmallIntegerField(default=3, verbose_name='Max attempts')),
+                ('last_error', models.TextField(blank=True, verbose_name='Last error')),
+                ('available_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Available at')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created at')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='Started at')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Finished at')),
+            ],
+            options={
+                'verbose_name': 'Rendition job',
+                'verbose_name_plural': 'Rendition jobs',
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['status', 'available_at'], name='rendition_job_queue_idx')],
+            },
+        ),
+    ]
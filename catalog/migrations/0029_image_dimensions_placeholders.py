@@ -0,0 +1,43 @@
+# Generated by Django 5.2.3 on 2026-10-19 15:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0028_renditionjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='measure',
+            name='title_image_height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='Title image height'),
+        ),
+        migrations.AddField(
+            model_name='measure',
+            name='title_image_placeholder',
+            field=models.TextField(blank=True, editable=False, verbose_name='Title image placeholder'),
+        ),
+        migrations.AddField(
+            model_name='measure',
+            name='title_image_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='Title image width'),
+        ),
+        migrations.AddField(
+            model_name='measureimage',
+            name='height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='Height'),
+        ),
+        migrations.AddField(
+            model_name='measureimage',
+            name='placeholder',
+            field=models.TextField(blank=True, editable=False, verbose_name='Placeholder'),
+        ),
+        migrations.AddField(
+            model_name='measureimage',
+            name='width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='Width'),
+        ),
+    ]
@@ -0,0 +1,124 @@
+# Generated by Django 5.2.3 on 2026-10-19 15:42
+
+import unicodedata
+
+from django.db import migrations, models
+
+# Frozen copy of catalog.search.SEARCH_TEXT_FIELDS at the time of this migration
+SEARCH_TEXT_FIELDS = {
+    "group": ("group_name_cs", "group_name_en"),
+    "advantage": ("advantage_description_cs", "advantage_description_en"),
+    "disadvantage": ("disadvantage_description_cs", "disadvantage_description_en"),
+    "optionname": ("option_name_cs", "option_name_en"),
+    "option": ("option_cs", "option_en", "description_cs", "description_en"),
+    "impactcategory": ("impact_category_name_cs", "impact_category_name_en"),
+    "impactdetail": ("impact_detail_cs", "impact_detail_en"),
+    "measure": ("code", "measure_name_cs", "measure_name_en", "description_cs", "description_en"),
+    "example": ("example_name", "description_cs", "description_en", "web"),
+    "dzes": ("code", "name_cs", "name_en"),
+    "pph": ("code", "name_cs", "name_en"),
+}
+
+
+def normalize(text):
+    # Frozen copy of catalog.search.normalize at the time of this migration
+    decomposed = unicodedata.normalize("NFKD", str(text).casefold())
+    return "".join(char for char in decomposed if not unicodedata.combining(char)).strip()
+
+
+def fill_search_text(apps, schema_editor):
+    for model_name, fields in SEARCH_TEXT_FIELDS.items():
+        model = apps.get_model("catalog", model_name)
+        instances = list(model.objects.only("pk", *fields))
+        for instance in instances:
+            values = (getattr(instance, field) for field in fields)
+            instance.search_text = "\n".join(normalize(value) for value in values if value)
+        model.objects.bulk_update(instances, ["search_text"], batch_size=1000)
+
+
+def create_trigram_indexes(apps, schema_editor):
+    # LIKE '%...%' lookups on search_text use these; other databases scan
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for model_name in SEARCH_TEXT_FIELDS:
+        table = apps.get_model("catalog", model_name)._meta.db_table
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS "{table}_search_trgm" '
+            f'ON "{table}" USING gin ("search_text" gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for model_name in SEARCH_TEXT_FIELDS:
+        table = apps.get_model("catalog", model_name)._meta.db_table
+        schema_editor.execute(f'DROP INDEX IF EXISTS "{table}_search_trgm"')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0030_rendition'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='advantage',
+            name='search_text',
+            field=models.TextField(default='', editable=False, verbose_name='Search text'),
+        ),
+        migrations.AddField(
+            model_name='disadvantage',
+            name='search_text',
+            field=models.TextField(default='', editable=False, verbose_name='Search text'),
+        ),
+        migrations.AddField(
+            model_name='dzes',
+            name='search_text',
+            field=models.TextField(default='', editable=False, verbose_name='Search text'),
+        ),
+        migrations.AddField(
+            model_name='example',
+            name='search_text',
+            field=models.TextField(default='', editable=False, verbose_name='Search text'),
+        ),
+        migrations.AddField(
+            model_name='group',
+            name='search_text',
+            field=models.TextField(default='', editable=False, verbose_name='Search text'),
+        ),
+        migrations.AddField(
+            model_name='impactcategory',
+            name='search_text',
+            field=models.TextField(default='', editable=False, verbose_name='Search text'),
+        ),
+        migrations.AddField(
+            model_name='impactdetail',
+            name='search_text',
+            field=models.TextField(default='', editable=False, verbose_name='Search text'),
+        ),
+        migrations.AddField(
+            model_name='measure',
+            name='search_text',
+            field=models.TextField(default='', editable=False, verbose_name='Search text'),
+        ),
+        migrations.AddField(
+            model_name='option',
+            name='search_text',
+            field=models.TextField(default='', editable=False, verbose_name='Search text'),
+        ),
+        migrations.AddField(
+            model_name='optionname',
+            name='search_text',
+            field=models.TextField(default='', editable=False, verbose_name='Search text'),
+        ),
+        migrations.AddField(
+            model_name='pph',
+            name='search_text',
+            field=models.TextField(default='', editable=False, verbose_name='Search text'),
+        ),
+        migrations.RunPython(fill_search_text, migrations.RunPython.noop),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.3 on 2026-10-19 15:43
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0031_search_text'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SimilarMeasure',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField(verbose_name='Score')),
+                ('rank', models.PositiveSmallIntegerField(verbose_name='Rank')),
+                ('measure', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='similar_measures', to='catalog.measure', verbose_name='Measure')),
+                ('similar', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='catalog.measure', verbose_name='Similar measure')),
+            ],
+            options={
+                'verbose_name': 'Similar measure',
+                'verbose_name_plural': 'Similar measures',
+                'ordering': ['measure', 'rank'],
+                'constraints': [models.UniqueConstraint(fields=('measure', 'similar'), name='unique_similar_measure')],
+            },
+        ),
+    ]
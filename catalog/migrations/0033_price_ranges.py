@@ -0,0 +1,97 @@
+# Generated by Django 5.2.3 on 2026-10-19 15:47
+
+import math
+
+from django.conf import settings
+from django.db import migrations, models
+
+PRICE_FIELDS = ("price_czk_min", "price_czk_max", "price_eu_min", "price_eu_max")
+
+
+def zero_prices_to_null(apps, schema_editor):
+    # 0 was the default for a price missing from the sheets
+    Measure = apps.get_model("catalog", "Measure")
+    for field in PRICE_FIELDS:
+        Measure.objects.filter(**{field: 0}).update(**{field: None})
+
+
+def null_prices_to_zero(apps, schema_editor):
+    Measure = apps.get_model("catalog", "Measure")
+    for field in PRICE_FIELDS:
+        Measure.objects.filter(**{f"{field}__isnull": True}).update(**{field: 0})
+
+
+def _bounds(low, high):
+    low = high if low is None else low
+    high = low if high is None else high
+    if low is not None and high is not None and high < low:
+        low, high = high, low
+    return low, high
+
+
+def eur_range(price_czk_min, price_czk_max, price_eu_min, price_eu_max):
+    # Frozen copy of catalog.prices.eur_range at the time of this migration
+    low, high = _bounds(price_eu_min, price_eu_max)
+    if low is not None:
+        return low, high
+    low, high = _bounds(price_czk_min, price_czk_max)
+    if low is None:
+        return None, None
+    rate = getattr(settings, "CATALOG_CZK_PER_EUR", 25.0)
+    return math.floor(low / rate), math.ceil(high / rate)
+
+
+def fill_normalized_prices(apps, schema_editor):
+    Measure = apps.get_model("catalog", "Measure")
+    measures = list(Measure.objects.only("pk", *PRICE_FIELDS))
+    for measure in measures:
+        measure.price_eur_min, measure.price_eur_max = eur_range(
+            *(getattr(measure, field) for field in PRICE_FIELDS)
+        )
+    Measure.objects.bulk_update(measures, ["price_eur_min", "price_eur_max"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0032_similar_measure'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='measure',
+            name='price_eur_max',
+            field=models.PositiveIntegerField(editable=False, null=True, verbose_name='Normalized price (Euro) - To'),
+        ),
+        migrations.AddField(
+            model_name='measure',
+            name='price_eur_min',
+            field=models.PositiveIntegerField(editable=False, null=True, verbose_name='Normalized price (Euro) - From'),
+        ),
+        migrations.AlterField(
+            model_name='measure',
+            name='price_czk_max',
+            field=models.PositiveIntegerField(blank=True, null=True, verbose_name='Price (CZK) - To'),
+        ),
+        migrations.AlterField(
+            model_name='measure',
+            name='price_czk_min',
+            field=models.PositiveIntegerField(blank=True, null=True, verbose_name='Price (CZK) - From'),
+        ),
+        migrations.AlterField(
+            model_name='measure',
+            name='price_eu_max',
+            field=models.PositiveIntegerField(blank=True, null=True, verbose_name='Price (Euro) - To'),
+        ),
+        migrations.AlterField(
+            model_name='measure',
+            name='price_eu_min',
+            field=models.PositiveIntegerField(blank=True, null=True, verbose_name='Price (Euro) - From'),
+        ),
+        migrations.RunPython(zero_prices_to_null, null_prices_to_zero),
+        migrations.RunPython(fill_normalized_prices, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='measure',
+            index=models.Index(fields=['price_eur_min', 'price_eur_max'], name='measure_price_eur_range'),
+        ),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 5.2.3 on 2026-10-19 15:54
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Frozen copy of catalog.translations.MEASURE_TRANSLATED_FIELDS at the time of this migration
+TRANSLATED_FIELDS = (
+    "measure_name",
+    "abstract",
+    "description",
+    "conditions_for_implementation",
+    "impact_desc",
+    "comment",
+    "history",
+)
+
+
+def copy_translations(apps, schema_editor):
+    Measure = apps.get_model("catalog", "Measure")
+    MeasureTranslation = apps.get_model("catalog", "MeasureTranslation")
+    columns = [f"{field}_{language}" for field in TRANSLATED_FIELDS for language in ("cs", "en")]
+    rows = []
+    for measure in Measure.objects.only("pk", *columns).iterator(chunk_size=500):
+        for language in ("cs", "en"):
+            texts = {}
+            for field in TRANSLATED_FIELDS:
+                value = getattr(measure, f"{field}_{language}")
+                # Same English fallback as the columns mode
+                texts[field] = getattr(measure, f"{field}_en") if value is None else value
+            rows.append(MeasureTranslation(measure_id=measure.pk, language=language, **texts))
+    MeasureTranslation.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0034_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MeasureTranslation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('language', models.CharField(max_length=7, verbose_name='Language')),
+                ('measure_name', models.CharField(max_length=100, verbose_name='Measure name')),
+                ('abstract', models.CharField(blank=True, max_length=255, null=True, verbose_name='Abstract')),
+                ('description', models.TextField(verbose_name='Description')),
+                ('conditions_for_implementation', models.TextField(blank=True, null=True, verbose_name='Conditions of implementation')),
+                ('impact_desc', models.TextField(blank=True, null=True, verbose_name='Impact categories of climate change - note')),
+                ('comment', models.CharField(blank=True, max_length=255, null=True, verbose_name='Comment')),
+                ('history', models.TextField(blank=True, null=True, verbose_name='History')),
+                ('measure', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='translations', to='catalog.measure', verbose_name='Measure')),
+            ],
+            options={
+                'verbose_name': 'Measure translation',
+                'verbose_name_plural': 'Measure translations',
+                'constraints': [models.UniqueConstraint(fields=('measure', 'language'), name='unique_measure_translation_language')],
+            },
+        ),
+        migrations.RunPython(copy_translations, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.3 on 2026-10-19 16:04
+
+from django.db import migrations, models
+
+
+def drop_duplicate_pending_jobs(apps, schema_editor):
+    # Keeps the oldest pending job of every source image
+    RenditionJob = apps.get_model("catalog", "RenditionJob")
+    kept = set()
+    duplicates = []
+    for job in RenditionJob.objects.filter(status="pending").order_by("id").only(
+        "source", "object_id"
+    ):
+        key = (job.source, job.object_id)
+        if key in kept:
+            duplicates.append(job.pk)
+        kept.add(key)
+    RenditionJob.objects.filter(pk__in=duplicates).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0035_measure_translation'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_duplicate_pending_jobs, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='renditionjob',
+            constraint=models.UniqueConstraint(condition=models.Q(('status', 'pending')), fields=('source', 'object_id'), name='rendition_job_one_pending'),
+        ),
+    ]
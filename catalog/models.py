@@ -1,7 +1,9 @@
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from django.utils.translation import get_language
 from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
 from typing import Final
 from imagekit.models import ImageSpecField
 from imagekit.processors import ResizeToFill
@@ -21,6 +23,12 @@ class Group(models.Model):
         max_length=MAX_NAME_LENGTH, verbose_name=_("Group Name (English)"), unique=True
     )
 
+    # Lowercased, unaccented copy of the names and descriptions (see catalog.search)
+    search_text = models.TextField(default="", editable=False, verbose_name=_("Search text"))
+
+    # Time of the last change, the lastmod of the group page in the sitemap
+    updated_at = models.DateTimeField(auto_now=True, verbose_name=_("Updated at"))
+
     # Returns the group name based on the active language (Czech or English)
     def __str__(self) -> str:
         lang: str = get_language()
@@ -60,6 +68,9 @@ class Advantage(models.Model):
         max_length=255, verbose_name=_("Advantage (English)"), unique=True
     )
 
+    # Lowercased, unaccented copy of the names and descriptions (see catalog.search)
+    search_text = models.TextField(default="", editable=False, verbose_name=_("Search text"))
+
     # Returns the description based on the active language (Czech or English)
     def __str__(self) -> str:
         lang: str = get_language()
@@ -100,6 +111,9 @@ class Disadvantage(models.Model):
         max_length=255, verbose_name=_("Disadvantage (English)"), unique=True
     )
 
+    # Lowercased, unaccented copy of the names and descriptions (see catalog.search)
+    search_text = models.TextField(default="", editable=False, verbose_name=_("Search text"))
+
     # Returns the description based on the active language (Czech or English)
     def __str__(self) -> str:
         lang: str = get_language()
@@ -142,6 +156,9 @@ class OptionName(models.Model):
         max_length=255, verbose_name=_("Option name (English)")
     )
 
+    # Lowercased, unaccented copy of the names and descriptions (see catalog.search)
+    search_text = models.TextField(default="", editable=False, verbose_name=_("Search text"))
+
     # Returns the option name based on the active language (Czech or English)
     def __str__(self) -> str:
         lang: str = get_language()
@@ -196,6 +213,9 @@ class Option(models.Model):
         verbose_name=_("Description (English)"), null=True, blank=True
     )
 
+    # Lowercased, unaccented copy of the names and descriptions (see catalog.search)
+    search_text = models.TextField(default="", editable=False, verbose_name=_("Search text"))
+
     # Ensures that Czech and English option names and descriptions are not identical
     def clean(self) -> None:
         super().clean()
@@ -250,6 +270,9 @@ class ImpactCategory(models.Model):
         verbose_name=_("Impact Category (English)"), max_length=100
     )
 
+    # Lowercased, unaccented copy of the names and descriptions (see catalog.search)
+    search_text = models.TextField(default="", editable=False, verbose_name=_("Search text"))
+
     def __str__(self) -> str:
         lang: str = get_language()
         if lang == "cs":
@@ -278,6 +301,9 @@ class ImpactDetail(models.Model):
         verbose_name=_("Impact detail (English)"), max_length=100
     )
 
+    # Lowercased, unaccented copy of the names and descriptions (see catalog.search)
+    search_text = models.TextField(default="", editable=False, verbose_name=_("Search text"))
+
     def __str__(self) -> str:
         lang: str = get_language()
         if lang == "cs":
@@ -481,17 +507,26 @@ class Measure(models.Model):
         blank=True,
     )
 
+    # Blank prices are unknown, not free
     price_czk_min = models.PositiveIntegerField(
-        verbose_name=_("Price (CZK) - From"), default=0
+        verbose_name=_("Price (CZK) - From"), blank=True, null=True
     )
     price_czk_max = models.PositiveIntegerField(
-        verbose_name=_("Price (CZK) - To"), default=0
+        verbose_name=_("Price (CZK) - To"), blank=True, null=True
     )
     price_eu_min = models.PositiveIntegerField(
-        verbose_name=_("Price (Euro) - From"), default=0
+        verbose_name=_("Price (Euro) - From"), blank=True, null=True
     )
     price_eu_max = models.PositiveIntegerField(
-        verbose_name=_("Price (Euro) - To"), default=0
+        verbose_name=_("Price (Euro) - To"), blank=True, null=True
+    )
+
+    # Price range in euros derived from the prices above (see catalog.prices)
+    price_eur_min = models.PositiveIntegerField(
+        verbose_name=_("Normalized price (Euro) - From"), null=True, editable=False
+    )
+    price_eur_max = models.PositiveIntegerField(
+        verbose_name=_("Normalized price (Euro) - To"), null=True, editable=False
     )
 
     unit = models.ForeignKey(
@@ -541,6 +576,18 @@ class Measure(models.Model):
         options={"quality": 90},
     )
 
+    # Dimensions and low-quality placeholder of the processed title image,
+    # stored by the rendition worker so pages never open the image file
+    title_image_width = models.PositiveIntegerField(
+        verbose_name=_("Title image width"), blank=True, null=True, editable=False
+    )
+    title_image_height = models.PositiveIntegerField(
+        verbose_name=_("Title image height"), blank=True, null=True, editable=False
+    )
+    title_image_placeholder = models.TextField(
+        verbose_name=_("Title image placeholder"), blank=True, editable=False
+    )
+
     history_cs = models.TextField(
         verbose_name=_("History (Czech)"),
         blank=True,
@@ -569,6 +616,14 @@ class Measure(models.Model):
         null=True,
     )
 
+    # Lowercased, unaccented copy of the names and descriptions (see catalog.search)
+    search_text = models.TextField(default="", editable=False, verbose_name=_("Search text"))
+
+    # Time of the last change to anything shown on the measure page, including
+    # its relations and their labels (bumped with every document rebuild scheduled
+    # in catalog.signals); the lastmod of the page in the sitemap
+    updated_at = models.DateTimeField(auto_now=True, verbose_name=_("Updated at"))
+
     def clean(self):
         # Example: Validate that descriptions in Czech and English are different
         super().clean()
@@ -592,6 +647,12 @@ class Measure(models.Model):
                 name="unique_measure_names_and_code",
             )
         ]
+        indexes = [
+            # Price range filters (catalog.prices.price_filter)
+            models.Index(
+                fields=["price_eur_min", "price_eur_max"], name="measure_price_eur_range"
+            )
+        ]
 
 class MeasureImage(models.Model):
     """
@@ -617,6 +678,16 @@ class MeasureImage(models.Model):
         format="JPEG",
         options={"quality": 85},  # 85% quality compression
     )
+    # Dimensions and low-quality placeholder of the processed image (set by the rendition worker)
+    width = models.PositiveIntegerField(
+        verbose_name=_("Width"), blank=True, null=True, editable=False
+    )
+    height = models.PositiveIntegerField(
+        verbose_name=_("Height"), blank=True, null=True, editable=False
+    )
+    placeholder = models.TextField(
+        verbose_name=_("Placeholder"), blank=True, editable=False
+    )
     # Optional captions
     caption_cs = models.CharField(
         max_length=255,
@@ -672,6 +743,8 @@ class Example(models.Model):
         choices=LOCATION_CHOICES, verbose_name=_("Location")
     )
 
+    search_text = models.TextField(default="", editable=False, verbose_name=_("Search text"))
+
     class Meta:
         verbose_name = _("Implemented (example)")
         verbose_name_plural = _("Implemented (examples)")
@@ -687,6 +760,8 @@ class Dzes(models.Model):
     url_cs = models.URLField(verbose_name=_("URL (Czech)"), blank=True, null=True)
     url_en = models.URLField(verbose_name=_("URL (English)"), blank=True, null=True)
 
+    search_text = models.TextField(default="", editable=False, verbose_name=_("Search text"))
+
     def __str__(self):
         return self.code
 
@@ -701,9 +776,201 @@ class Pph(models.Model):
     url_cs = models.URLField(verbose_name=_("URL (Czech)"), blank=True, null=True)
     url_en = models.URLField(verbose_name=_("URL (English)"), blank=True, null=True)
 
+    search_text = models.TextField(default="", editable=False, verbose_name=_("Search text"))
+
     def __str__(self):
         return self.code
 
     class Meta:
         verbose_name = "PPH"  # Singular form in the admin
         verbose_name_plural = "PPH"  # Plural form in the admin
+
+
+class MeasureDocument(models.Model):
+    """
+    Denormalized, per-language snapshot of a Measure with every related label resolved.
+    """
+    measure = models.ForeignKey(
+        Measure,
+        on_delete=models.CASCADE,
+        related_name="documents",
+        verbose_name=_("Measure"),
+    )
+    # Language code of the labels stored in the document (one of settings.LANGUAGES)
+    language = models.CharField(max_length=7, verbose_name=_("Language"))
+    # Fully resolved measure data, see catalog.documents.build_measure_document
+    document = models.JSONField(verbose_name=_("Document"), encoder=DjangoJSONEncoder)
+    # Time of the last rebuild
+    updated_at = models.DateTimeField(auto_now=True, verbose_name=_("Updated at"))
+
+    def __str__(self):
+        return f"{self.measure_id} ({self.language})"
+
+    class Meta:
+        verbose_name = _("Measure document")
+        verbose_name_plural = _("Measure documents")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["measure", "language"], name="unique_measure_document_language"
+            )
+        ]
+
+
+class MeasureTranslation(models.Model):
+    """
+    Translatable texts of a Measure in one language.
+
+    Alternative storage of the *_cs/*_en columns read in the "table"
+    translation storage mode (see catalog.translations). The Czech and English
+    rows are written from the columns; rows of further languages are entered
+    directly.
+    """
+    measure = models.ForeignKey(
+        Measure,
+        on_delete=models.CASCADE,
+        related_name="translations",
+        verbose_name=_("Measure"),
+    )
+    # Language code of the texts
+    language = models.CharField(max_length=7, verbose_name=_("Language"))
+    measure_name = models.CharField(max_length=100, verbose_name=_("Measure name"))
+    abstract = models.CharField(
+        max_length=255, verbose_name=_("Abstract"), blank=True, null=True
+    )
+    description = models.TextField(verbose_name=_("Description"))
+    conditions_for_implementation = models.TextField(
+        verbose_name=_("Conditions of implementation"), blank=True, null=True
+    )
+    impact_desc = models.TextField(
+        verbose_name=_("Impact categories of climate change - note"), blank=True, null=True
+    )
+    comment = models.CharField(
+        max_length=255, verbose_name=_("Comment"), blank=True, null=True
+    )
+    history = models.TextField(verbose_name=_("History"), blank=True, null=True)
+
+    def __str__(self):
+        return f"{self.measure_id} ({self.language})"
+
+    class Meta:
+        verbose_name = _("Measure translation")
+        verbose_name_plural = _("Measure translations")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["measure", "language"], name="unique_measure_translation_language"
+            )
+        ]
+
+
+class SimilarMeasure(models.Model):
+    """
+    Measure ranked among the most similar ones of another measure.
+
+    Computed in batch by the compute_similar_measures command (see catalog.similarity).
+    """
+    measure = models.ForeignKey(
+        Measure,
+        on_delete=models.CASCADE,
+        related_name="similar_measures",
+        verbose_name=_("Measure"),
+    )
+    similar = models.ForeignKey(
+        Measure,
+        on_delete=models.CASCADE,
+        related_name="+",
+        verbose_name=_("Similar measure"),
+    )
+    # Cosine similarity of the two measures' feature vectors, between 0 and 1
+    score = models.FloatField(verbose_name=_("Score"))
+    # Position in the measure's list, 1 being the most similar
+    rank = models.PositiveSmallIntegerField(verbose_name=_("Rank"))
+
+    def __str__(self):
+        return f"{self.measure_id} -> {self.similar_id} ({self.score:.2f})"
+
+    class Meta:
+        verbose_name = _("Similar measure")
+        verbose_name_plural = _("Similar measures")
+        ordering = ["measure", "rank"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["measure", "similar"], name="unique_similar_measure"
+            )
+        ]
+
+
+class RenditionJob(models.Model):
+    """
+    Queued generation of the resized renditions of an uploaded image.
+    """
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    DEAD = "dead"
+
+    STATUS_CHOICES = (
+        (PENDING, _("Pending")),
+        (RUNNING, _("Running")),
+        (DONE, _("Done")),
+        (DEAD, _("Failed permanently")),
+    )
+
+    # Source image as "<model name>.<field name>", see catalog.renditions.RENDITION_SOURCES
+    source = models.CharField(max_length=100, verbose_name=_("Source"))
+    # Primary key of the instance holding the source image
+    object_id = models.PositiveBigIntegerField(verbose_name=_("Object ID"))
+    status = models.CharField(
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default=PENDING,
+        verbose_name=_("Status"),
+    )
+    # Number of started attempts, the job is dead-lettered after max_attempts
+    attempts = models.PositiveSmallIntegerField(default=0, verbose_name=_("Attempts"))
+    max_attempts = models.PositiveSmallIntegerField(default=3, verbose_name=_("Max attempts"))
+    last_error = models.TextField(blank=True, verbose_name=_("Last error"))
+    # Earliest time a worker may pick the job up (used for retry back-off)
+    available_at = models.DateTimeField(default=timezone.now, verbose_name=_("Available at"))
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name=_("Created at"))
+    started_at = models.DateTimeField(null=True, blank=True, verbose_name=_("Started at"))
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name=_("Finished at"))
+
+    def __str__(self):
+        return f"{self.source} #{self.object_id} ({self.status})"
+
+    class Meta:
+        verbose_name = _("Rendition job")
+        verbose_name_plural = _("Rendition jobs")
+        ordering = ["id"]
+        indexes = [
+            models.Index(fields=["status", "available_at"], name="rendition_job_queue_idx"),
+        ]
+        # At most one pending job per source image, also under concurrent uploads
+        constraints = [
+            models.UniqueConstraint(
+                fields=["source", "object_id"],
+                condition=models.Q(status="pending"),
+                name="rendition_job_one_pending",
+            )
+        ]
+
+
+class Rendition(models.Model):
+    """
+    Manifest entry of a generated image rendition.
+
+    Lets rendition URLs be resolved without asking the storage whether the file
+    exists, see catalog.renditions.ManifestBackend.
+    """
+    # Cache file name, derived by imagekit from the source name and the spec hash
+    name = models.CharField(max_length=255, unique=True, verbose_name=_("Name"))
+    # Original image the rendition was generated from
+    source_name = models.CharField(max_length=255, db_index=True, verbose_name=_("Source"))
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name=_("Created at"))
+
+    def __str__(self):
+        return self.name
+
+    class Meta:
+        verbose_name = _("Rendition")
+        verbose_name_plural = _("Renditions")
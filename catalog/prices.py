@@ -0,0 +1,109 @@
+"""
+Measure prices normalized to one currency for range queries.
+
+Measures are priced in CZK, in euros, or both, and the sheets often give a
+single value stored as the lower bound. Every measure therefore keeps a
+normalized EUR range in ``price_eur_min``/``price_eur_max``: the euro prices
+when present, otherwise the CZK prices converted at CATALOG_CZK_PER_EUR, with
+a missing bound copied from the other one. The columns are maintained on save
+and by the rebuild_normalized_prices command, which has to be run after the
+exchange rate changes.
+
+Price filters compare ranges for overlap on these columns, covered by a
+composite index.
+"""
+import math
+
+from django.conf import settings
+from django.db.models import Q
+
+from .models import Measure
+
+NORMALIZED_PRICE_FIELDS = ["price_eur_min", "price_eur_max"]
+
+
+def _bounds(low, high):
+    # A single known bound stands for both
+    low = high if low is None else low
+    high = low if high is None else high
+    if low is not None and high is not None and high < low:
+        low, high = high, low
+    return low, high
+
+
+def eur_range(price_czk_min, price_czk_max, price_eu_min, price_eu_max):
+    """
+    Return the normalized (min, max) EUR range of a measure, (None, None) if unpriced.
+    """
+    low, high = _bounds(price_eu_min, price_eu_max)
+    if low is not None:
+        return low, high
+    low, high = _bounds(price_czk_min, price_czk_max)
+    if low is None:
+        return None, None
+    rate = settings.CATALOG_CZK_PER_EUR
+    # Rounded outwards, so the stored range never excludes the original one
+    return math.floor(low / rate), math.ceil(high / rate)
+
+
+def normalize_prices(measure):
+    """
+    Set the normalized EUR range of ``measure``; returns whether it changed.
+    """
+    values = eur_range(
+        measure.price_czk_min, measure.price_czk_max, measure.price_eu_min, measure.price_eu_max
+    )
+    changed = values != (measure.price_eur_min, measure.price_eur_max)
+    measure.price_eur_min, measure.price_eur_max = values
+    return changed
+
+
+def rebuild_normalized_prices(chunk_size=1000):
+    """
+    Recompute the normalized EUR range of all measures; returns the number of rows changed.
+    """
+    fields = ["price_czk_min", "price_czk_max", "price_eu_min", "price_eu_max"]
+    changed = []
+    written = 0
+    for measure in Measure.objects.only("pk", *fields, *NORMALIZED_PRICE_FIELDS).order_by(
+        "pk"
+    ).iterator(chunk_size=chunk_size):
+        if normalize_prices(measure):
+            changed.append(measure)
+        if len(changed) >= chunk_size:
+            Measure.objects.bulk_update(changed, NORMALIZED_PRICE_FIELDS)
+            written += len(changed)
+            changed = []
+    Measure.objects.bulk_update(changed, NORMALIZED_PRICE_FIELDS)
+    return written + len(changed)
+
+
+def _amount(value):
+    try:
+        amount = float(value)
+    except (TypeError, ValueError):
+        return None
+    return amount if math.isfinite(amount) and amount >= 0 else None
+
+
+def price_filter(params):
+    """
+    Return a Q object selecting the measures whose price range overlaps the
+    ``price_min``/``price_max`` range in ``params``, or None without a range.
+
+    The bounds are in euros unless ``currency`` is "czk". Unpriced measures
+    never match a price filter.
+    """
+    low, high = _amount(params.get("price_min")), _amount(params.get("price_max"))
+    if low is None and high is None:
+        return None
+    if params.get("currency", "eur").lower() == "czk":
+        rate = settings.CATALOG_CZK_PER_EUR
+        low = None if low is None else low / rate
+        high = None if high is None else high / rate
+    condition = Q()
+    if low is not None:
+        condition &= Q(price_eur_max__gte=low)
+    if high is not None:
+        condition &= Q(price_eur_min__lte=high)
+    return condition
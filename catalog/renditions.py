@@ -0,0 +1,272 @@
+"""
+Database-backed queue generating image renditions outside of requests.
+
+Uploading an image only enqueues a RenditionJob; the run_image_worker command
+drains the queue with a process pool and records each rendition's dimensions
+and placeholder. Catalog pages link the rendition names directly, so images
+uploaded while the worker is down show up once it has caught up.
+
+Generated renditions are recorded in the Rendition manifest, which
+ManifestBackend keeps in memory so resolving a rendition URL does not stat the
+storage.
+"""
+import time
+import traceback
+from datetime import timedelta
+from functools import partial
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+from django.utils import timezone
+from imagekit.cachefiles.backends import CacheFileState, Simple
+from imagekit.cachefiles.strategies import JustInTime
+
+from .documents import rebuild_measure_documents
+from .images import rendition_metadata
+from .models import Measure, MeasureImage, Rendition, RenditionJob
+
+# "<model name>.<source field>" -> (model, rendition attribute, fields storing its
+# width, height and placeholder)
+RENDITION_SOURCES = {
+    "measure.title_image": (
+        Measure,
+        "processed_title_image",
+        ("title_image_width", "title_image_height", "title_image_placeholder"),
+    ),
+    "measureimage.original_image": (
+        MeasureImage,
+        "processed_image",
+        ("width", "height", "placeholder"),
+    ),
+}
+
+
+def source_key(instance, field_name):
+    return f"{instance._meta.model_name}.{field_name}"
+
+
+def enqueue_rendition(instance, field_name):
+    """
+    Queue rendition generation for ``instance.<field_name>`` unless already pending.
+    """
+    source = source_key(instance, field_name)
+    if source not in RENDITION_SOURCES:
+        return None
+    job, _created = RenditionJob.objects.get_or_create(
+        source=source,
+        object_id=instance.pk,
+        status=RenditionJob.PENDING,
+        defaults={"max_attempts": settings.RENDITION_MAX_ATTEMPTS},
+    )
+    return job
+
+
+class QueuedRenditionStrategy(JustInTime):
+    """
+    imagekit cache file strategy queueing generation when a source image is saved.
+    """
+
+    def on_source_saved(self, file):
+        source = file.generator.source
+        # Workers must not pick the job up before the saved image is visible to them
+        transaction.on_commit(partial(enqueue_rendition, source.instance, source.field.name))
+
+
+class RenditionManifest:
+    """
+    Per-process copy of the names in the Rendition table.
+
+    Reloaded every RENDITION_MANIFEST_TTL seconds, so renditions recorded by
+    other processes are picked up without a query per lookup.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self._names = set()
+        self._loaded_at = None
+
+    def names(self):
+        now = time.monotonic()
+        if self._loaded_at is None or now - self._loaded_at > settings.RENDITION_MANIFEST_TTL:
+            self._names = set(Rendition.objects.values_list("name", flat=True))
+            self._loaded_at = now
+        return self._names
+
+    def __contains__(self, name):
+        return name in self.names()
+
+    def record(self, file):
+        if file.name in self._names:
+            return
+        Rendition.objects.bulk_create(
+            [Rendition(name=file.name, source_name=file.generator.source.name)],
+            ignore_conflicts=True,
+        )
+        self._names.add(file.name)
+
+
+manifest = RenditionManifest()
+
+
+class ManifestBackend(Simple):
+    """
+    imagekit cache file backend answering existence checks from the rendition manifest.
+
+    Renditions missing from the manifest fall back to the default cache and
+    storage check and are recorded once they are known to exist.
+    """
+
+    def get_state(self, file, check_if_unknown=True):
+        if file.name in manifest:
+            return CacheFileState.EXISTS
+        return super().get_state(file, check_if_unknown)
+
+    def set_state(self, file, state):
+        super().set_state(file, state)
+        if state == CacheFileState.EXISTS:
+            manifest.record(file)
+
+
+def warm_rendition_manifest():
+    """
+    Record renditions already present in the storage; returns the number of new entries.
+    """
+    recorded = 0
+    for source, (model, rendition_name, _metadata_fields) in RENDITION_SOURCES.items():
+        field_name = source.split(".", 1)[1]
+        for instance in model.objects.exclude(**{field_name: ""}).only("pk", field_name):
+            rendition = getattr(instance, rendition_name)
+            if rendition.name in manifest:
+                continue
+            if rendition.storage.exists(rendition.name):
+                manifest.record(rendition)
+                recorded += 1
+    return recorded
+
+
+def claim_jobs(limit):
+    """
+    Mark up to ``limit`` available jobs as running and return their IDs.
+
+    Rows locked by another worker are skipped, so several workers can share the queue.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        ids = list(
+            RenditionJob.objects.select_for_update(skip_locked=True)
+            .filter(status=RenditionJob.PENDING, available_at__lte=now)
+            .order_by("available_at", "id")
+            .values_list("pk", flat=True)[:limit]
+        )
+        RenditionJob.objects.filter(pk__in=ids).update(
+            status=RenditionJob.RUNNING, started_at=now, attempts=F("attempts") + 1
+        )
+    return ids
+
+
+def _requeue(queryset, **fields):
+    """
+    Return the jobs of ``queryset`` to the queue; returns the number of jobs requeued.
+
+    A job whose image already has a pending job is finished instead, the
+    pending job renders the image again.
+    """
+    requeued = 0
+    for job_id in queryset.values_list("pk", flat=True):
+        job = queryset.filter(pk=job_id)
+        try:
+            with transaction.atomic():
+                requeued += job.update(
+                    status=RenditionJob.PENDING, available_at=timezone.now(), **fields
+                )
+        except IntegrityError:
+            job.update(status=RenditionJob.DONE, finished_at=timezone.now())
+    return requeued
+
+
+def requeue_stale_jobs(seconds):
+    """
+    Return jobs stuck in "running" longer than ``seconds`` (e.g. after a worker crash) to the queue.
+    """
+    cutoff = timezone.now() - timedelta(seconds=seconds)
+    return _requeue(RenditionJob.objects.filter(status=RenditionJob.RUNNING, started_at__lt=cutoff))
+
+
+def render_job(job_id):
+    """
+    Generate the renditions of one job; returns (job_id, error message or None).
+
+    Runs inside the worker processes.
+    """
+    try:
+        job = RenditionJob.objects.get(pk=job_id)
+        model, rendition_name, metadata_fields = RENDITION_SOURCES[job.source]
+        instance = model.objects.filter(pk=job.object_id).first()
+        field_name = job.source.split(".", 1)[1]
+        # Nothing to render when the instance or its image was removed meanwhile
+        if instance is not None and getattr(instance, field_name):
+            rendition = getattr(instance, rendition_name)
+            # The worker checks the storage itself rather than trusting the manifest
+            if rendition.storage.exists(rendition.name):
+                manifest.record(rendition)
+            else:
+                rendition.generate(force=True)
+            with rendition.storage.open(rendition.name, "rb") as generated:
+                metadata = rendition_metadata(generated)
+            model.objects.filter(pk=instance.pk).update(**dict(zip(metadata_fields, metadata)))
+            rebuild_measure_documents([getattr(instance, "measure_id", instance.pk)])
+    except Exception:
+        return job_id, traceback.format_exc()
+    return job_id, None
+
+
+def complete_job(job_id, error=None):
+    """
+    Store the outcome of an attempt: done, retried later, or dead-lettered.
+    """
+    job = RenditionJob.objects.get(pk=job_id)
+    job.finished_at = timezone.now()
+    if error is None:
+        job.status = RenditionJob.DONE
+        job.last_error = ""
+    elif job.attempts >= job.max_attempts:
+        job.status = RenditionJob.DEAD
+        job.last_error = error
+    else:
+        job.status = RenditionJob.PENDING
+        job.last_error = error
+        # Exponential back-off between attempts
+        delay = settings.RENDITION_RETRY_DELAY * 2 ** (job.attempts - 1)
+        job.available_at = job.finished_at + timedelta(seconds=delay)
+    try:
+        with transaction.atomic():
+            job.save()
+    except IntegrityError:
+        # The image was uploaded again meanwhile and its pending job replaces the retry
+        job.status = RenditionJob.DONE
+        job.save()
+    return job
+
+
+def retry_jobs(queryset):
+    """
+    Put dead or finished jobs back into the queue with a fresh attempt budget.
+    """
+    return _requeue(
+        queryset.exclude(status=RenditionJob.RUNNING),
+        attempts=0,
+        last_error="",
+    )
+
+
+def queue_counters():
+    """
+    Return the number of jobs per status.
+    """
+    counts = dict(
+        RenditionJob.objects.values_list("status").annotate(total=Count("pk")).order_by()
+    )
+    return {status: counts.get(status, 0) for status, _label in RenditionJob.STATUS_CHOICES}
@@ -0,0 +1,67 @@
+"""
+Database router sending public catalog reads to read replicas.
+
+Reads use the primary unless replica reads were switched on for the current
+context (see ReplicaRoutingMiddleware), so admin requests, management and
+import commands keep reading what they have just written.
+"""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+PRIMARY_DATABASE = "default"
+
+_replica_reads = ContextVar("catalog_replica_reads", default=False)
+_written_databases = ContextVar("catalog_written_databases", default=None)
+
+
+@contextmanager
+def replica_reads(enabled=True):
+    """
+    Route reads inside the block to a replica (or back to the primary if ``enabled`` is False).
+    """
+    token = _replica_reads.set(enabled)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+@contextmanager
+def recorded_writes():
+    """
+    Collect the aliases of the databases written to inside the block into the yielded set.
+    """
+    written = set()
+    token = _written_databases.set(written)
+    try:
+        yield written
+    finally:
+        _written_databases.reset(token)
+
+
+def replica_databases():
+    return list(getattr(settings, "DATABASE_REPLICAS", ()))
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        replicas = replica_databases()
+        if replicas and _replica_reads.get():
+            return random.choice(replicas)
+        return PRIMARY_DATABASE
+
+    def db_for_write(self, model, **hints):
+        written = _written_databases.get()
+        if written is not None:
+            written.add(PRIMARY_DATABASE)
+        return PRIMARY_DATABASE
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == PRIMARY_DATABASE
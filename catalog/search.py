@@ -0,0 +1,236 @@
+"""
+Accent- and case-insensitive catalog search.
+
+Every searchable model keeps a normalized copy of its names and descriptions
+in a ``search_text`` column, maintained on save and by the rebuild_search_text
+command. Admin and public searches filter on that column, which PostgreSQL
+serves from a pg_trgm GIN index.
+
+The search suggestions come from an in-memory prefix index instead.
+
+The catalog vocabulary (measure names and codes, groups, advantages and SDG
+labels in both languages) is normalized to lowercase ASCII and kept as a
+sorted list of keys, one per word a term can be found by. A suggestion lookup
+is a bisect into that list and never touches the database. Changes to the
+indexed models bump a version number kept in the default cache, and every
+process compares it before serving from its index, so with a cache shared by
+the workers all of them rebuild after a change. Indexes are rebuilt after
+CATALOG_SEARCH_INDEX_TTL seconds in any case, which bounds the staleness of
+processes that do not share the cache (e.g. with the local-memory backend).
+"""
+import time
+import unicodedata
+from bisect import bisect_left
+from functools import reduce
+from operator import and_
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+
+from .models import (
+    Advantage,
+    Disadvantage,
+    Dzes,
+    Example,
+    Group,
+    ImpactCategory,
+    ImpactDetail,
+    Measure,
+    Option,
+    OptionName,
+    Pph,
+)
+
+# Fields copied, normalized, into each model's search_text column
+SEARCH_TEXT_FIELDS = {
+    Group: ("group_name_cs", "group_name_en"),
+    Advantage: ("advantage_description_cs", "advantage_description_en"),
+    Disadvantage: ("disadvantage_description_cs", "disadvantage_description_en"),
+    OptionName: ("option_name_cs", "option_name_en"),
+    Option: ("option_cs", "option_en", "description_cs", "description_en"),
+    ImpactCategory: ("impact_category_name_cs", "impact_category_name_en"),
+    ImpactDetail: ("impact_detail_cs", "impact_detail_en"),
+    Measure: ("code", "measure_name_cs", "measure_name_en", "description_cs", "description_en"),
+    Example: ("example_name", "description_cs", "description_en", "web"),
+    Dzes: ("code", "name_cs", "name_en"),
+    Pph: ("code", "name_cs", "name_en"),
+}
+
+
+def normalize(text):
+    """
+    Return ``text`` casefolded and without diacritics ("Řeka" -> "reka").
+    """
+    decomposed = unicodedata.normalize("NFKD", str(text).casefold())
+    return "".join(char for char in decomposed if not unicodedata.combining(char)).strip()
+
+
+def search_text(instance):
+    """
+    Return the value of ``instance.search_text``, one normalized field per line.
+    """
+    values = (getattr(instance, field) for field in SEARCH_TEXT_FIELDS[type(instance)])
+    return "\n".join(normalize(value) for value in values if value)
+
+
+def search_filter(query):
+    """
+    Return a Q object matching search_text against every word of ``query``,
+    or None for a blank query.
+    """
+    words = normalize(query).split()
+    if not words:
+        return None
+    return reduce(and_, (Q(search_text__contains=word) for word in words))
+
+
+def rebuild_search_text(model, chunk_size=1000):
+    """
+    Recompute ``model.search_text`` for all rows; returns the number of rows changed.
+    """
+    fields = SEARCH_TEXT_FIELDS[model]
+    changed = []
+    written = 0
+    for instance in model.objects.only("pk", "search_text", *fields).order_by("pk").iterator(
+        chunk_size=chunk_size
+    ):
+        value = search_text(instance)
+        if value != instance.search_text:
+            instance.search_text = value
+            changed.append(instance)
+        if len(changed) >= chunk_size:
+            model.objects.bulk_update(changed, ["search_text"])
+            written += len(changed)
+            changed = []
+    model.objects.bulk_update(changed, ["search_text"])
+    return written + len(changed)
+
+
+def _sdg_options():
+    # The options offered for the SDG relation
+    return Option.objects.filter(**Measure._meta.get_field("sdg").remote_field.limit_choices_to)
+
+
+# Models whose rows are suggested, see catalog_terms
+SUGGESTION_MODELS = (Measure, Group, Advantage, Option)
+
+
+def catalog_terms():
+    """
+    Yield (term, suggestion) pairs of the indexed vocabulary, both languages included.
+    """
+    for measure in Measure.objects.only("pk", "code", "measure_name_cs", "measure_name_en"):
+        for term in (measure.measure_name_cs, measure.measure_name_en, measure.code):
+            yield term, {"kind": "measure", "id": measure.pk, "label": term}
+    for group in Group.objects.only("pk", "group_name_cs", "group_name_en"):
+        for term in (group.group_name_cs, group.group_name_en):
+            yield term, {"kind": "group", "id": group.pk, "label": term}
+    # Advantages and SDGs are facets of the measure list, see filters.MEASURE_FACETS
+    advantages = Advantage.objects.only(
+        "pk", "advantage_description_cs", "advantage_description_en"
+    )
+    for advantage in advantages:
+        for term in (advantage.advantage_description_cs, advantage.advantage_description_en):
+            yield term, {"kind": "advantages", "id": advantage.pk, "label": term}
+    for option in _sdg_options().only("pk", "option_cs", "option_en"):
+        for term in (option.option_cs, option.option_en):
+            yield term, {"kind": "sdg", "id": option.pk, "label": term}
+
+
+class PrefixIndex:
+    """
+    Sorted normalized keys with bisect lookups.
+
+    Every word of a term starts a key, so "zelené střechy" is found by both
+    "zel" and "strech".
+    """
+
+    def __init__(self, terms):
+        self.suggestions = []
+        keys = []
+        for term, suggestion in terms:
+            if not term:
+                continue
+            position = len(self.suggestions)
+            self.suggestions.append(suggestion)
+            words = normalize(term).split()
+            for start in range(len(words)):
+                keys.append((" ".join(words[start:]), position))
+        keys.sort()
+        self.keys = [key for key, _position in keys]
+        self.positions = [position for _key, position in keys]
+
+    def __len__(self):
+        return len(self.suggestions)
+
+    def search(self, query, limit=10):
+        """
+        Return up to ``limit`` suggestions with a word starting with ``query``.
+
+        Each object is suggested once, under the first of its terms that matches.
+        """
+        prefix = " ".join(normalize(query).split())
+        if not prefix:
+            return []
+        found, seen = [], set()
+        index = bisect_left(self.keys, prefix)
+        while index < len(self.keys) and self.keys[index].startswith(prefix):
+            suggestion = self.suggestions[self.positions[index]]
+            target = (suggestion["kind"], suggestion["id"])
+            if target not in seen:
+                seen.add(target)
+                found.append(suggestion)
+                if len(found) >= limit:
+                    break
+            index += 1
+        return found
+
+
+class SuggestionIndex:
+    """
+    Per-process PrefixIndex of the catalog, built on first use.
+    """
+
+    # Cache key of the vocabulary version shared by the processes
+    version_key = "catalog-search-index-version"
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self._index = None
+        self._built_at = None
+        self._version = None
+
+    def invalidate(self):
+        """
+        Make every process sharing the cache rebuild its index on the next lookup.
+        """
+        cache.add(self.version_key, 0, None)
+        try:
+            cache.incr(self.version_key)
+        except ValueError:
+            # Evicted meanwhile; a missing version differs from the stored ones too
+            pass
+        self.clear()
+
+    def get(self):
+        now = time.monotonic()
+        # Read before building, so a change committed during the build is not missed
+        version = cache.get(self.version_key)
+        if (
+            self._index is None
+            or version != self._version
+            or now - self._built_at > settings.CATALOG_SEARCH_INDEX_TTL
+        ):
+            self._index = PrefixIndex(catalog_terms())
+            self._built_at = now
+            self._version = version
+        return self._index
+
+    def search(self, query, limit=10):
+        return self.get().search(query, limit)
+
+
+suggestion_index = SuggestionIndex()
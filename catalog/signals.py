@@ -0,0 +1,204 @@
+"""
+Signal handlers keeping derived catalog data in sync with the source models.
+"""
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .documents import DEPENDENT_LOOKUPS, dependent_measure_ids, rebuild_measure_documents
+from .images import normalize_upload
+from .prices import normalize_prices
+from .models import Advantage, Example, Group, Measure, MeasureImage, Option
+from .search import SEARCH_TEXT_FIELDS, search_text, suggestion_index
+from .translations import store_measure_translations
+
+
+def refresh_measure_pages(measure_ids):
+    """
+    Rebuild the documents of ``measure_ids`` and mark their pages as changed.
+    """
+    Measure.objects.filter(pk__in=measure_ids).update(updated_at=timezone.now())
+    # Read by the document rebuild in the "table" translation storage
+    store_measure_translations(measure_ids)
+    rebuild_measure_documents(measure_ids)
+
+
+class PendingRebuild:
+    """
+    Measures collected during one transaction, refreshed by the first of the
+    on_commit callbacks registered for them.
+    """
+
+    def __init__(self):
+        self.measure_ids = set()
+        self.done = False
+
+    def __call__(self):
+        if not self.done:
+            self.done = True
+            refresh_measure_pages(self.measure_ids)
+
+
+def pending_rebuild(connection):
+    # The collection of the current savepoint, a rollback to it drops the
+    # callbacks; None marks the atomic blocks without a savepoint of their own
+    savepoint_ids = set(connection.savepoint_ids) - {None}
+    for callback_savepoint_ids, callback, *_robust in reversed(connection.run_on_commit):
+        if (
+            isinstance(callback, PendingRebuild)
+            and not callback.done
+            and callback_savepoint_ids - {None} == savepoint_ids
+        ):
+            return callback
+    return PendingRebuild()
+
+
+def schedule_document_rebuild(measure_ids):
+    """
+    Rebuild the documents of ``measure_ids`` once the current transaction commits.
+
+    The ids scheduled within one transaction, e.g. by the post_save and the
+    m2m_changed signals of one admin save, are refreshed together, once.
+    """
+    measure_ids = {pk for pk in measure_ids if pk is not None}
+    if not measure_ids:
+        return
+    pending = pending_rebuild(transaction.get_connection())
+    pending.measure_ids |= measure_ids
+    # Registered again on each call, only the first run refreshes
+    transaction.on_commit(pending)
+
+
+@receiver(pre_save, sender=Measure)
+def normalize_title_image(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    if instance.title_image and not instance.title_image._committed:
+        # Stale until the rendition worker processes the new image
+        instance.title_image_width = instance.title_image_height = None
+        instance.title_image_placeholder = ""
+    normalize_upload(instance.title_image)
+
+
+@receiver(pre_save, sender=MeasureImage)
+def normalize_gallery_image(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    if instance.original_image and not instance.original_image._committed:
+        instance.width = instance.height = None
+        instance.placeholder = ""
+    normalize_upload(instance.original_image)
+
+
+@receiver(post_save, sender=Measure)
+def measure_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    # Interconnected measures embed this measure's name as well
+    linked = Measure.objects.filter(interconnection=instance).values_list("pk", flat=True)
+    schedule_document_rebuild([instance.pk, *linked])
+
+
+@receiver(pre_delete, sender=Measure)
+def measure_deleted(sender, instance, **kwargs):
+    linked = Measure.objects.filter(interconnection=instance).values_list("pk", flat=True)
+    schedule_document_rebuild(list(linked))
+
+
+def measure_relations_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear", "pre_clear"):
+        return
+    if isinstance(instance, Measure):
+        interconnection = sender is Measure.interconnection.through
+        if action == "pre_clear":
+            if interconnection:
+                schedule_document_rebuild(
+                    instance.interconnection.values_list("pk", flat=True)
+                )
+            return
+        # Symmetrical interconnections change the documents on both sides
+        related = pk_set if interconnection and pk_set else ()
+        schedule_document_rebuild([instance.pk, *related])
+    elif action == "pre_clear":
+        schedule_document_rebuild(dependent_measure_ids(instance))
+    else:
+        schedule_document_rebuild(pk_set or ())
+
+
+for field in Measure._meta.many_to_many:
+    m2m_changed.connect(
+        measure_relations_changed,
+        sender=field.remote_field.through,
+        dispatch_uid=f"catalog_measure_document_{field.name}",
+    )
+
+
+@receiver(post_save, sender=MeasureImage)
+@receiver(post_delete, sender=MeasureImage)
+@receiver(post_save, sender=Example)
+@receiver(post_delete, sender=Example)
+def measure_child_changed(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    schedule_document_rebuild([instance.measure_id])
+
+
+def vocabulary_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    schedule_document_rebuild(dependent_measure_ids(instance))
+
+
+def vocabulary_deleted(sender, instance, **kwargs):
+    # Collected before deletion, the relations are gone afterwards
+    schedule_document_rebuild(dependent_measure_ids(instance))
+
+
+for model in DEPENDENT_LOOKUPS:
+    post_save.connect(
+        vocabulary_saved,
+        sender=model,
+        dispatch_uid=f"catalog_document_saved_{model.__name__}",
+    )
+    pre_delete.connect(
+        vocabulary_deleted,
+        sender=model,
+        dispatch_uid=f"catalog_document_deleted_{model.__name__}",
+    )
+
+
+@receiver(post_save, sender=Measure)
+@receiver(post_delete, sender=Measure)
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+@receiver(post_save, sender=Advantage)
+@receiver(post_delete, sender=Advantage)
+@receiver(post_save, sender=Option)
+@receiver(post_delete, sender=Option)
+def search_vocabulary_changed(sender, raw=False, **kwargs):
+    if raw:
+        return
+    # Suggestions reflect the change once it is committed
+    transaction.on_commit(suggestion_index.invalidate)
+
+
+def update_search_text(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    instance.search_text = search_text(instance)
+
+
+for model in SEARCH_TEXT_FIELDS:
+    pre_save.connect(
+        update_search_text,
+        sender=model,
+        dispatch_uid=f"catalog_search_text_{model.__name__}",
+    )
+
+
+@receiver(pre_save, sender=Measure)
+def update_normalized_prices(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    normalize_prices(instance)
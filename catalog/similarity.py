@@ -0,0 +1,198 @@
+"""
+Precomputed "similar measures" recommendations.
+
+Every measure is described by a feature vector: one column per option, impact
+detail, DZES and PPH code it is linked to, and the TF-IDF weights of the words
+of its descriptions. Both parts are weighted by inverse document frequency and
+L2-normalized, so the dot product of two vectors is their cosine similarity.
+The compute_similar_measures command multiplies the matrix with its transpose
+in chunks and stores the top-k neighbours of each measure as SimilarMeasure
+rows; pages only read those rows.
+"""
+import math
+import re
+from collections import Counter
+
+from django.db import transaction
+
+from .documents import MEASURE_CARD_FIELDS, build_measure_card
+from .models import Measure, SimilarMeasure
+from .search import normalize
+
+# Foreign keys and many-to-many relations whose targets become features
+RELATION_FEATURES = (
+    "env",
+    "env_secondary",
+    "potential",
+    "size",
+    "sdg",
+    "conflict",
+    "impact_details",
+    "other_impacts_details",
+    "dzes",
+    "pph",
+)
+
+# Share of the description words in the similarity, the relations get the rest
+TEXT_WEIGHT = 0.5
+
+# Shorter words carry little meaning in either language
+MIN_WORD_LENGTH = 3
+# Words used by more than this share of the measures are treated as stop words
+MAX_DOCUMENT_FREQUENCY = 0.5
+
+WORD_PATTERN = re.compile(r"\w+")
+
+
+def _relation_pairs():
+    """
+    Yield (measure id, feature) for every related object of every measure.
+    """
+    foreign_keys = [
+        name for name in RELATION_FEATURES if Measure._meta.get_field(name).many_to_one
+    ]
+    for values in Measure.objects.values_list("pk", *(f"{name}_id" for name in foreign_keys)):
+        for name, target_id in zip(foreign_keys, values[1:]):
+            if target_id is not None:
+                yield values[0], f"{name}:{target_id}"
+
+    for name in RELATION_FEATURES:
+        field = Measure._meta.get_field(name)
+        if not field.many_to_many:
+            continue
+        through = field.remote_field.through
+        source = f"{field.m2m_field_name()}_id"
+        target = f"{field.m2m_reverse_field_name()}_id"
+        for measure_id, target_id in through.objects.values_list(source, target):
+            yield measure_id, f"{name}:{target_id}"
+
+
+def _description_words():
+    """
+    Return {measure id: Counter of the normalized description words}.
+    """
+    words = {}
+    for pk, description_cs, description_en in Measure.objects.values_list(
+        "pk", "description_cs", "description_en"
+    ):
+        text = normalize(f"{description_cs or ''} {description_en or ''}")
+        words[pk] = Counter(
+            word for word in WORD_PATTERN.findall(text) if len(word) >= MIN_WORD_LENGTH
+        )
+    return words
+
+
+def _weighted_block(rows, entries, sublinear):
+    """
+    Return the IDF-weighted, row-normalized matrix of ``entries`` ((row, feature, count)).
+
+    Features found in a single measure cannot make two measures similar and are dropped.
+    """
+    import numpy as np
+
+    document_frequency = Counter(feature for _row, feature, _count in entries)
+    max_frequency = max(2, MAX_DOCUMENT_FREQUENCY * rows) if sublinear else rows
+    columns = {}
+    for feature, frequency in sorted(document_frequency.items()):
+        if 2 <= frequency <= max_frequency:
+            columns[feature] = len(columns)
+
+    block = np.zeros((rows, len(columns)), dtype=np.float32)
+    for row, feature, count in entries:
+        column = columns.get(feature)
+        if column is not None:
+            tf = 1 + math.log(count) if sublinear else count
+            block[row, column] = tf * math.log(rows / document_frequency[feature])
+    norms = np.linalg.norm(block, axis=1, keepdims=True)
+    return np.divide(block, norms, out=np.zeros_like(block), where=norms > 0)
+
+
+def feature_matrix():
+    """
+    Return (measure ids, matrix) with one L2-normalized feature row per measure.
+    """
+    import numpy as np
+
+    words = _description_words()
+    ids = sorted(words)
+    rows = {pk: row for row, pk in enumerate(ids)}
+
+    relation_entries = [(rows[pk], feature, 1) for pk, feature in _relation_pairs()]
+    text_entries = [
+        (rows[pk], word, count) for pk, counter in words.items() for word, count in counter.items()
+    ]
+    relations = _weighted_block(len(ids), relation_entries, sublinear=False)
+    text = _weighted_block(len(ids), text_entries, sublinear=True)
+
+    matrix = np.hstack(
+        [relations * math.sqrt(1 - TEXT_WEIGHT), text * math.sqrt(TEXT_WEIGHT)]
+    )
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return ids, np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+
+def top_similar(ids, matrix, top=5, min_score=0.05, chunk_size=500):
+    """
+    Yield (measure id, similar id, score, rank) for the ``top`` neighbours of every measure.
+    """
+    import numpy as np
+
+    count = len(ids)
+    top = min(top, count - 1)
+    if top <= 0:
+        return
+    for start in range(0, count, chunk_size):
+        scores = matrix[start : start + chunk_size] @ matrix.T
+        chunk_rows = np.arange(scores.shape[0])
+        # A measure is not similar to itself
+        scores[chunk_rows, start + chunk_rows] = -1
+        candidates = np.argpartition(-scores, top - 1, axis=1)[:, :top]
+        for row, columns in zip(chunk_rows, candidates):
+            ranked = sorted(columns, key=lambda column: -scores[row, column])
+            rank = 0
+            for column in ranked:
+                score = float(scores[row, column])
+                if score < min_score:
+                    break
+                rank += 1
+                yield ids[start + row], ids[column], score, rank
+
+
+def compute_similar_measures(top=5, min_score=0.05, chunk_size=500):
+    """
+    Replace all SimilarMeasure rows with freshly computed ones; returns their number.
+    """
+    ids, matrix = feature_matrix()
+    similar = [
+        SimilarMeasure(measure_id=measure_id, similar_id=similar_id, score=score, rank=rank)
+        for measure_id, similar_id, score, rank in top_similar(
+            ids, matrix, top=top, min_score=min_score, chunk_size=chunk_size
+        )
+    ]
+    with transaction.atomic():
+        SimilarMeasure.objects.all().delete()
+        SimilarMeasure.objects.bulk_create(similar, batch_size=1000)
+    return len(similar)
+
+
+def similar_measures_queryset(measure_id):
+    # One query for the cards of a measure's similar measures
+    return (
+        SimilarMeasure.objects.filter(measure_id=measure_id)
+        .select_related("similar")
+        .only("similar", *(f"similar__{field}" for field in MEASURE_CARD_FIELDS if field != "pk"))
+    )
+
+
+def similar_measure_cards(measure_id, language):
+    return [
+        build_measure_card(item.similar, language)
+        for item in similar_measures_queryset(measure_id)
+    ]
+
+
+async def asimilar_measure_cards(measure_id, language):
+    return [
+        build_measure_card(item.similar, language)
+        async for item in similar_measures_queryset(measure_id)
+    ]
@@ -0,0 +1,105 @@
+"""
+Sitemaps of the public catalog pages.
+
+Every group and measure page is listed once per language with hreflang
+alternates, and its lastmod comes from the updated_at column, so crawlers
+fetch only the pages that changed. Items are read with narrow values()
+queries, and the rendered sitemaps are cached under a key derived from the
+catalog's latest change, so they are regenerated only after the catalog
+changes. Catalogs larger than CATALOG_SITEMAP_LIMIT URLs are split into
+several files listed by the sitemap index.
+"""
+from functools import wraps
+
+from django.conf import settings
+from django.contrib.sitemaps import Sitemap
+from django.core.cache import cache
+from django.db.models import Count, Max
+from django.urls import reverse
+
+from .models import Group, Measure
+
+
+class CatalogSitemap(Sitemap):
+    i18n = True
+    alternates = True
+    x_default = True
+
+    @property
+    def limit(self):
+        # Pages are split per URL, i.e. per (item, language) pair
+        return settings.CATALOG_SITEMAP_LIMIT
+
+    def lastmod(self, item):
+        return item["updated_at"]
+
+
+class GroupSitemap(CatalogSitemap):
+    priority = 0.6
+
+    def items(self):
+        # A group page lists its measures, so their changes count as well
+        return (
+            Group.objects.annotate(measures_updated_at=Max("measure__updated_at"))
+            .values("pk", "updated_at", "measures_updated_at")
+            .order_by("pk")
+        )
+
+    def location(self, item):
+        return reverse("group-detail", args=[item["pk"]])
+
+    def lastmod(self, item):
+        # measures_updated_at is None for groups without measures
+        return max(filter(None, (item["updated_at"], item["measures_updated_at"])))
+
+
+class MeasureSitemap(CatalogSitemap):
+    priority = 0.8
+
+    def items(self):
+        return Measure.objects.values("pk", "updated_at").order_by("pk")
+
+    def location(self, item):
+        return reverse("measure-detail", args=[item["pk"]])
+
+
+SITEMAPS = {
+    "groups": GroupSitemap,
+    "measures": MeasureSitemap,
+}
+
+
+def catalog_version():
+    """
+    Return a value that changes whenever a group or measure is saved or deleted.
+    """
+    groups = Group.objects.aggregate(count=Count("pk"), updated_at=Max("updated_at"))
+    measures = Measure.objects.aggregate(count=Count("pk"), updated_at=Max("updated_at"))
+    return "-".join(
+        str(value)
+        for value in (
+            groups["count"],
+            groups["updated_at"] and groups["updated_at"].timestamp(),
+            measures["count"],
+            measures["updated_at"] and measures["updated_at"].timestamp(),
+        )
+    )
+
+
+def cache_sitemap(view):
+    """
+    Cache the responses of a sitemap view until the catalog changes.
+    """
+
+    @wraps(view)
+    def cached_view(request, *args, **kwargs):
+        key = f"catalog-sitemap:{catalog_version()}:{request.build_absolute_uri()}"
+        response = cache.get(key)
+        if response is None:
+            response = view(request, *args, **kwargs)
+            response.render()
+            if response.status_code == 200:
+                cache.set(key, response, settings.CATALOG_SITEMAP_CACHE_TIMEOUT)
+        return response
+
+    return cached_view
@@ -0,0 +1,73 @@
+"""
+Objects shared by the catalog tests.
+"""
+import io
+import json
+
+from PIL import Image
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+
+from catalog.models import Advantage, Group, Measure
+
+
+def create_group(name_cs="Skupina", name_en="Group"):
+    return Group.objects.create(group_name_cs=name_cs, group_name_en=name_en)
+
+
+def create_advantage(description_cs="Výhoda", description_en="Advantage"):
+    return Advantage.objects.create(
+        advantage_description_cs=description_cs, advantage_description_en=description_en
+    )
+
+
+def measure_fields(group, code, fields):
+    # The required texts, overridable through ``fields``
+    return {
+        "group": group,
+        "code": code,
+        "measure_name_cs": "Opatření",
+        "measure_name_en": "Measure",
+        "description_cs": "Popis",
+        "description_en": "Description",
+        **fields,
+    }
+
+
+def create_measure(group, code="M1", **fields):
+    return Measure.objects.create(**measure_fields(group, code, fields))
+
+
+async def acreate_measure(group, code="M1", **fields):
+    return await Measure.objects.acreate(**measure_fields(group, code, fields))
+
+
+def create_measures(group, count, **fields):
+    """
+    Create ``count`` measures of ``group`` numbered from 0 in their names and codes.
+    """
+    return [
+        create_measure(
+            group,
+            f"M{i}",
+            measure_name_cs=f"Opatření {i}",
+            measure_name_en=f"Measure {i}",
+            **fields,
+        )
+        for i in range(count)
+    ]
+
+
+def create_staff_user(username="staff"):
+    return User.objects.create_user(username, password="password", is_staff=True)
+
+
+def jpeg_upload(name="photo.jpg", size=(64, 48), color="green"):
+    buffer = io.BytesIO()
+    Image.new("RGB", size, color).save(buffer, "JPEG")
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type="image/jpeg")
+
+
+def jsonl_rows(response):
+    # Rows of a streamed JSON Lines export
+    return [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
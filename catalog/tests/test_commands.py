@@ -0,0 +1,72 @@
+import io
+import json
+import os
+import subprocess
+import sys
+from unittest import mock
+
+from django.conf import settings
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from catalog.management.commands.startup_profile import parse_importtime
+
+
+class BenchStackCommandTest(TestCase):
+    def test_defaults_request_the_prefixed_home_page(self):
+        """
+        Without --path the probes request a page answering 200, not the redirecting "/".
+        """
+        stats = {"startup_ms": 1, "first_request_ms": 1, "request_ms": 1, "max_rss_kb": 1024}
+        completed = mock.Mock(returncode=0, stdout=json.dumps(stats) + "\n", stderr="")
+        with mock.patch("subprocess.run", return_value=completed) as run:
+            output = io.StringIO()
+            call_command("bench_stack", stdout=output)
+
+        self.assertEqual(
+            [call.kwargs["env"]["DJANGO_SETTINGS_MODULE"] for call in run.call_args_list],
+            ["katalogdivlnad.settings", "katalogdivlnad.settings_public"],
+        )
+        paths = json.loads(run.call_args.args[0][3])
+        self.assertEqual(paths, [f"/{settings.LANGUAGE_CODE}/"])
+        self.assertIn("Benchmark finished.", output.getvalue())
+
+
+class StartupProfileTest(TestCase):
+    def test_import_times_are_summed_per_top_level_package(self):
+        output = "\n".join(
+            [
+                "import time: self [us] | cumulative | imported package",
+                "import time:       120 |        120 |   _io",
+                "import time:        30 |         30 |     pandas._libs",
+                "import time:      1000 |       1030 | pandas",
+                "unrelated stderr line",
+            ]
+        )
+        self.assertEqual(dict(parse_importtime(output)), {"_io": 120, "pandas": 1030})
+
+    def test_import_commands_load_spreadsheet_libraries_lazily(self):
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "import json, sys, django; django.setup(); "
+                "import catalog.management.commands.m4; "
+                "print(json.dumps([name for name in ('pandas', 'openpyxl') if name in sys.modules]))",
+            ],
+            cwd=settings.BASE_DIR,
+            env={**os.environ, "DJANGO_SETTINGS_MODULE": "katalogdivlnad.settings"},
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        self.assertEqual(json.loads(result.stdout), [])
+
+    def test_reports_entry_point(self):
+        output = io.StringIO()
+        call_command("startup_profile", "command:m4", top=2, stdout=output)
+        lines = output.getvalue().splitlines()
+        self.assertTrue(lines[0].startswith("command:m4: "))
+        self.assertEqual(len(lines), 3)
+        with self.assertRaisesMessage(CommandError, "Unknown entry point: nope"):
+            call_command("startup_profile", "nope", stdout=io.StringIO())
@@ -0,0 +1,46 @@
+from django.test import TestCase
+from django.urls import reverse
+from django.utils.translation import override
+
+from catalog.documents import rebuild_measure_documents
+
+from .fixtures import create_advantage, create_group, create_measures
+
+
+class MeasureCompareTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        advantage = create_advantage()
+        cls.measures = create_measures(create_group(), 5, price_czk_min=100)
+        for measure in cls.measures[1::2]:
+            measure.advantages.add(advantage)
+        rebuild_measure_documents()
+
+    def test_query_count_does_not_depend_on_measure_count(self):
+        with override("en"):
+            url = reverse("measure-compare-data")
+        for count in (2, 5):
+            ids = ",".join(str(measure.pk) for measure in self.measures[:count])
+            with self.assertNumQueries(1):
+                data = self.client.get(url, {"ids": ids}).json()
+            self.assertEqual(len(data["measures"]), count)
+
+        rows = {row["key"]: row for row in data["rows"]}
+        self.assertEqual(rows["advantages"]["cells"], [[], ["Advantage"], [], ["Advantage"], []])
+        self.assertTrue(rows["advantages"]["differs"])
+        self.assertEqual(rows["price_czk"]["cells"][0], ["100"])
+        self.assertFalse(rows["price_czk"]["differs"])
+
+    def test_page_highlights_differences_and_validates_ids(self):
+        ids = f"{self.measures[0].pk},{self.measures[1].pk}"
+        response = self.client.get(reverse("measure-compare"), {"ids": ids})
+        # The codes and the advantages differ
+        self.assertContains(response, 'class="differs"', count=2)
+        self.assertEqual(
+            self.client.get(reverse("measure-compare"), {"ids": self.measures[0].pk}).status_code,
+            400,
+        )
+        missing = f"{self.measures[0].pk},{self.measures[-1].pk + 1}"
+        self.assertEqual(
+            self.client.get(reverse("measure-compare"), {"ids": missing}).status_code, 404
+        )
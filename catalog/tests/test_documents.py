@@ -0,0 +1,141 @@
+from unittest import mock
+
+from django.db import connection
+from django.http import Http404
+from django.template import engines
+from django.test import AsyncRequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils.translation import override
+
+from catalog.documents import get_measure_document, get_measure_documents
+from catalog.models import Group, MeasureDocument
+from catalog.views import (
+    AsyncMeasureDetailView,
+    group_detail_context,
+    home_context,
+    measure_detail_context,
+)
+
+from .fixtures import acreate_measure, create_advantage, create_group, create_measure
+
+
+class MeasureDocumentTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.group = create_group()
+        cls.advantage = create_advantage()
+        with cls.captureOnCommitCallbacks(execute=True):
+            cls.measure = create_measure(cls.group)
+            cls.measure.advantages.add(cls.advantage)
+
+    def test_documents_are_built_per_language(self):
+        """
+        Saving a measure stores one resolved document per configured language.
+        """
+        self.assertEqual(MeasureDocument.objects.filter(measure=self.measure).count(), 2)
+        document = get_measure_document(self.measure.pk, "cs")
+        self.assertEqual(document["name"], "Opatření")
+        self.assertEqual(document["group"]["name"], "Skupina")
+        self.assertEqual(document["advantages"], ["Výhoda"])
+
+    def test_vocabulary_change_rebuilds_dependent_documents(self):
+        """
+        Renaming a related vocabulary entry refreshes the documents embedding it.
+        """
+        with self.captureOnCommitCallbacks(execute=True):
+            self.advantage.advantage_description_en = "Benefit"
+            self.advantage.save()
+        document = get_measure_document(self.measure.pk, "en")
+        self.assertEqual(document["advantages"], ["Benefit"])
+
+    def test_changes_of_one_transaction_are_refreshed_once(self):
+        """
+        The measures scheduled by the signals of one transaction are refreshed
+        together by the first callback run after the commit.
+        """
+        other = create_measure(self.group, "M2")
+        with mock.patch("catalog.signals.refresh_measure_pages") as refresh:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.measure.save()
+                self.measure.advantages.add(create_advantage("Jiná", "Other"))
+                self.measure.interconnection.add(other)
+        refresh.assert_called_once_with({self.measure.pk, other.pk})
+
+    def test_missing_document_is_served_as_built(self):
+        """
+        A document built on a miss is returned without being read back, which
+        could go to a replica lagging behind the write.
+        """
+        expected = get_measure_document(self.measure.pk, "cs")
+        for get in (
+            lambda: get_measure_document(self.measure.pk, "cs"),
+            lambda: get_measure_documents([self.measure.pk], "cs")[self.measure.pk],
+        ):
+            MeasureDocument.objects.all().delete()
+            with CaptureQueriesContext(connection) as queries:
+                self.assertEqual(get(), expected)
+            reads = [
+                query["sql"]
+                for query in queries
+                if query["sql"].startswith("SELECT") and "catalog_measuredocument" in query["sql"]
+            ]
+            self.assertEqual(len(reads), 1)
+
+
+class CatalogTemplateTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.group = create_group()
+        cls.measure = create_measure(cls.group)
+        cls.measure.advantages.add(create_advantage())
+
+    def test_engines_render_pages_without_queries(self):
+        """
+        The Django and Jinja2 templates render the same dictionaries without
+        touching the database.
+        """
+        with override("cs"):
+            pages = (
+                ("home.html", home_context()),
+                ("group_detail.html", group_detail_context(self.group.pk)),
+                ("measure_detail.html", measure_detail_context(self.measure.pk)),
+            )
+            for template_name, context in pages:
+                for alias in ("django", "jinja2"):
+                    with self.subTest(template=template_name, engine=alias):
+                        with self.assertNumQueries(0):
+                            html = engines[alias].get_template(template_name).render(context)
+                        self.assertIn("Opatření", html)
+            self.assertIn("Výhoda", html)
+
+    def test_detail_view_serves_stored_document(self):
+        with override("cs"):
+            response = self.client.get(reverse("measure-detail", args=[self.measure.pk]))
+        self.assertContains(response, "Výhoda")
+        self.assertNotIn("view", response.context)
+        missing = self.client.get(reverse("measure-detail", args=[self.measure.pk + 1]))
+        self.assertEqual(missing.status_code, 404)
+
+
+class AsyncMeasureDetailViewTest(TestCase):
+    async def test_renders_from_stored_document(self):
+        """
+        The async detail view renders the precomputed document, so rendering in
+        the event loop never falls back to a lazy query.
+        """
+        group = await Group.objects.acreate(group_name_cs="Skupina", group_name_en="Group")
+        measure = await acreate_measure(group)
+        linked = await acreate_measure(
+            group, "M2", measure_name_cs="Navazující", measure_name_en="Linked"
+        )
+        await measure.interconnection.aadd(linked)
+
+        request = AsyncRequestFactory().get(f"/measure/{measure.pk}/")
+        with override("cs"):
+            response = await AsyncMeasureDetailView.as_view()(request, pk=measure.pk)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Navazující (Skupina)")
+
+        with self.assertRaises(Http404):
+            await AsyncMeasureDetailView.as_view()(request, pk=linked.pk + 1)
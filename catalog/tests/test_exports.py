@@ -0,0 +1,64 @@
+from django.test import TestCase
+from django.urls import reverse
+from django.utils.translation import override
+
+from catalog.exports import LAYOUTS, iter_csv
+
+from .fixtures import (
+    create_advantage,
+    create_group,
+    create_measure,
+    create_staff_user,
+    jsonl_rows,
+)
+
+
+class CatalogExportTest(TestCase):
+    def test_m4_layout_lists_related_ids(self):
+        """
+        The `m4` layout writes comma-separated M2M IDs in the importer's column order.
+        """
+        measure = create_measure(create_group())
+        advantages = [create_advantage(f"Výhoda {i}", f"Advantage {i}") for i in range(2)]
+        measure.advantages.set(advantages)
+
+        lines = list(iter_csv(LAYOUTS["m4"].columns, LAYOUTS["m4"].rows()))
+        self.assertEqual(
+            lines[0].strip(),
+            "id,advantages,disadvantages,env_secondary,interconnection,conflict,other_impacts_details,sdg",
+        )
+        expected_ids = ",".join(str(a.pk) for a in advantages)
+        self.assertEqual(lines[1].strip(), f'{measure.pk},"{expected_ids}",,,,,,')
+
+
+class MeasureExportViewTest(TestCase):
+    def setUp(self):
+        self.client.force_login(create_staff_user())
+
+    def test_export_is_staff_only(self):
+        with override("en"):
+            url = reverse("measure-export", args=["csv"])
+        self.assertEqual(self.client.get(url).status_code, 200)
+        self.client.logout()
+        response = self.client.get(url)
+        self.assertRedirects(
+            response, f"{reverse('admin:login')}?next={url}", fetch_redirect_response=False
+        )
+
+    def test_streams_filtered_localized_rows(self):
+        """
+        The export endpoint streams only measures matching the facet filters.
+        """
+        groups = [create_group(f"Skupina {i}", f"Group {i}") for i in range(2)]
+        for i, group in enumerate(groups):
+            create_measure(
+                group, f"M{i}", measure_name_cs=f"Opatření {i}", measure_name_en=f"Measure {i}"
+            )
+
+        with override("en"):
+            url = reverse("measure-export", args=["jsonl"])
+        response = self.client.get(url, {"group": groups[1].pk})
+        self.assertTrue(response.streaming)
+        rows = jsonl_rows(response)
+        self.assertEqual([row["name"] for row in rows], ["Measure 1"])
+        self.assertEqual(rows[0]["group"], "Group 1")
@@ -0,0 +1,67 @@
+import io
+import shutil
+import tempfile
+
+from PIL import Image
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+
+from .fixtures import create_group, create_measure, jpeg_upload
+
+
+class ImageUploadNormalizationTest(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        self.enterContext(override_settings(MEDIA_ROOT=media_root, CATALOG_IMAGE_MAX_DIMENSION=100))
+        self.group = create_group()
+
+    def create_measure(self, code, image):
+        return create_measure(self.group, code, title_image=image)
+
+    def test_upload_is_rotated_downscaled_and_stripped(self):
+        """
+        Originals are re-encoded upright, within the size limit and without EXIF.
+        """
+        buffer = io.BytesIO()
+        exif = Image.Exif()
+        exif[0x0112] = 6  # Orientation: rotate 90° clockwise
+        Image.new("RGB", (400, 200), "red").save(buffer, "JPEG", exif=exif)
+        upload = SimpleUploadedFile("phone.jpg", buffer.getvalue(), content_type="image/jpeg")
+
+        measure = self.create_measure("M1", upload)
+        with Image.open(measure.title_image.path) as stored:
+            self.assertEqual(stored.size, (50, 100))
+            self.assertNotIn(0x0112, stored.getexif())
+
+    def test_color_profile_is_kept_only_for_unconverted_pixels(self):
+        """
+        A CMYK upload is stored as an RGB JPEG without its CMYK profile.
+        """
+        from PIL import ImageCms
+
+        profile = ImageCms.ImageCmsProfile(ImageCms.createProfile("sRGB")).tobytes()
+        uploads = {}
+        for mode, color in (("CMYK", (0, 255, 255, 0)), ("RGB", "red")):
+            buffer = io.BytesIO()
+            Image.new(mode, (40, 20), color).save(buffer, "JPEG", icc_profile=profile)
+            uploads[mode] = SimpleUploadedFile(
+                f"{mode}.jpg", buffer.getvalue(), content_type="image/jpeg"
+            )
+
+        cmyk = self.create_measure("M1", uploads["CMYK"])
+        with Image.open(cmyk.title_image.path) as stored:
+            self.assertEqual(stored.mode, "RGB")
+            self.assertIsNone(stored.info.get("icc_profile"))
+        rgb = self.create_measure("M2", uploads["RGB"])
+        with Image.open(rgb.title_image.path) as stored:
+            self.assertEqual(stored.info.get("icc_profile"), profile)
+
+    def test_identical_uploads_share_one_file(self):
+        """
+        The same photo uploaded for two measures is stored once.
+        """
+        first = self.create_measure("M1", jpeg_upload("a.jpg"))
+        second = self.create_measure("M2", jpeg_upload("b.jpg"))
+        self.assertEqual(first.title_image.name, second.title_image.name)
+        self.assertTrue(first.title_image.name.startswith("images/sha256/"))
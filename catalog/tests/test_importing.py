@@ -0,0 +1,193 @@
+import io
+import json
+import shutil
+import tempfile
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.db import IntegrityError
+from django.test import TestCase
+from django.urls import reverse
+
+from catalog.exports import LAYOUTS
+from catalog.importing import ImportCommand
+from catalog.models import Group, Measure
+from catalog.search import suggestion_index
+
+from .fixtures import create_advantage, create_group, create_measure, create_measures
+
+
+class CatalogImportTest(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+
+    def write_sheet(self, name, rows):
+        import pandas as pd
+
+        path = f"{self.directory}/{name}"
+        pd.DataFrame(rows).to_excel(path, index=False)
+        return path
+
+    def test_imports_files_matching_glob_in_parallel(self):
+        Group.objects.create(id=1, group_name_cs="Stará", group_name_en="Old")
+        self.write_sheet("groups-1.xlsx", [{"id": 1, "cs": "Skupina", "en": "Group"}])
+        self.write_sheet(
+            "groups-2.xlsx",
+            [{"id": 2, "cs": "Druhá", "en": "Second"}, {"id": 3, "cs": None, "en": "Third"}],
+        )
+        output = io.StringIO()
+        call_command(
+            "import_groups", f"{self.directory}/groups-*.xlsx", processes=2, stdout=output
+        )
+        self.assertEqual(
+            dict(Group.objects.values_list("pk", "group_name_cs")), {1: "Skupina", 2: "Druhá"}
+        )
+        self.assertIn("1 created, 1 updated, 0 unchanged, 1 skipped", output.getvalue())
+        # Bulk writes maintain the normalized search column as well
+        self.assertEqual(Group.objects.get(pk=2).search_text, "druha\nsecond")
+
+    def test_unchanged_rows_are_not_rebuilt(self):
+        """
+        Rows equal to the stored ones are reported apart and keep the documents
+        of their measures.
+        """
+        group = create_group("Stará", "Old")
+        create_measure(group)
+        path = self.write_sheet(
+            "groups.xlsx",
+            [
+                {"id": group.pk, "cs": "Stará", "en": "Old"},
+                {"id": group.pk + 1, "cs": "Nová", "en": "New"},
+            ],
+        )
+        output = io.StringIO()
+        with mock.patch("catalog.signals.refresh_measure_pages") as refresh:
+            with self.captureOnCommitCallbacks(execute=True):
+                call_command("import_groups", path, processes=0, stdout=output)
+        self.assertIn("1 created, 0 updated, 1 unchanged, 0 skipped", output.getvalue())
+        refresh.assert_not_called()
+
+    def test_failing_file_is_rolled_back(self):
+        """
+        Each file is written in its own transaction; a failure keeps the other files.
+        """
+        good = self.write_sheet("good.xlsx", [{"id": 1, "cs": "Skupina", "en": "Group"}])
+        bad = self.write_sheet(
+            "bad.xlsx",
+            [{"id": 2, "cs": "Druhá", "en": "Second"}, {"id": 3, "cs": "Třetí", "en": "Third"}],
+        )
+        write_batch = ImportCommand.write_batch
+
+        def failing_write_batch(command, path, records, counts):
+            written = write_batch(command, path, records, counts)
+            if path == bad:
+                raise IntegrityError("simulated failure")
+            return written
+
+        with mock.patch.object(ImportCommand, "write_batch", failing_write_batch):
+            with self.assertRaises(CommandError):
+                call_command(
+                    "import_groups", good, bad, processes=0, stdout=io.StringIO(), stderr=io.StringIO()
+                )
+        self.assertEqual(list(Group.objects.values_list("pk", flat=True)), [1])
+
+    def test_validate_reports_issues_without_writing(self):
+        Group.objects.create(id=1, group_name_cs="Stará", group_name_en="Old")
+        path = self.write_sheet(
+            "groups.xlsx",
+            [
+                {"id": 2, "cs": "Stará", "en": "Second"},
+                {"id": 3, "cs": "Stejná", "en": "Stejná"},
+                {"id": 4, "cs": "X" * 61, "en": "Long"},
+                {"id": 5, "cs": "Pátá", "en": "Fifth"},
+            ],
+        )
+        output = io.StringIO()
+        with self.assertNumQueries(3), self.assertRaises(CommandError):
+            call_command(
+                "import_groups", path, validate=True, processes=0, stdout=output, stderr=io.StringIO()
+            )
+        report = json.loads(output.getvalue())
+        self.assertEqual(report["summary"]["valid_rows"], 1)
+        self.assertEqual(
+            [(issue["row"], issue["check"]) for issue in report["files"][0]["issues"]],
+            [(2, "unique"), (3, "translation"), (4, "max_length")],
+        )
+        self.assertEqual(list(Group.objects.values_list("pk", flat=True)), [1])
+
+    def test_m4_replaces_relations_listed_in_cells(self):
+        measures = create_measures(create_group(), 3)
+        advantages = [create_advantage(f"Výhoda {i}", f"Advantage {i}") for i in range(3)]
+        measures[0].advantages.set([advantages[2]])
+        measures[1].advantages.set([advantages[0]])
+        blank = dict.fromkeys(LAYOUTS["m4"].columns)
+        path = self.write_sheet(
+            "m4.xlsx",
+            [
+                {
+                    **blank,
+                    "id": measures[0].pk,
+                    "advantages": f"{advantages[0].pk}, {advantages[1].pk}",
+                    "interconnection": measures[2].pk,
+                },
+                # Empty cells keep the stored relation
+                {**blank, "id": measures[1].pk},
+                {**blank, "id": measures[2].pk, "advantages": f"{advantages[0].pk},999"},
+            ],
+        )
+        output = io.StringIO()
+        call_command("m4", path, processes=0, stdout=output)
+
+        self.assertEqual(set(measures[0].advantages.all()), {advantages[0], advantages[1]})
+        self.assertEqual(list(measures[1].advantages.all()), [advantages[0]])
+        # The row with an unknown id is skipped as a whole
+        self.assertEqual(list(measures[2].advantages.all()), [])
+        self.assertEqual(list(measures[2].interconnection.all()), [measures[0]])
+        self.assertIn("advantages 999 do not exist", output.getvalue())
+
+    def test_import_measures_joins_sheets_on_id(self):
+        import pandas as pd
+
+        group = create_group()
+        advantage = create_advantage()
+        measure = create_measure(group, abstract_cs="Souhrn")
+        path = f"{self.directory}/measures.xlsx"
+        with pd.ExcelWriter(path) as writer:
+            pd.DataFrame(
+                [
+                    {"id": measure.pk, "group_id": None, "measure_name_en": "Renamed", "code": None},
+                    {"id": measure.pk + 1, "group_id": group.pk, "measure_name_en": "New", "code": "M2"},
+                ]
+            ).to_excel(writer, sheet_name="core", index=False)
+            pd.DataFrame(
+                [{"id": measure.pk, "abstract_en": "Abstract", "advantages": str(advantage.pk)}]
+            ).to_excel(writer, sheet_name="text", index=False)
+
+        # Id sets loaded once per target table, then one read and one write per step
+        with self.assertNumQueries(14):
+            call_command("import_measures", path, processes=0, stdout=io.StringIO())
+
+        measure.refresh_from_db()
+        self.assertEqual(
+            (measure.measure_name_en, measure.code, measure.abstract_cs, measure.abstract_en),
+            ("Renamed", "M1", "Souhrn", "Abstract"),
+        )
+        self.assertEqual(list(measure.advantages.all()), [advantage])
+        # The new row lacks names, so it is rejected rather than created half-empty
+        self.assertFalse(Measure.objects.filter(pk=measure.pk + 1).exists())
+
+    def test_imported_names_are_suggested(self):
+        measure = create_measure(create_group())
+        suggestion_index.clear()
+        self.addCleanup(suggestion_index.clear)
+        url = reverse("search-suggest")
+        self.assertEqual(self.client.get(url, {"q": "rain"}).json()["suggestions"], [])
+
+        path = self.write_sheet(
+            "measures.xlsx", [{"id": measure.pk, "measure_name_en": "Rain gardens"}]
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command("import_measures", path, processes=0, stdout=io.StringIO())
+        suggestions = self.client.get(url, {"q": "rain"}).json()["suggestions"]
+        self.assertEqual([item["id"] for item in suggestions], [measure.pk])
@@ -0,0 +1,103 @@
+import io
+import json
+import os
+import subprocess
+import sys
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+
+from catalog.instrumentation import database_pool_stats
+
+from .fixtures import create_staff_user
+
+
+class DatabasePoolStatsTest(TestCase):
+    def test_unpooled_alias_reports_conn_max_age(self):
+        self.assertEqual(
+            database_pool_stats(),
+            {"default": {"pooled": False, "conn_max_age": connection.settings_dict["CONN_MAX_AGE"]}},
+        )
+
+    def test_pool_metrics_are_mapped(self):
+        pool = mock.Mock()
+        pool.get_stats.return_value = {
+            "pool_min": 2,
+            "pool_max": 10,
+            "pool_size": 4,
+            "pool_available": 1,
+            "requests_num": 8,
+            "requests_waiting": 2,
+            "requests_wait_ms": 40,
+            "requests_errors": 1,
+            "connections_num": 5,
+        }
+        with mock.patch.object(connection, "pool", pool, create=True):
+            stats = database_pool_stats()["default"]
+        self.assertEqual(
+            {key: stats[key] for key in ("pooled", "size", "in_use", "idle", "waiting")},
+            {"pooled": True, "size": 4, "in_use": 3, "idle": 1, "waiting": 2},
+        )
+        self.assertEqual((stats["wait_ms_avg"], stats["timeouts"]), (5.0, 1))
+        self.assertEqual((stats["requests_queued"], stats["connections_lost"]), (0, 0))
+
+    def test_view_is_staff_only(self):
+        url = reverse("db-pool-stats")
+        self.assertEqual(self.client.get(url).status_code, 302)
+        self.client.force_login(User.objects.create_user("user", password="password"))
+        self.assertEqual(self.client.get(url).status_code, 302)
+
+        self.client.force_login(create_staff_user())
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.json()["default"]["pooled"])
+
+    def database_settings(self, **environ):
+        # The test runner replaces DATABASES, so the settings are read in a fresh interpreter
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "import json; from katalogdivlnad import settings; "
+                "print(json.dumps(settings.DATABASES['default'], default=repr))",
+            ],
+            cwd=settings.BASE_DIR,
+            env={**os.environ, **environ},
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        return json.loads(result.stdout)
+
+    def test_connection_settings_are_parsed(self):
+        database = self.database_settings(
+            DATABASE_POOL="False", DATABASE_CONN_MAX_AGE="60", DATABASE_CONN_HEALTH_CHECKS="False"
+        )
+        self.assertEqual((database["CONN_MAX_AGE"], database["CONN_HEALTH_CHECKS"]), (60, False))
+        self.assertNotIn("pool", database["OPTIONS"])
+
+        database = self.database_settings(
+            DATABASE_POOL="True", DATABASE_CONN_MAX_AGE="60", DATABASE_POOL_MAX_SIZE="4"
+        )
+        # Pooled connections are returned after each request instead of persisting
+        self.assertEqual(database["CONN_MAX_AGE"], 0)
+        pool = database["OPTIONS"]["pool"]
+        self.assertEqual(
+            {key: pool[key] for key in ("min_size", "max_size", "timeout")},
+            {"min_size": 2, "max_size": 4, "timeout": 10.0},
+        )
+        self.assertIn("check_connection", pool["check"])
+
+
+class BenchDbConnectionsCommandTest(TestCase):
+    def test_reports_timings_and_rejects_empty_runs(self):
+        output = io.StringIO()
+        call_command("bench_db_connections", requests=3, stdout=output)
+        self.assertIn("3 requests on 'default'", output.getvalue())
+        with self.assertRaisesMessage(CommandError, "--requests must be at least 1."):
+            call_command("bench_db_connections", requests=0, stdout=io.StringIO())
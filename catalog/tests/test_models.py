@@ -1,6 +1,6 @@
 # test_models.py
 from django.core.exceptions import ValidationError
-from django.utils.translation import activate
+from django.utils.translation import activate, deactivate
 from django.test import TestCase
 from catalog.models import Group
 from django.utils.translation import override
@@ -11,6 +11,8 @@ class GroupModelTest(TestCase):
         Test __str__ method for a Group model.
         """
         group = Group.objects.create(group_name_cs="Skupina CZ", group_name_en="Group EN")
+        # URLs of later tests are reversed in the active language
+        self.addCleanup(deactivate)
 
         # Test for the Czech language
         activate("cs")
@@ -45,5 +47,3 @@ class GroupModelCleanTest(TestCase):
             with self.assertRaises(ValidationError) as context:
                 group.clean()
             self.assertIn("The Czech and English group name must be different", str(context.exception))
-
-
@@ -0,0 +1,52 @@
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils.translation import override
+
+from catalog.models import Measure
+
+from .fixtures import create_group, create_measure, create_staff_user, jsonl_rows
+
+
+class PriceRangeFilterTest(TestCase):
+    @override_settings(CATALOG_CZK_PER_EUR=25)
+    def test_price_range_overlaps_normalized_prices(self):
+        group = create_group()
+        prices = {
+            "M1": {"price_czk_min": 2500, "price_czk_max": 10000},
+            "M2": {"price_eu_min": 500},
+            "M3": {},
+        }
+        for code, price in prices.items():
+            create_measure(group, code, measure_name_cs=code, measure_name_en=code, **price)
+        self.assertEqual(
+            list(Measure.objects.order_by("code").values_list("price_eur_min", "price_eur_max")),
+            [(100, 400), (500, 500), (None, None)],
+        )
+
+        self.client.force_login(create_staff_user())
+
+        def codes(params):
+            response = self.client.get(reverse("measure-export", args=["jsonl"]), params)
+            return sorted(row["code"] for row in jsonl_rows(response))
+
+        self.assertEqual(codes({"price_max": 200}), ["M1"])
+        self.assertEqual(codes({"price_min": 300, "price_max": 600}), ["M1", "M2"])
+        self.assertEqual(codes({"price_min": 12000, "currency": "czk"}), ["M2"])
+        self.assertEqual(codes({"price_min": "abc"}), ["M1", "M2", "M3"])
+
+    def test_public_lists_filter_by_price(self):
+        """
+        The home and group pages narrow their measures down to the price range
+        of the query string and keep it in the form.
+        """
+        group = create_group()
+        create_measure(group, "M1", measure_name_cs="Levné", price_eu_min=100)
+        create_measure(group, "M2", measure_name_cs="Drahé", price_eu_min=1000)
+        with override("cs"):
+            urls = [reverse("home"), reverse("group-detail", args=[group.pk])]
+        for url in urls:
+            with self.subTest(url=url):
+                response = self.client.get(url, {"price_max": 500})
+                self.assertContains(response, "Levné")
+                self.assertNotContains(response, "Drahé")
+                self.assertContains(response, 'name="price_max" min="0" value="500"')
@@ -0,0 +1,140 @@
+import io
+import shutil
+import tempfile
+from unittest import mock
+
+from django.core.files.storage import FileSystemStorage
+from django.core.management import call_command
+from django.db import IntegrityError, transaction
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils.translation import override
+
+from catalog.documents import get_measure_document, rebuild_measure_documents
+from catalog.models import MeasureImage, Rendition, RenditionJob
+from catalog.renditions import complete_job, manifest, retry_jobs
+
+from .fixtures import create_group, create_measure, jpeg_upload
+
+
+class RenditionQueueTest(TestCase):
+    def setUp(self):
+        self.addCleanup(manifest.clear)
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        self.enterContext(override_settings(MEDIA_ROOT=media_root))
+        self.measure = create_measure(create_group())
+
+    def create_image(self):
+        # Jobs are queued once the upload is committed
+        with self.captureOnCommitCallbacks(execute=True):
+            return MeasureImage.objects.create(
+                measure=self.measure,
+                original_image=jpeg_upload(),
+                caption_cs="Popisek",
+                caption_en="Caption",
+                author="Autor",
+                license="CC BY",
+            )
+
+    def test_upload_is_queued_and_rendered_by_worker(self):
+        """
+        Saving a gallery image only queues a job; the worker generates the rendition.
+        """
+        image = self.create_image()
+        job = RenditionJob.objects.get(source="measureimage.original_image", object_id=image.pk)
+        self.assertEqual(job.status, RenditionJob.PENDING)
+
+        call_command("run_image_worker", processes=0, once=True, stdout=io.StringIO())
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, RenditionJob.DONE)
+        image.refresh_from_db()
+        rendition = image.processed_image
+        self.assertTrue(rendition.storage.exists(rendition.name))
+        # Dimensions and placeholder let the page reserve space before the image loads
+        self.assertEqual((image.width, image.height), (rendition.width, rendition.height))
+        self.assertTrue(image.placeholder.startswith("data:image/jpeg;base64,"))
+        gallery = get_measure_document(self.measure.pk, "cs")["gallery"]
+        self.assertEqual(gallery[0]["width"], image.width)
+
+    def test_rendered_url_resolves_from_manifest(self):
+        """
+        Once the worker recorded a rendition, resolving its URL does not touch the storage.
+        """
+        image = self.create_image()
+        call_command("run_image_worker", processes=0, once=True, stdout=io.StringIO())
+        rendition = MeasureImage.objects.get(pk=image.pk).processed_image
+        self.assertTrue(Rendition.objects.filter(name=rendition.name).exists())
+
+        manifest.clear()
+        images = [MeasureImage.objects.get(pk=image.pk) for _ in range(2)]
+        with mock.patch.object(FileSystemStorage, "exists", side_effect=AssertionError):
+            # The manifest is loaded once, further lookups stay in memory
+            with self.assertNumQueries(1):
+                urls = {image.processed_image.url for image in images}
+        self.assertEqual(urls, {rendition.url})
+
+    def test_pages_link_pending_renditions_without_generating_them(self):
+        """
+        Pages link the rendition names of images not rendered yet; neither
+        building the documents nor rendering checks or generates the files.
+        """
+        from imagekit.cachefiles import ImageCacheFile
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.measure.title_image = jpeg_upload("title.jpg")
+            self.measure.save()
+        image = self.create_image()
+        with mock.patch.object(FileSystemStorage, "exists", side_effect=AssertionError), \
+                mock.patch.object(ImageCacheFile, "generate", side_effect=AssertionError):
+            rebuild_measure_documents([self.measure.pk])
+            with override("cs"):
+                pages = [
+                    reverse("home"),
+                    reverse("group-detail", args=[self.measure.group_id]),
+                    reverse("measure-detail", args=[self.measure.pk]),
+                ]
+            for url, rendition in zip(
+                pages,
+                [self.measure.processed_title_image] * 2 + [image.processed_image],
+            ):
+                with self.subTest(url=url):
+                    src = rendition.storage.url(rendition.name)
+                    self.assertContains(self.client.get(url), f'src="{src}"')
+        self.assertEqual(RenditionJob.objects.filter(status=RenditionJob.PENDING).count(), 2)
+
+    def test_job_is_queued_after_commit_once_per_image(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.measure.title_image = jpeg_upload("title.jpg")
+            self.measure.save()
+        jobs = RenditionJob.objects.filter(source="measure.title_image", object_id=self.measure.pk)
+        self.assertFalse(jobs.exists())
+        for callback in callbacks:
+            callback()
+        job = jobs.get()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.measure.title_image = jpeg_upload("other.jpg", color="blue")
+            self.measure.save()
+        self.assertEqual(jobs.count(), 1)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            RenditionJob.objects.create(source=job.source, object_id=job.object_id)
+
+        # A failed attempt is not retried while the image has a newer pending job
+        running = RenditionJob.objects.create(
+            source=job.source, object_id=job.object_id, status=RenditionJob.RUNNING, attempts=1
+        )
+        self.assertEqual(complete_job(running.pk, "error").status, RenditionJob.DONE)
+        self.assertEqual(retry_jobs(RenditionJob.objects.filter(pk=running.pk)), 0)
+        self.assertEqual(jobs.filter(status=RenditionJob.PENDING).get(), job)
+
+    def test_failing_job_is_dead_lettered(self):
+        """
+        A job failing on every attempt ends up dead with its last error recorded.
+        """
+        job = RenditionJob.objects.create(source="unknown.field", object_id=1, max_attempts=1)
+        call_command("run_image_worker", processes=0, once=True, stdout=io.StringIO(), stderr=io.StringIO())
+        job.refresh_from_db()
+        self.assertEqual(job.status, RenditionJob.DEAD)
+        self.assertIn("KeyError", job.last_error)
@@ -0,0 +1,52 @@
+from django.conf import settings
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+
+from catalog.middleware import ReplicaRoutingMiddleware
+from catalog.models import Measure
+from catalog.routers import ReplicaRouter, replica_reads
+
+from .fixtures import create_group
+
+
+@override_settings(DATABASE_REPLICAS=["replica_1"])
+class ReplicaRoutingTest(TestCase):
+    def setUp(self):
+        self.router = ReplicaRouter()
+        self.factory = RequestFactory()
+
+    def routed_read(self, request):
+        # Runs the middleware around a view reporting where a read would go
+        middleware = ReplicaRoutingMiddleware(
+            lambda request: HttpResponse(self.router.db_for_read(Measure))
+        )
+        return middleware(request)
+
+    def test_reads_use_primary_outside_public_requests(self):
+        """
+        Management commands and other code outside requests read from the primary.
+        """
+        self.assertEqual(self.router.db_for_read(Measure), "default")
+        with replica_reads():
+            self.assertEqual(self.router.db_for_read(Measure), "replica_1")
+            self.assertEqual(self.router.db_for_write(Measure), "default")
+
+    def test_public_reads_go_to_replicas_until_a_write(self):
+        """
+        Anonymous GETs read from a replica, admin paths and pinned clients from the primary.
+        """
+        self.assertEqual(self.routed_read(self.factory.get("/")).content, b"replica_1")
+        self.assertEqual(self.routed_read(self.factory.get("/admin/")).content, b"default")
+
+        # A POST pins the client only once it has written something
+        response = self.routed_read(self.factory.post("/i18n/setlang/"))
+        self.assertNotIn(settings.REPLICA_STICKY_COOKIE, response.cookies)
+        middleware = ReplicaRoutingMiddleware(
+            lambda request: HttpResponse(create_group().pk)
+        )
+        response = middleware(self.factory.post("/admin/catalog/group/add/"))
+        self.assertIn(settings.REPLICA_STICKY_COOKIE, response.cookies)
+
+        pinned = self.factory.get("/")
+        pinned.COOKIES[settings.REPLICA_STICKY_COOKIE] = "1"
+        self.assertEqual(self.routed_read(pinned).content, b"default")
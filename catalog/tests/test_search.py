@@ -0,0 +1,77 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from catalog.models import Measure
+from catalog.search import SuggestionIndex, suggestion_index
+
+from .fixtures import create_group, create_measure, create_staff_user, jsonl_rows
+
+
+class MeasureSearchTest(TestCase):
+    def test_search_query_matches_without_accents(self):
+        group = create_group()
+        for code, name in (("M1", "Zelené střechy"), ("M2", "Tůně")):
+            create_measure(group, code, measure_name_cs=name, measure_name_en=code)
+        self.assertEqual(
+            Measure.objects.get(code="M1").search_text,
+            "m1\nzelene strechy\nm1\npopis\ndescription",
+        )
+
+        self.client.force_login(create_staff_user())
+        response = self.client.get(reverse("measure-export", args=["jsonl"]), {"q": "STRECH zel"})
+        self.assertEqual([row["code"] for row in jsonl_rows(response)], ["M1"])
+
+        admin = User.objects.create_superuser("admin", "admin@example.com", "password")
+        self.client.force_login(admin)
+        response = self.client.get(reverse("admin:catalog_measure_changelist"), {"q": "tune"})
+        self.assertEqual([measure.code for measure in response.context["cl"].result_list], ["M2"])
+
+
+class SearchSuggestTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.group = create_group("Zeleň", "Greenery")
+        cls.measure = create_measure(
+            cls.group, "GR1", measure_name_cs="Zelené střechy", measure_name_en="Green roofs"
+        )
+
+    def setUp(self):
+        suggestion_index.clear()
+        self.addCleanup(suggestion_index.clear)
+
+    def test_prefix_matching_ignores_accents_and_case(self):
+        response = self.client.get(reverse("search-suggest"), {"q": "STRECH"})
+        self.assertEqual(
+            response.json()["suggestions"],
+            [
+                {
+                    "kind": "measure",
+                    "id": self.measure.pk,
+                    "label": "Zelené střechy",
+                    "url": reverse("measure-detail", args=[self.measure.pk]),
+                }
+            ],
+        )
+        labels = [item["label"] for item in suggestion_index.search("zele")]
+        self.assertEqual(labels, ["Zeleň", "Zelené střechy"])
+
+    def test_lookups_do_not_query_and_changes_rebuild_the_index(self):
+        suggestion_index.get()
+        with self.assertNumQueries(0):
+            self.assertEqual(suggestion_index.search("gr1")[0]["id"], self.measure.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.group.group_name_en = "Parks"
+            self.group.save()
+        self.assertEqual([item["kind"] for item in suggestion_index.search("park")], ["group"])
+
+    def test_changes_rebuild_the_indexes_of_other_processes(self):
+        # An index whose process shares the cache, but not the signal handlers
+        other = SuggestionIndex()
+        self.assertEqual(other.search("park"), [])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.group.group_name_en = "Parks"
+            self.group.save()
+        self.assertEqual([item["kind"] for item in other.search("park")], ["group"])
+        with self.assertNumQueries(0):
+            other.search("park")
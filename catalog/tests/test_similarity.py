@@ -0,0 +1,48 @@
+import io
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils.translation import override
+
+from catalog.documents import rebuild_measure_documents
+from catalog.models import SimilarMeasure
+from catalog.views import measure_detail_context
+
+from .fixtures import create_group, create_measure
+
+
+class SimilarMeasureTest(TestCase):
+    def test_computed_neighbours_are_shown_on_detail_page(self):
+        group = create_group()
+        texts = [
+            ("Tůně zadržují vodu v krajině", "Pools retain water in the landscape"),
+            ("Mokřady zadržují vodu v krajině", "Wetlands retain water in the landscape"),
+            ("Remízky chrání půdu před erozí", "Hedgerows protect soil from erosion"),
+            ("Meze chrání půdu před erozí", "Balks protect soil from erosion"),
+        ]
+        measures = [
+            create_measure(
+                group,
+                f"M{i}",
+                measure_name_cs=f"Opatření {i}",
+                measure_name_en=f"Measure {i}",
+                description_cs=cs,
+                description_en=en,
+            )
+            for i, (cs, en) in enumerate(texts)
+        ]
+        with override("cs"):
+            rebuild_measure_documents()
+        call_command("compute_similar_measures", top=1, stdout=io.StringIO())
+
+        pairs = dict(SimilarMeasure.objects.values_list("measure_id", "similar_id"))
+        self.assertEqual(pairs[measures[0].pk], measures[1].pk)
+        self.assertEqual(pairs[measures[2].pk], measures[3].pk)
+
+        # The stored document, then one query for the similar measures
+        with self.assertNumQueries(2):
+            context = measure_detail_context(measures[0].pk)
+        self.assertEqual([item["id"] for item in context["similar"]], [measures[1].pk])
+        response = self.client.get(reverse("measure-detail", args=[measures[0].pk]))
+        self.assertContains(response, reverse("measure-detail", args=[measures[1].pk]))
@@ -0,0 +1,42 @@
+from datetime import datetime, timezone
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from catalog.models import Measure
+
+from .fixtures import create_advantage, create_group, create_measures
+
+
+class SitemapTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.advantage = create_advantage()
+        cls.measures = create_measures(create_group(), 3)
+        Measure.objects.update(updated_at=datetime(2024, 1, 1, tzinfo=timezone.utc))
+
+    def test_relation_changes_bump_lastmod(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.measures[0].advantages.add(self.advantage)
+        self.assertEqual(
+            Measure.objects.filter(updated_at__year=2024).count(), len(self.measures) - 1
+        )
+
+    @override_settings(CATALOG_SITEMAP_LIMIT=4)
+    def test_sitemaps_are_split_and_cached_until_the_catalog_changes(self):
+        index = self.client.get(reverse("sitemap")).content.decode()
+        self.assertIn("/sitemap-measures.xml?p=2</loc>", index)
+        self.assertNotIn("/sitemap-measures.xml?p=3</loc>", index)
+
+        url = reverse("sitemap-section", args=["measures"])
+        content = self.client.get(url).content.decode()
+        self.assertEqual(content.count("<lastmod>2024-01-01</lastmod>"), 4)
+        self.assertIn('hreflang="en"', content)
+        # Served from the cache, the catalog version costs one query per table
+        with self.assertNumQueries(2):
+            self.assertEqual(self.client.get(url).content.decode(), content)
+
+        self.measures[0].save()
+        content = self.client.get(url).content.decode()
+        # The first page lists two measures, in two languages each
+        self.assertEqual(content.count("<lastmod>2024-01-01</lastmod>"), 2)
@@ -0,0 +1,49 @@
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from catalog.documents import get_measure_document, rebuild_measure_documents
+from catalog.exports import iter_localized_measure_rows, localized_measure_queryset
+from catalog.models import MeasureTranslation
+
+from .fixtures import create_group, create_measure
+
+
+class TranslationStorageTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        with cls.captureOnCommitCallbacks(execute=True):
+            cls.measure = create_measure(create_group(), abstract_en="Abstract")
+
+    def test_rows_are_written_from_the_columns(self):
+        rows = dict(
+            MeasureTranslation.objects.filter(measure=self.measure).values_list(
+                "language", "abstract"
+            )
+        )
+        # The Czech row holds the English fallback of the columns mode
+        self.assertEqual(rows, {"cs": "Abstract", "en": "Abstract"})
+
+    def test_table_mode_reads_one_language(self):
+        queryset = localized_measure_queryset()
+        expected = list(iter_localized_measure_rows(queryset, "cs", storage="columns"))
+        with CaptureQueriesContext(connection) as queries:
+            rows = list(iter_localized_measure_rows(queryset, "cs", storage="table"))
+        self.assertEqual(rows, expected)
+        measure_query = next(
+            query["sql"] for query in queries if 'FROM "catalog_measure"' in query["sql"]
+        )
+        self.assertNotIn('"catalog_measure"."description_en"', measure_query)
+
+    @override_settings(
+        CATALOG_TRANSLATION_STORAGE="table",
+        LANGUAGES=[("cs", "Czech"), ("en", "English"), ("de", "German")],
+    )
+    def test_added_language_needs_only_translation_rows(self):
+        MeasureTranslation.objects.create(
+            measure=self.measure, language="de", measure_name="Maßnahme", description="Text"
+        )
+        rebuild_measure_documents([self.measure.pk])
+        document = get_measure_document(self.measure.pk, "de")
+        self.assertEqual(document["name"], "Maßnahme")
+        self.assertEqual(get_measure_document(self.measure.pk, "cs")["name"], "Opatření")
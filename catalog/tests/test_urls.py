@@ -0,0 +1,52 @@
+from django.conf import settings
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils.translation import override
+
+from .fixtures import create_group
+
+
+class PublicProfileTest(TestCase):
+    def test_public_stack_uses_language_cookie(self):
+        """
+        The public profile serves the pages without sessions; the language
+        chosen through set_language is kept in a cookie.
+        """
+        from katalogdivlnad import settings_public
+
+        create_group()
+        with override_settings(
+            INSTALLED_APPS=settings_public.INSTALLED_APPS,
+            MIDDLEWARE=settings_public.MIDDLEWARE,
+            ROOT_URLCONF=settings_public.ROOT_URLCONF,
+            TEMPLATES=settings_public.TEMPLATES,
+        ):
+            response = self.client.post(
+                reverse("set_language"), {"language": "en", "next": "/"}
+            )
+            self.assertIn(settings.LANGUAGE_COOKIE_NAME, response.cookies)
+            # Nothing was written, the next pages may come from a replica
+            self.assertNotIn(settings.REPLICA_STICKY_COOKIE, response.cookies)
+            # Unprefixed URLs redirect to the chosen language
+            response = self.client.get("/", follow=True)
+        self.assertEqual(response.redirect_chain, [("/en/", 302)])
+        self.assertContains(response, "Group")
+        self.assertNotIn(settings.SESSION_COOKIE_NAME, response.cookies)
+
+
+class LanguagePrefixTest(TestCase):
+    def test_prefixed_pages_do_not_depend_on_negotiation(self):
+        group = create_group()
+        with override("en"):
+            url = reverse("group-detail", args=[group.pk])
+        self.assertEqual(url, f"/en/group/{group.pk}/")
+
+        response = self.client.get(url, HTTP_ACCEPT_LANGUAGE="cs")
+        self.assertContains(response, "Group")
+        self.assertNotIn("Accept-Language", response.get("Vary", ""))
+
+        response = self.client.get(f"/group/{group.pk}/", HTTP_ACCEPT_LANGUAGE="en")
+        self.assertRedirects(response, url, fetch_redirect_response=False)
+
+        sitemap = self.client.get(reverse("sitemap-section", args=["groups"])).content.decode()
+        self.assertIn(f'hreflang="cs" href="http://testserver/cs/group/{group.pk}/"', sitemap)
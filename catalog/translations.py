@@ -0,0 +1,133 @@
+"""
+Storage modes of the translatable Measure texts.
+
+In the default "columns" mode the texts are read from the "<field>_cs" and
+"<field>_en" columns of Measure, so every measure loaded carries both
+languages. In the "table" mode (CATALOG_TRANSLATION_STORAGE) readers defer
+those columns and fetch only the MeasureTranslation rows of the language they
+render. A language without columns only needs translation rows, no schema
+change.
+
+The columns remain the edited source of the Czech and English texts. Their
+rows are rewritten whenever a measure's document is rebuilt, with the English
+fallback of the columns mode already applied, so one row per measure is
+enough to render either language.
+"""
+from django.conf import settings
+from django.db.models import Prefetch
+
+from .models import Measure, MeasureTranslation
+
+# Translatable Measure fields, stored as "<field>_<language>" columns
+MEASURE_TRANSLATED_FIELDS = (
+    "measure_name",
+    "abstract",
+    "description",
+    "conditions_for_implementation",
+    "impact_desc",
+    "comment",
+    "history",
+)
+
+# Languages with columns on Measure
+COLUMN_LANGUAGES = ("cs", "en")
+# Language of the texts shown when a language has none
+FALLBACK_LANGUAGE = "en"
+
+TRANSLATION_STORAGE_MODES = ("columns", "table")
+
+
+def translated_columns():
+    return [
+        f"{field}_{language}"
+        for field in MEASURE_TRANSLATED_FIELDS
+        for language in COLUMN_LANGUAGES
+    ]
+
+
+def uses_translation_table(storage=None):
+    return (storage or settings.CATALOG_TRANSLATION_STORAGE) == "table"
+
+
+def translation_languages(languages):
+    """
+    Return the translation rows needed to render ``languages``.
+
+    Rows of the column languages already hold their fallback texts.
+    """
+    needed = []
+    for language in languages:
+        for code in (language, FALLBACK_LANGUAGE):
+            if code not in needed:
+                needed.append(code)
+            if language in COLUMN_LANGUAGES:
+                break
+    return needed
+
+
+def with_translations(queryset, languages):
+    """
+    Defer the translated columns of a Measure ``queryset`` and prefetch the
+    translation rows of ``languages`` into ``translation_rows`` instead.
+    """
+    rows = MeasureTranslation.objects.filter(language__in=translation_languages(languages))
+    return queryset.defer(*translated_columns()).prefetch_related(
+        Prefetch("translations", queryset=rows, to_attr="translation_rows")
+    )
+
+
+def translation_text(measure, field, language):
+    """
+    Return ``field`` in ``language`` from the prefetched translation rows.
+    """
+    rows = {row.language: row for row in measure.translation_rows}
+    row = rows.get(language) or rows.get(FALLBACK_LANGUAGE)
+    return None if row is None else getattr(row, field)
+
+
+def _column_text(measure, field, language):
+    value = getattr(measure, f"{field}_{language}")
+    if value is None:
+        value = getattr(measure, f"{field}_{FALLBACK_LANGUAGE}")
+    return value
+
+
+def store_measure_translations(measure_ids=None, chunk_size=500):
+    """
+    Write the column languages' translation rows of the given measures (all
+    measures when ``measure_ids`` is None); returns the number of rows written.
+    """
+    queryset = Measure.objects.only("pk", *translated_columns()).order_by("pk")
+    if measure_ids is not None:
+        queryset = queryset.filter(pk__in=list(measure_ids))
+
+    written = 0
+    batch = []
+    for measure in queryset.iterator(chunk_size=chunk_size):
+        for language in COLUMN_LANGUAGES:
+            batch.append(
+                MeasureTranslation(
+                    measure=measure,
+                    language=language,
+                    **{
+                        field: _column_text(measure, field, language)
+                        for field in MEASURE_TRANSLATED_FIELDS
+                    },
+                )
+            )
+        if len(batch) >= chunk_size:
+            written += _store_translations(batch)
+            batch = []
+    if batch:
+        written += _store_translations(batch)
+    return written
+
+
+def _store_translations(rows):
+    MeasureTranslation.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=["measure", "language"],
+        update_fields=list(MEASURE_TRANSLATED_FIELDS),
+    )
+    return len(rows)
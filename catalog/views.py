@@ -1,32 +1,316 @@
-from django.views.generic import ListView, DetailView
+import asyncio
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import (
+    Http404,
+    HttpResponse,
+    HttpResponseBadRequest,
+    JsonResponse,
+    QueryDict,
+    StreamingHttpResponse,
+)
+from django.shortcuts import get_object_or_404, render
+from django.urls import reverse
+from django.utils.decorators import method_decorator
+from django.utils.translation import get_language
+from django.views import View
+from .comparison import MAX_COMPARED, MIN_COMPARED, comparison_matrix
+from .documents import (
+    MEASURE_CARD_FIELDS,
+    aget_measure_document,
+    build_measure_card,
+    get_measure_document,
+    get_measure_documents,
+)
+from .exports import (
+    LOCALIZED_MEASURE_COLUMNS,
+    iter_csv,
+    iter_jsonl,
+    iter_localized_measure_rows,
+    localized_measure_queryset,
+)
+from .filters import filter_measures
+from .instrumentation import database_pool_stats
 from .models import Group, Measure
+from .prices import price_filter
+from .search import suggestion_index
+from .similarity import asimilar_measure_cards, similar_measure_cards
 
-class Home(ListView):
-    model = Group
-    template_name = "home.html"
-    context_object_name = "groups"
+# Columns needed to render the group navigation
+GROUP_LINK_FIELDS = ("pk", "group_name_cs", "group_name_en")
 
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-        context['measures'] = Measure.objects.all()
-        return context
 
+def _group_link(group):
+    return {"id": group.pk, "name": str(group)}
 
-class GroupDetailView(DetailView):
-    model = Group
-    template_name = "group_detail.html"
-    context_object_name = "group"
 
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-        context['groups'] = Group.objects.all()
-        context['measures'] = Measure.objects.filter(group=self.object)
-        return context
+def _priced_measures(queryset, params):
+    # Measures of the public lists within the price range of the query string
+    condition = price_filter(params)
+    return queryset if condition is None else queryset.filter(condition)
 
-class MeasureDetailView(DetailView):
-    model = Measure
-    template_name = "measure_detail.html"  # Šablona pro detail opatření
-    context_object_name = "measure"
 
+def _price_form(params):
+    return {
+        "min": params.get("price_min", ""),
+        "max": params.get("price_max", ""),
+        "currency": params.get("currency", "eur"),
+    }
 
 
+# The page contexts below hold plain dictionaries only, so rendering a
+# template never triggers a lazy query.
+
+
+def home_context(params=None):
+    language = get_language()
+    params = QueryDict() if params is None else params
+    measures = _priced_measures(Measure.objects.only(*MEASURE_CARD_FIELDS), params)
+    return {
+        "groups": [_group_link(group) for group in Group.objects.only(*GROUP_LINK_FIELDS)],
+        "measures": [build_measure_card(measure, language) for measure in measures],
+        "price": _price_form(params),
+    }
+
+
+def group_detail_context(pk, params=None):
+    language = get_language()
+    params = QueryDict() if params is None else params
+    group = get_object_or_404(Group.objects.only(*GROUP_LINK_FIELDS), pk=pk)
+    measures = _priced_measures(
+        Measure.objects.filter(group=group).only(*MEASURE_CARD_FIELDS), params
+    )
+    return {
+        "group": _group_link(group),
+        "groups": [_group_link(item) for item in Group.objects.only(*GROUP_LINK_FIELDS)],
+        "measures": [build_measure_card(measure, language) for measure in measures],
+        "price": _price_form(params),
+    }
+
+
+def measure_detail_context(pk):
+    document = get_measure_document(pk)
+    if document is None:
+        raise Http404("Measure does not exist")
+    return {"measure": document, "similar": similar_measure_cards(pk, get_language())}
+
+
+def compared_ids(params):
+    """
+    Return the measure IDs of ``params`` ("?ids=1,2" or repeated "ids"), or None if invalid.
+    """
+    values = [value for item in params.getlist("ids") for value in item.split(",")]
+    if not all(value.strip().isdigit() for value in values):
+        return None
+    ids = list(dict.fromkeys(int(value) for value in values))
+    return ids if MIN_COMPARED <= len(ids) <= MAX_COMPARED else None
+
+
+def measure_compare_context(ids):
+    # One query for all the stored documents, whatever the number of measures
+    documents = get_measure_documents(ids)
+    if len(documents) < len(ids):
+        raise Http404("Measure does not exist")
+    compared = [documents[pk] for pk in ids]
+    return {
+        "measures": [
+            {
+                "id": document["id"],
+                "name": document["name"],
+                "code": document["code"],
+                "title_image": document["title_image"],
+            }
+            for document in compared
+        ],
+        "rows": comparison_matrix(compared),
+    }
+
+
+class Home(View):
+    def get(self, request):
+        return render(request, "home.html", home_context(request.GET))
+
+
+class GroupDetailView(View):
+    def get(self, request, pk):
+        return render(request, "group_detail.html", group_detail_context(pk, request.GET))
+
+
+class MeasureDetailView(View):
+    # Rendered from the precomputed MeasureDocument in the active language
+    def get(self, request, pk):
+        return render(request, "measure_detail.html", measure_detail_context(pk))
+
+
+class MeasureCompareView(View):
+    """
+    Compares 2 to 5 measures side by side, highlighting the rows that differ.
+    """
+
+    def get(self, request):
+        ids = compared_ids(request.GET)
+        if ids is None:
+            return HttpResponseBadRequest(
+                f"Pass {MIN_COMPARED} to {MAX_COMPARED} measure IDs as ?ids=1,2"
+            )
+        return render(request, "compare.html", measure_compare_context(ids))
+
+
+class MeasureCompareDataView(View):
+    """
+    JSON variant of MeasureCompareView.
+    """
+
+    def get(self, request):
+        ids = compared_ids(request.GET)
+        if ids is None:
+            return JsonResponse(
+                {"error": f"Pass {MIN_COMPARED} to {MAX_COMPARED} measure IDs as ?ids=1,2"},
+                status=400,
+            )
+        return JsonResponse(measure_compare_context(ids))
+
+
+async def _as_list(queryset):
+    return [item async for item in queryset]
+
+
+class AsyncHome(View):
+    """
+    Async variant of Home, for deployments served through ASGI.
+    """
+
+    async def get(self, request):
+        language = get_language()
+        groups, measures = await asyncio.gather(
+            _as_list(Group.objects.only(*GROUP_LINK_FIELDS)),
+            _as_list(_priced_measures(Measure.objects.only(*MEASURE_CARD_FIELDS), request.GET)),
+        )
+        context = {
+            "groups": [_group_link(group) for group in groups],
+            "measures": [build_measure_card(measure, language) for measure in measures],
+            "price": _price_form(request.GET),
+        }
+        return render(request, "home.html", context)
+
+
+class AsyncGroupDetailView(View):
+    """
+    Async variant of GroupDetailView.
+    """
+
+    async def get(self, request, pk):
+        language = get_language()
+        try:
+            group = await Group.objects.only(*GROUP_LINK_FIELDS).aget(pk=pk)
+        except Group.DoesNotExist:
+            raise Http404("Group does not exist")
+        groups, measures = await asyncio.gather(
+            _as_list(Group.objects.only(*GROUP_LINK_FIELDS)),
+            _as_list(
+                _priced_measures(
+                    Measure.objects.filter(group=group).only(*MEASURE_CARD_FIELDS), request.GET
+                )
+            ),
+        )
+        context = {
+            "group": _group_link(group),
+            "groups": [_group_link(item) for item in groups],
+            "measures": [build_measure_card(measure, language) for measure in measures],
+            "price": _price_form(request.GET),
+        }
+        return render(request, "group_detail.html", context)
+
+
+class AsyncMeasureDetailView(View):
+    """
+    Async variant of MeasureDetailView.
+    """
+
+    async def get(self, request, pk):
+        language = get_language()
+        # The similar measures are fetched alongside the document, not after it
+        document, similar = await asyncio.gather(
+            aget_measure_document(pk, language),
+            asimilar_measure_cards(pk, language),
+        )
+        if document is None:
+            raise Http404("Measure does not exist")
+        context = {"measure": document, "similar": similar}
+        return render(request, "measure_detail.html", context)
+
+
+class SearchSuggestView(View):
+    """
+    Typeahead suggestions as JSON, answered from the in-memory prefix index.
+    """
+    # Suggestion kinds with a page of their own
+    url_names = {"measure": "measure-detail", "group": "group-detail"}
+
+    def get(self, request):
+        query = request.GET.get("q", "")[:100]
+        try:
+            limit = int(request.GET.get("limit", 10))
+        except ValueError:
+            limit = 10
+        limit = max(1, min(limit, settings.CATALOG_SEARCH_MAX_SUGGESTIONS))
+
+        suggestions = []
+        for suggestion in suggestion_index.search(query, limit):
+            url_name = self.url_names.get(suggestion["kind"])
+            url = reverse(url_name, args=[suggestion["id"]]) if url_name else None
+            suggestions.append({**suggestion, "url": url})
+        return JsonResponse({"query": query, "suggestions": suggestions})
+
+
+@method_decorator(staff_member_required, name="dispatch")
+class MeasureExportView(View):
+    """
+    Streams the (facet-filtered) measure list as CSV or JSON Lines to staff users.
+    """
+    content_types = {
+        "csv": "text/csv; charset=utf-8",
+        "jsonl": "application/x-ndjson; charset=utf-8",
+    }
+
+    def get(self, request, export_format):
+        if export_format not in self.content_types:
+            raise Http404("Unsupported export format")
+
+        queryset = filter_measures(localized_measure_queryset(), request.GET)
+        # Rows are produced lazily from a server-side cursor while the response streams
+        rows = iter_localized_measure_rows(queryset, get_language())
+        if export_format == "csv":
+            lines = iter_csv(LOCALIZED_MEASURE_COLUMNS, rows)
+        else:
+            lines = iter_jsonl(LOCALIZED_MEASURE_COLUMNS, rows)
+
+        response = StreamingHttpResponse(
+            lines, content_type=self.content_types[export_format]
+        )
+        response["Content-Disposition"] = f'attachment; filename="measures.{export_format}"'
+        return response
+
+
+class RobotsTxtView(View):
+    """
+    Points crawlers to the sitemap instead of the language switch.
+    """
+
+    def get(self, request):
+        lines = [
+            "User-agent: *",
+            f"Disallow: {reverse('set_language')}",
+            f"Sitemap: {request.build_absolute_uri(reverse('sitemap'))}",
+        ]
+        return HttpResponse("\n".join(lines) + "\n", content_type="text/plain")
+
+
+@method_decorator(staff_member_required, name="dispatch")
+class DatabasePoolStatsView(View):
+    """
+    Reports connection pool metrics (in use, idle, waiting, wait time) as JSON.
+    """
+
+    def get(self, request):
+        return JsonResponse(database_pool_stats())
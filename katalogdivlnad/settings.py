@@ -1,5 +1,5 @@
 from pathlib import Path
-from decouple import config
+from decouple import Csv, config
 from django.utils.translation import gettext_lazy as _
 import sys
 
@@ -21,6 +21,7 @@ DJANGO_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.sitemaps",
 ]
 
 THIRD_PARTY_APPS = [
@@ -34,6 +35,7 @@ INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "catalog.middleware.ReplicaRoutingMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.locale.LocaleMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -49,18 +51,60 @@ TEMPLATES = [
     {
         "BACKEND": "django.template.backends.django.DjangoTemplates",
         "DIRS": [BASE_DIR / "templates"],
-        "APP_DIRS": True,
         "OPTIONS": {
             "context_processors": [
                 "django.template.context_processors.request",
                 "django.contrib.auth.context_processors.auth",
                 "django.contrib.messages.context_processors.messages",
             ],
+            # Compiled templates are kept in memory for the life of the process
+            "loaders": [
+                (
+                    "django.template.loaders.cached.Loader",
+                    [
+                        "django.template.loaders.filesystem.Loader",
+                        "django.template.loaders.app_directories.Loader",
+                    ],
+                ),
+            ],
         },
     },
+    {
+        # Jinja2 versions of the public catalog templates (catalog/jinja2/)
+        "BACKEND": "django.template.backends.jinja2.Jinja2",
+        "APP_DIRS": True,
+        "OPTIONS": {"environment": "catalog.jinja.environment"},
+    },
 ]
 
+# Render the public catalog pages with Jinja2 instead of the Django template engine
+CATALOG_JINJA2 = config("CATALOG_JINJA2", default=False, cast=bool)
+if CATALOG_JINJA2:
+    TEMPLATES.reverse()
+
 WSGI_APPLICATION = "katalogdivlnad.wsgi.application"
+ASGI_APPLICATION = "katalogdivlnad.asgi.application"
+
+# Serve the public catalog views with their async variants (requires an ASGI server)
+CATALOG_ASYNC_VIEWS = config("CATALOG_ASYNC_VIEWS", default=False, cast=bool)
+
+# Seconds before a process rebuilds its search suggestion index (changes rebuild it
+# right away in the processes sharing the cache with the one making them)
+CATALOG_SEARCH_INDEX_TTL = config("CATALOG_SEARCH_INDEX_TTL", default=300, cast=int)
+CATALOG_SEARCH_MAX_SUGGESTIONS = 20
+
+# Exchange rate used to normalize CZK prices to euros; run rebuild_normalized_prices
+# after changing it
+CATALOG_CZK_PER_EUR = config("CATALOG_CZK_PER_EUR", default=25.0, cast=float)
+
+# Where pages read the translatable Measure texts from: "columns" (the *_cs/*_en
+# columns) or "table" (one MeasureTranslation row per language, see catalog.translations)
+CATALOG_TRANSLATION_STORAGE = config("CATALOG_TRANSLATION_STORAGE", default="columns")
+
+# URLs per sitemap file; larger catalogs are split into files listed by sitemap.xml
+CATALOG_SITEMAP_LIMIT = config("CATALOG_SITEMAP_LIMIT", default=10000, cast=int)
+# Rendered sitemaps are cached until the catalog changes, but at most this many seconds
+CATALOG_SITEMAP_CACHE_TIMEOUT = config("CATALOG_SITEMAP_CACHE_TIMEOUT", default=86400, cast=int)
 
 DATABASES = {
     "default": {
@@ -70,12 +114,55 @@ DATABASES = {
         "PASSWORD": config("DATABASE_PASSWORD"),
         "HOST": config("DATABASE_HOST"),
         "PORT": config("DATABASE_PORT"),
+        # Seconds a connection is kept open between requests (0 closes it after each request)
+        "CONN_MAX_AGE": config("DATABASE_CONN_MAX_AGE", default=0, cast=int),
+        # Verify reused persistent connections before the first query of a request
+        "CONN_HEALTH_CHECKS": config("DATABASE_CONN_HEALTH_CHECKS", default=True, cast=bool),
         "OPTIONS": {
             "options": config("DATABASE_OPTIONS")
         },
     },
 }
 
+# psycopg connection pool (Django 5.1+); replaces CONN_MAX_AGE persistence when enabled
+DATABASE_POOL = config("DATABASE_POOL", default=False, cast=bool)
+if DATABASE_POOL:
+    from psycopg_pool import ConnectionPool
+
+    DATABASES["default"]["CONN_MAX_AGE"] = 0
+    DATABASES["default"]["OPTIONS"]["pool"] = {
+        "min_size": config("DATABASE_POOL_MIN_SIZE", default=2, cast=int),
+        "max_size": config("DATABASE_POOL_MAX_SIZE", default=10, cast=int),
+        # Seconds a request waits for a free connection before failing
+        "timeout": config("DATABASE_POOL_TIMEOUT", default=10, cast=float),
+        # Seconds an idle connection above min_size is kept
+        "max_idle": config("DATABASE_POOL_MAX_IDLE", default=600, cast=float),
+        # Seconds after which a connection is replaced
+        "max_lifetime": config("DATABASE_POOL_MAX_LIFETIME", default=3600, cast=float),
+        # Health check run on every checkout
+        "check": ConnectionPool.check_connection,
+    }
+
+# Read replicas: one database alias per host, sharing the primary's credentials
+DATABASE_REPLICAS = []
+for number, host in enumerate(config("DATABASE_REPLICA_HOSTS", default="", cast=Csv()), start=1):
+    alias = f"replica_{number}"
+    DATABASES[alias] = {
+        **DATABASES["default"],
+        "HOST": host,
+        "OPTIONS": {**DATABASES["default"]["OPTIONS"]},
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ["catalog.routers.ReplicaRouter"]
+
+# Seconds a client keeps reading from the primary after a write (read-your-writes)
+REPLICA_STICKY_SECONDS = config("REPLICA_STICKY_SECONDS", default=10, cast=int)
+REPLICA_STICKY_COOKIE = "primary_db"
+# Paths always served from the primary
+REPLICA_PRIMARY_PATHS = ["/admin/"]
+
 if 'test' in sys.argv:
     DATABASES = {
          'default': {
@@ -83,6 +170,7 @@ if 'test' in sys.argv:
               'NAME': ':memory:',
         }
     }
+    DATABASE_REPLICAS = []
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -123,3 +211,20 @@ MEDIA_URL = config("MEDIA_URL")
 MEDIA_ROOT = config("MEDIA_ROOT")
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
+
+# Uploaded originals are re-encoded to at most this size and stored by content hash
+CATALOG_IMAGE_MAX_DIMENSION = config("CATALOG_IMAGE_MAX_DIMENSION", default=2560, cast=int)
+CATALOG_IMAGE_QUALITY = config("CATALOG_IMAGE_QUALITY", default=88, cast=int)
+CATALOG_IMAGE_DIR = "images/sha256"
+# Longest side (px) of the blurred placeholder previews stored with renditions
+CATALOG_PLACEHOLDER_SIZE = 16
+
+# Renditions are queued on upload and generated by the run_image_worker command
+IMAGEKIT_DEFAULT_CACHEFILE_STRATEGY = "catalog.renditions.QueuedRenditionStrategy"
+# Existence of generated renditions is looked up in the Rendition manifest
+IMAGEKIT_DEFAULT_CACHEFILE_BACKEND = "catalog.renditions.ManifestBackend"
+# Seconds before a process reloads its in-memory copy of the manifest
+RENDITION_MANIFEST_TTL = config("RENDITION_MANIFEST_TTL", default=300, cast=int)
+RENDITION_MAX_ATTEMPTS = config("RENDITION_MAX_ATTEMPTS", default=3, cast=int)
+# Seconds before the first retry of a failed job, doubled on every further attempt
+RENDITION_RETRY_DELAY = config("RENDITION_RETRY_DELAY", default=60, cast=int)
@@ -0,0 +1,43 @@
+"""
+Deployment profile serving only the public, anonymous catalog pages.
+
+Drops the admin, auth, sessions and messages apps together with their
+middleware and CSRF protection (the public URLs only read, apart from
+set_language). Pages are served under a language prefix; the language of
+unprefixed URLs is taken from the LANGUAGE_COOKIE_NAME cookie set by
+set_language. Run the admin from a separate process using
+katalogdivlnad.settings.
+"""
+from .settings import *  # noqa: F401,F403
+
+INSTALLED_APPS = [
+    "django.contrib.contenttypes",
+    "django.contrib.staticfiles",
+    "django.contrib.sitemaps",
+] + THIRD_PARTY_APPS + LOCAL_APPS  # noqa: F405
+
+MIDDLEWARE = [
+    "django.middleware.security.SecurityMiddleware",
+    "catalog.middleware.ReplicaRoutingMiddleware",
+    "django.middleware.locale.LocaleMiddleware",
+    "django.middleware.common.CommonMiddleware",
+    "django.middleware.clickjacking.XFrameOptionsMiddleware",
+]
+
+ROOT_URLCONF = "katalogdivlnad.urls_public"
+
+
+def _public_template_engine(engine):
+    # Without auth and messages only the request context processor is left
+    if engine["BACKEND"] != "django.template.backends.django.DjangoTemplates":
+        return engine
+    options = {
+        **engine["OPTIONS"],
+        "context_processors": ["django.template.context_processors.request"],
+    }
+    return {**engine, "OPTIONS": options}
+
+
+TEMPLATES = [_public_template_engine(engine) for engine in TEMPLATES]  # noqa: F405
+
+REPLICA_PRIMARY_PATHS = []
@@ -15,24 +15,21 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 
+from django.conf.urls.i18n import i18n_patterns
 from django.contrib import admin
-from django.urls import path, include
-from django.views.i18n import set_language
-from catalog.views import Home, GroupDetailView, MeasureDetailView
+from django.urls import path
+from catalog.views import DatabasePoolStatsView, MeasureExportView
+from katalogdivlnad import urls_public
 
 
 urlpatterns = [
     path("admin/", admin.site.urls),
-    path('', Home.as_view(), name='home'),
-    path('group/<int:pk>/', GroupDetailView.as_view(), name='group-detail'),
-    path('measure/<int:pk>/', MeasureDetailView.as_view(), name='measure-detail'),
-
-
-
-
-
+    path('stats/db-pool/', DatabasePoolStatsView.as_view(), name='db-pool-stats'),
 ]
 
-urlpatterns += [
-    path('i18n/set_language/', set_language, name='set_language'),
-]
+# Staff-only views need the auth middleware missing from the public profile
+urlpatterns += i18n_patterns(
+    path('export/measures.<str:export_format>', MeasureExportView.as_view(), name='measure-export'),
+)
+
+urlpatterns += urls_public.urlpatterns
@@ -0,0 +1,63 @@
+"""
+URL configuration of the public catalog pages.
+
+Used on its own by the public deployment profile (katalogdivlnad.settings_public)
+and included by the full URL configuration.
+
+Catalog pages are prefixed with their language (/cs/..., /en/...), so every
+URL always returns the same content and can be cached by a shared HTTP cache.
+LocaleMiddleware redirects unprefixed URLs to the prefixed ones in the
+language negotiated from the cookie or Accept-Language.
+"""
+
+from django.conf import settings
+from django.conf.urls.i18n import i18n_patterns
+from django.contrib.sitemaps import views as sitemap_views
+from django.urls import path
+from django.views.i18n import set_language
+from catalog import views
+from catalog.sitemaps import SITEMAPS, cache_sitemap
+from catalog.views import (
+    MeasureCompareDataView,
+    MeasureCompareView,
+    RobotsTxtView,
+    SearchSuggestView,
+)
+
+# Async (ASGI) variants of the public read views can be switched on in settings
+if settings.CATALOG_ASYNC_VIEWS:
+    Home = views.AsyncHome
+    GroupDetailView = views.AsyncGroupDetailView
+    MeasureDetailView = views.AsyncMeasureDetailView
+else:
+    Home = views.Home
+    GroupDetailView = views.GroupDetailView
+    MeasureDetailView = views.MeasureDetailView
+
+
+urlpatterns = i18n_patterns(
+    path('', Home.as_view(), name='home'),
+    path('group/<int:pk>/', GroupDetailView.as_view(), name='group-detail'),
+    path('measure/<int:pk>/', MeasureDetailView.as_view(), name='measure-detail'),
+    path('compare/', MeasureCompareView.as_view(), name='measure-compare'),
+    path('compare.json', MeasureCompareDataView.as_view(), name='measure-compare-data'),
+    path('search/suggest/', SearchSuggestView.as_view(), name='search-suggest'),
+)
+
+# Language-independent URLs
+urlpatterns += [
+    path('i18n/set_language/', set_language, name='set_language'),
+    path('robots.txt', RobotsTxtView.as_view(), name='robots-txt'),
+    path(
+        'sitemap.xml',
+        cache_sitemap(sitemap_views.index),
+        {'sitemaps': SITEMAPS, 'sitemap_url_name': 'sitemap-section'},
+        name='sitemap',
+    ),
+    path(
+        'sitemap-<section>.xml',
+        cache_sitemap(sitemap_views.sitemap),
+        {'sitemaps': SITEMAPS},
+        name='sitemap-section',
+    ),
+]